@@ -1,11 +1,11 @@
 import os
 import json
 import logging
+import numpy as np
 import pandas as pd
 from datetime import datetime
-from collections import Counter, defaultdict
-from src.data import load_enriched_sets, get_deck_details_by_signature, _scan_and_aggregate
-from src.hashing import compute_deck_signature
+from src.data import load_enriched_sets, get_deck_details_by_signature, _get_cache_snapshot
+from src.columnar import ordinal_to_date
 from src.simulator import run_simulation, convert_signature_to_deckgym
 from scipy.stats import chi2_contingency
 
@@ -14,10 +14,10 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(
 logger = logging.getLogger(__name__)
 
 DATA_DIR = "/workspaces/PokemonTCGP/data"
-TOURNAMENTS_DIR = os.path.join(DATA_DIR, "tournaments")
 CACHE_DIR = os.path.join(DATA_DIR, "matchup_analysis")
 SIMULATION_CACHE_FILE = os.path.join(CACHE_DIR, "simulation_cache.json")
 TOP_MATCHUPS_CACHE_FILE = os.path.join(CACHE_DIR, "top_matchups_cache.json")
+MATCHUP_STATS_CACHE_FILE = os.path.join(CACHE_DIR, "matchup_stats_cache.json")
 
 os.makedirs(CACHE_DIR, exist_ok=True)
 
@@ -50,173 +50,168 @@ def get_set_periods():
     periods.reverse()
     return periods
 
-def get_all_pairings():
+def get_all_pairings(tournaments=None):
     """
-    Generator that yields all pairings found in the tournament data.
-    Yields: (date, p1_sig, p2_sig, winner_id)
+    Generator that yields all ingested pairings between two players with decklists
+    (run refresh_cache.py first to pick up new tournaments).
+    tournaments: optional indexes into the match table to restrict the pairings to.
+    Yields: (date, p1_sig, p2_sig, winner_id, p1_id, p2_id) with lowercased player IDs
+    and winner_id None for ties.
     """
-    # We can use the information from standings.json to get signatures for player names
-    for year in sorted(os.listdir(TOURNAMENTS_DIR)):
-        year_path = os.path.join(TOURNAMENTS_DIR, year)
-        if not os.path.isdir(year_path): continue
-        for month in sorted(os.listdir(year_path)):
-            month_path = os.path.join(year_path, month)
-            if not os.path.isdir(month_path): continue
-            for day in sorted(os.listdir(month_path)):
-                day_path = os.path.join(month_path, day)
-                if not os.path.isdir(day_path): continue
-                date_str = f"{year}-{month}-{day}"
-                for t_id in os.listdir(day_path):
-                    t_dir = os.path.join(day_path, t_id)
-                    standings_path = os.path.join(t_dir, "standings.json")
-                    pairings_path = os.path.join(t_dir, "pairings.json")
-                    
-                    if not (os.path.exists(standings_path) and os.path.exists(pairings_path)):
-                        continue
-                        
-                    try:
-                        with open(standings_path, "r") as f:
-                            standings = json.load(f)
-                        with open(pairings_path, "r") as f:
-                            pairings = json.load(f)
-                            
-                        # Map player names to signatures
-                        player_to_sig = {}
-                        for p in standings:
-                            dlist = p.get("decklist", {})
-                            if not dlist: continue
-                            all_cards = []
-                            for cat in ["pokemon", "trainer", "energy"]:
-                                items = dlist.get(cat, [])
-                                if items:
-                                    for item in items:
-                                        if isinstance(item, dict):
-                                            all_cards.append(item)
-                            if all_cards:
-                                sig, _ = compute_deck_signature(all_cards)
-                                p_id = (p.get("player") or p.get("name", "")).lower()
-                                if p_id:
-                                    player_to_sig[p_id] = sig
-                                    
-                        for m in pairings:
-                            if not isinstance(m, dict): continue
-                            p1 = m.get("player1")
-                            p2 = m.get("player2")
-                            if not p1 or not p2: continue
-                            
-                            if isinstance(p1, dict): p1 = p1.get("name") or p1.get("id")
-                            if isinstance(p2, dict): p2 = p2.get("name") or p2.get("id")
-                            
-                            p1_sig = player_to_sig.get(p1.lower()) if p1 else None
-                            p2_sig = player_to_sig.get(p2.lower()) if p2 else None
-                            
-                            if p1_sig and p2_sig:
-                                winner = m.get("winner")
-                                if isinstance(winner, dict): 
-                                    winner = winner.get("name") or winner.get("id")
-                                
-                                winner_str = str(winner).lower() if winner is not None else None
-                                p1_str = str(p1).lower()
-                                p2_str = str(p2).lower()
-                                
-                                yield (date_str, p1_sig, p2_sig, winner_str, p1_str, p2_str)
-                                
-                    except Exception as e:
-                        logger.error(f"Error processing tournament {t_id}: {e}")
+    table = _get_cache_snapshot().matches
+    # Canonical (lowercased) player IDs, interned once at ingest
+    player_keys = table.player_keys.values
+    players = [player_keys[k] for k in table.player_key.tolist()]
+    sigs = [str(s) for s in table.sigs]
+    dates = table.row_dates()
+    valid = (table.p2 >= 0) & (table.p1_sig >= 0) & (table.p2_sig >= 0)
+    if tournaments is not None:
+        selected = np.zeros(len(table.t_ids), dtype=bool)
+        selected[list(tournaments)] = True
+        valid &= np.repeat(selected, np.diff(table.t_ptr))
+    for i in np.flatnonzero(valid):
+        p1_str, p2_str = players[table.p1[i]], players[table.p2[i]]
+        winner = table.winner[i]
+        winner_str = p1_str if winner == 1 else p2_str if winner == 2 else None
+        date_str = ordinal_to_date(dates[i])
+        yield (date_str, sigs[table.p1_sig[i]], sigs[table.p2_sig[i]], winner_str, p1_str, p2_str)
 
 def get_pair_key(sig1, sig2):
     """Returns a canonical key for a deck pair."""
     return tuple(sorted([sig1, sig2]))
 
-def analyze_matchups():
-    # Load Top Matchups Cache
-    top_matchups = {}
-    if os.path.exists(TOP_MATCHUPS_CACHE_FILE):
-        with open(TOP_MATCHUPS_CACHE_FILE, "r") as f:
-            raw_top_matchups = json.load(f)
-            # Filter out mirror matches from cache in case they were already there
-            for code, entries in raw_top_matchups.items():
-                filtered_entries = [e for e in entries if e["pair"][0] != e["pair"][1]]
-                if filtered_entries:
-                    top_matchups[code] = filtered_entries
-            # If cache is empty or incomplete, we need to scan
-    # Also re-scan if we want to ensure 300+ match filter is applied across all periods
-    needs_scan = False
-    periods = get_set_periods() # This line was moved here from below the needs_scan block
-    for p in periods:
-        if p["code"] not in top_matchups:
-            needs_scan = True
-            break
-        # Check if cached matches meet the 300 criteria (if we can verify it easily)
-        # For now, let's just force a scan if we're changing the rules, 
-        # but the logic below will already re-evaluate anyway if we don't return early.
-    
-    # Actually, let's force a scan this time to apply the 300 filter.
-    needs_scan = True
-            
-    # Also need all-time stats for the selected pairs
-    # Wait, the requirement says "tournament win rates はペアの選出期間に限らず、全期間を対象にして算出して下さい。"
-    # This means I need to aggregate ALL pairings anyway to get the win rates for the top pairs.
-    
-    period_matchup_counts = defaultdict(Counter) # period_code -> pair_key -> count
-    all_time_matchup_stats = defaultdict(lambda: {"wins": 0, "total": 0}) # pair_key -> {wins, total}
-    
-    logger.info("Scanning all tournament pairings...")
-    for date_str, sig1, sig2, winner, p1_id, p2_id in get_all_pairings():
+def get_period_lookup(periods, dates):
+    """Map each date to the codes of the periods containing it."""
+    return {
+        d: [p["code"] for p in periods if (not p["start"] or d >= p["start"]) and (not p["end"] or d <= p["end"])]
+        for d in dates
+    }
+
+def _empty_matchup_stats(periods):
+    return {
+        "periods": [[p["code"], p["start"], p["end"]] for p in periods],
+        "tournaments": {},  # "date/t_id" -> content hashes of its standings, details and pairings
+        "all_time": {},  # "sigA_sigB" -> {wins, total}, wins of sigA (ties count half)
+        "period_counts": {},  # period code -> {"sigA_sigB": count}
+    }
+
+def load_matchup_stats(periods):
+    """Load the matchup stats checkpoint, or start over if it is missing or the set periods changed."""
+    if os.path.exists(MATCHUP_STATS_CACHE_FILE):
+        try:
+            with open(MATCHUP_STATS_CACHE_FILE, "r") as f:
+                state = json.load(f)
+            if state.get("periods") == [[p["code"], p["start"], p["end"]] for p in periods]:
+                return state
+            logger.info("Set periods changed, rebuilding matchup stats...")
+        except Exception as e:
+            logger.error(f"Error loading matchup stats: {e}")
+    return _empty_matchup_stats(periods)
+
+def save_matchup_stats(state):
+    with open(MATCHUP_STATS_CACHE_FILE, "w") as f:
+        json.dump(state, f)
+
+def update_matchup_stats(state, periods):
+    """
+    Fold the pairings of tournaments ingested since the last checkpoint into state.
+    A tournament whose files changed or that disappeared cannot be taken out again,
+    so in that case everything is rebuilt from the match table. Standings count as
+    well as pairings, since they assign the players' signatures.
+    Returns (state, number of tournaments folded in).
+    """
+    snapshot = _get_cache_snapshot()
+    table = snapshot.matches
+    manifest = snapshot.manifest
+
+    current = {}
+    for k, (t_date, t_id) in enumerate(zip(table.t_date, table.t_ids)):
+        date_str = ordinal_to_date(t_date)
+        fp = manifest.get(date_str, {}).get(t_id) or {}
+        hashes = [fp[name][2] if fp.get(name) else None for name in ("standings", "details", "pairings")]
+        current[f"{date_str}/{t_id}"] = (k, hashes)
+
+    known = state["tournaments"]
+    if any(key not in current or current[key][1] != h for key, h in known.items()):
+        logger.info("Ingested tournaments changed, rebuilding matchup stats...")
+        state = _empty_matchup_stats(periods)
+        known = state["tournaments"]
+
+    new = [key for key in current if key not in known]
+    if not new:
+        return state, 0
+
+    indexes = [current[key][0] for key in new]
+    period_lookup = get_period_lookup(periods, {ordinal_to_date(table.t_date[k]) for k in indexes})
+    all_time = state["all_time"]
+    period_counts = state["period_counts"]
+    for date_str, sig1, sig2, winner, p1_id, p2_id in get_all_pairings(indexes):
         pair_key = get_pair_key(sig1, sig2)
-        
+        key_str = f"{pair_key[0]}_{pair_key[1]}"
+
         # All time stats for p1 win rate in this specific pair
         # We store stats for the canonical pair: (sigA, sigB) where sigA < sigB
-        # If the yielded sig1 is the first one in key, p1 is sigA.
-        sorted_keys = sorted([sig1, sig2])
-        canonical_sig1 = sorted_keys[0]
-        
-        all_time_matchup_stats[pair_key]["total"] += 1
-        if winner:
-            if winner == p1_id:
-                if sig1 == canonical_sig1:
-                    all_time_matchup_stats[pair_key]["wins"] += 1
-            elif winner == p2_id:
-                if sig2 == canonical_sig1:
-                    all_time_matchup_stats[pair_key]["wins"] += 1
-            else:
-                # Tie
-                all_time_matchup_stats[pair_key]["wins"] += 0.5
+        stats = all_time.setdefault(key_str, {"wins": 0, "total": 0})
+        stats["total"] += 1
+        if winner == p1_id:
+            if sig1 == pair_key[0]:
+                stats["wins"] += 1
+        elif winner == p2_id:
+            if sig2 == pair_key[0]:
+                stats["wins"] += 1
         else:
             # Tie assumed if no winner
-            all_time_matchup_stats[pair_key]["wins"] += 0.5
-            
-        # Period counts
-        for p in periods:
-            if (not p["start"] or date_str >= p["start"]) and (not p["end"] or date_str <= p["end"]):
-                period_matchup_counts[p["code"]][pair_key] += 1
-                
-    # Determine top 3 matchups per period (excluding mirror matches and < 300 total matches)
-    top_matchups = {} # Reset to apply new filters
+            stats["wins"] += 0.5
+
+        for code in period_lookup[date_str]:
+            counts = period_counts.setdefault(code, {})
+            counts[key_str] = counts.get(key_str, 0) + 1
+
+    for key in new:
+        known[key] = current[key][1]
+    return state, len(new)
+
+def get_top_matchups(state, periods, top_n=3, min_total=300):
+    """
+    Most frequent pairs per period, excluding mirror matches and pairs with
+    fewer than min_total matches of all time.
+    """
+    top_matchups = {}
     for p in periods:
         code = p["code"]
-        counts = period_matchup_counts[code]
-        # Filter out mirror matches AND ensure total all-time matches >= 300
+        # Filter out mirror matches AND ensure total all-time matches >= min_total
         valid_pairs = []
-        for pair, count in counts.items():
-            if pair[0] != pair[1] and all_time_matchup_stats[pair]["total"] >= 300:
+        for key_str, count in state["period_counts"].get(code, {}).items():
+            pair = tuple(key_str.split("_"))
+            if pair[0] != pair[1] and state["all_time"][key_str]["total"] >= min_total:
                 valid_pairs.append((pair, count))
-        
-        # Sort by count (period frequency) descending and take top 3
+
+        # Sort by count (period frequency) descending and take the top ones
         valid_pairs.sort(key=lambda x: x[1], reverse=True)
-        top_3 = valid_pairs[:3]
-        
-        if top_3:
+        if valid_pairs:
             # Convert keys to list of strings for JSON
             top_matchups[code] = [{
                 "pair": list(pair),
                 "count": count
-            } for pair, count in top_3]
-            
+            } for pair, count in valid_pairs[:top_n]]
+    return top_matchups
+
+def analyze_matchups():
+    periods = get_set_periods()
+
+    # Only tournaments ingested since the last run are scanned
+    state, folded = update_matchup_stats(load_matchup_stats(periods), periods)
+    if folded:
+        logger.info(f"Folded the pairings of {folded} new tournaments into the matchup stats")
+        save_matchup_stats(state)
+
+    top_matchups = get_top_matchups(state, periods)
+
     # Save Top Matchups Cache
     with open(TOP_MATCHUPS_CACHE_FILE, "w") as f:
         json.dump(top_matchups, f, indent=2)
-        
+
+    all_time_matchup_stats = {tuple(key_str.split("_")): stats for key_str, stats in state["all_time"].items()}
     return periods, top_matchups, all_time_matchup_stats
 
 def load_sim_cache():
@@ -283,7 +278,7 @@ def run_and_report():
     all_sigs_involved = set()
     for pair in unique_pairs_to_simulate:
         all_sigs_involved.update(pair)
-    deck_details = get_deck_details_by_signature(list(all_sigs_involved))
+    deck_details = get_deck_details_by_signature(list(all_sigs_involved), include_appearances=False)
     
     for p in periods:
         code = p["code"]
@@ -0,0 +1,144 @@
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import logging
+import argparse
+import tempfile
+from datetime import datetime, timedelta
+
+# Ensure project root is in path
+sys.path.append(os.getcwd())
+
+from src import jsonio
+from src.data import _parse_tournament
+
+logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+logger = logging.getLogger(__name__)
+
+def _synthetic_card(rng):
+    set_code = rng.choice(["A1", "A1a", "A2", "A2a", "A3"])
+    number = rng.randint(1, 220)
+    return {
+        "count": rng.choice([1, 2]),
+        "name": f"Card {set_code}-{number}",
+        "set": set_code,
+        "number": number,
+        # Fields we never read, as in the real exports
+        "rarity": rng.choice(["C", "U", "R", "RR"]),
+        "illustrator": "Someone",
+        "attacks": [{"name": "Tackle", "cost": ["C", "C"], "damage": "20", "text": ""}],
+    }
+
+def _synthetic_tournament(rng, t_dir, n_players, n_rounds):
+    os.makedirs(t_dir, exist_ok=True)
+    archetypes = [
+        {
+            "pokemon": [_synthetic_card(rng) for _ in range(6)],
+            "trainer": [_synthetic_card(rng) for _ in range(7)],
+            "energy": [],
+        }
+        for _ in range(12)
+    ]
+    players = [f"player{rng.randint(0, 50000)}_{i}" for i in range(n_players)]
+    standings = []
+    for i, name in enumerate(players):
+        standings.append({
+            "name": name,
+            "player": name,
+            "country": "JP",
+            "placing": i + 1,
+            "record": {"wins": rng.randint(0, n_rounds), "losses": rng.randint(0, n_rounds), "ties": 0},
+            "deck": {"id": f"deck-{i % 12}", "name": f"Archetype {i % 12}", "icons": ["pikachu-ex"]},
+            "decklist": rng.choice(archetypes),
+            "drop": None,
+        })
+    pairings = []
+    for r in range(1, n_rounds + 1):
+        order = players[:]
+        rng.shuffle(order)
+        for p1, p2 in zip(order[::2], order[1::2]):
+            pairings.append({"round": r, "phase": 1, "table": len(pairings) + 1,
+                             "player1": p1, "player2": p2, "winner": rng.choice([p1, p2, "0"])})
+    details = {"name": os.path.basename(t_dir), "format": None, "bannedCards": None,
+               "organizer": {"id": 1, "name": "Org"}, "players": n_players}
+    for name, obj in (("standings.json", standings), ("pairings.json", pairings), ("details.json", details)):
+        with open(os.path.join(t_dir, name), "w") as f:
+            json.dump(obj, f)
+
+def generate(root, days, per_day, n_players, n_rounds, seed=0):
+    """Write a synthetic tournaments tree (YYYY/MM/DD/t_id) and return the tournament directories."""
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1)
+    t_dirs = []
+    for d in range(days):
+        day = start + timedelta(days=d)
+        for t in range(per_day):
+            t_dir = os.path.join(root, day.strftime("%Y"), day.strftime("%m"), day.strftime("%d"), f"t{d:04d}{t:02d}")
+            _synthetic_tournament(rng, t_dir, n_players, n_rounds)
+            t_dirs.append(t_dir)
+    return t_dirs
+
+def _time(fn, repeat):
+    best = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark tournament JSON decoding backends on synthetic data.')
+    parser.add_argument('--days', type=int, default=365, help='Days of synthetic tournaments (default: one year).')
+    parser.add_argument('--per-day', type=int, default=3, help='Tournaments per day.')
+    parser.add_argument('--players', type=int, default=64, help='Players per tournament.')
+    parser.add_argument('--rounds', type=int, default=6, help='Swiss rounds per tournament.')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per measurement (best is reported).')
+    parser.add_argument('--dir', help='Use/keep the synthetic data in this directory instead of a temp dir.')
+    args = parser.parse_args()
+
+    root = args.dir or tempfile.mkdtemp(prefix="tcgp_bench_")
+    try:
+        logger.info(f"Generating {args.days * args.per_day} tournaments in {root}...")
+        t_dirs = generate(root, args.days, args.per_day, args.players, args.rounds)
+
+        backends = ["json"]
+        if jsonio.orjson is not None:
+            backends.append("orjson")
+        if jsonio.msgspec is not None:
+            backends.append("msgspec")
+
+        # Warm the page cache so we measure decoding, not disk
+        for t_dir in t_dirs:
+            for name in ("standings.json", "pairings.json"):
+                with open(os.path.join(t_dir, name), "rb") as f:
+                    f.read()
+
+        results = {}
+        default_backend = jsonio.BACKEND
+        for backend in backends:
+            standings = _time(lambda: [jsonio.load_standings(os.path.join(d, "standings.json"), backend=backend) for d in t_dirs], args.repeat)
+            pairings = _time(lambda: [jsonio.load_pairings(os.path.join(d, "pairings.json"), backend=backend) for d in t_dirs], args.repeat)
+            jsonio.BACKEND = backend
+            try:
+                ingest = _time(lambda: [_parse_tournament(d) for d in t_dirs], args.repeat)
+            finally:
+                jsonio.BACKEND = default_backend
+            results[backend] = (standings, pairings, ingest)
+
+        base = results["json"]
+        print(f"\n{len(t_dirs)} tournaments, {args.players} players, {args.rounds} rounds (best of {args.repeat})")
+        print(f"{'backend':<10}{'standings':>12}{'pairings':>12}{'ingest':>12}{'speedup':>10}")
+        for backend, (standings, pairings, ingest) in results.items():
+            speedup = (base[0] + base[1]) / (standings + pairings)
+            print(f"{backend:<10}{standings:>11.2f}s{pairings:>11.2f}s{ingest:>11.2f}s{speedup:>9.1f}x")
+        print(f"\nDefault backend: {default_backend}")
+    finally:
+        if not args.dir:
+            shutil.rmtree(root, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Shared fixtures for tests that ingest tournament files into a throwaway stats cache."""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import src.data as data
+
+# Module paths redirected into the temporary directory, and caches reset around each test
+_PATCHED = ("TOURNAMENTS_DIR", "STORE_DIR", "CACHE_FILE", "OLD_CACHE_FILE", "CLUSTERS_FILE",
+            "ENRICHED_CARDS_FILE", "_ENRICHED_CARDS_CACHE")
+
+def player(name, cards, w, l, t=0):
+    """standings.json entry of a player whose decklist holds 2 copies of each (set, number) card."""
+    return {
+        "player": name,
+        "deck": {"name": "Test Deck"},
+        "record": {"wins": w, "losses": l, "ties": t},
+        "decklist": {"pokemon": [{"set": s, "number": n, "count": 2, "name": f"{s}-{n}"} for s, n in cards]},
+    }
+
+class CacheTestCase(unittest.TestCase):
+    """
+    Points src.data at an empty cache and tournaments directory under a temporary directory.
+    enriched_cards: contents of the enriched_cards.json written for the test.
+    """
+    enriched_cards = {}
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self._saved = {name: getattr(data, name) for name in _PATCHED}
+        data.TOURNAMENTS_DIR = os.path.join(self.tmp, "tournaments")
+        data.STORE_DIR = os.path.join(self.tmp, "cache", "daily_exact_stats")
+        data.CACHE_FILE = os.path.join(self.tmp, "cache", "daily_exact_stats.pkl.gz")
+        data.OLD_CACHE_FILE = os.path.join(self.tmp, "cache", "daily_exact_stats.json")
+        data.CLUSTERS_FILE = os.path.join(self.tmp, "cache", "clusters.json")
+        data.ENRICHED_CARDS_FILE = os.path.join(self.tmp, "enriched_cards.json")
+        with open(data.ENRICHED_CARDS_FILE, "w") as f:
+            json.dump(self.enriched_cards, f)
+        data._ENRICHED_CARDS_CACHE = None
+        data._SIGNATURE_CARDS_CACHE.clear()
+        data._invalidate_cache_snapshot()
+
+    def tearDown(self):
+        for name, value in self._saved.items():
+            setattr(data, name, value)
+        data._SIGNATURE_CARDS_CACHE.clear()
+        data._invalidate_cache_snapshot()
+        shutil.rmtree(self.tmp)
+
+    def _write(self, date_str, t_id, standings, pairings=None):
+        t_dir = os.path.join(data.TOURNAMENTS_DIR, *date_str.split("-"), t_id)
+        os.makedirs(t_dir, exist_ok=True)
+        with open(os.path.join(t_dir, "standings.json"), "w") as f:
+            json.dump(standings, f)
+        if pairings is not None:
+            with open(os.path.join(t_dir, "pairings.json"), "w") as f:
+                json.dump(pairings, f)
@@ -1,23 +1,26 @@
 
 import json
 import os
+import sys
 import argparse
 import logging
 import time
 import numpy as np
-import pandas as pd
 from scipy.sparse import csr_matrix, lil_matrix, diags
 from scipy.sparse.csgraph import connected_components
 from collections import defaultdict
 from concurrent.futures import ProcessPoolExecutor
 
+# Ensure project root is in path
+sys.path.append(os.getcwd())
+
+from src.data import _get_all_signatures
+from src.interning import Interner
+
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
 logger = logging.getLogger(__name__)
 
-# Constants
-CACHE_FILE = "data/cache/daily_exact_stats.pkl.gz"
-
 # Globals for workers
 worker_context = {}
 
@@ -37,7 +40,7 @@ def get_binary_features_and_buckets(signatures):
             all_card_keys.add((c.get("set", ""), str(c.get("number", "")), c.get("type", "Unknown")))
             
     sorted_keys = sorted(list(all_card_keys))
-    key_to_idx = {k: i for i, k in enumerate(sorted_keys)}
+    key_ids = Interner(sorted_keys)
     n_features = len(sorted_keys)
     n_decks = len(sigs)
     
@@ -73,8 +76,8 @@ def get_binary_features_and_buckets(signatures):
         
         for c in cards:
             key = (c.get("set", ""), str(c.get("number", "")), c.get("type", "Unknown"))
-            if key in key_to_idx:
-                k = key_to_idx[key]
+            k = key_ids.get(key)
+            if k is not None:
                 count = c.get("count", 1)
                 
                 if key[2] == "Pokemon":
@@ -313,18 +316,9 @@ def main():
     parser.add_argument("--output", type=str, default="data/cache/clusters.json", help="Output JSON file")
     args = parser.parse_args()
 
-    if not os.path.exists(CACHE_FILE):
-        logger.error(f"Cache file not found: {CACHE_FILE}")
-        return
-
-    logger.info(f"Loading {CACHE_FILE}...")
-    try:
-        data = pd.read_pickle(CACHE_FILE)
-    except Exception as e:
-        logger.error(f"Failed to load cache: {e}")
-        return
-
-    signatures = data.get("signatures", {})
+    logger.info("Loading signatures from the stats cache...")
+    # Plain dict: the signatures are shipped to worker processes
+    signatures = dict(_get_all_signatures().items())
     if not signatures:
         logger.error("No signatures found in cache.")
         return
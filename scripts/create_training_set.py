@@ -14,7 +14,7 @@ from src.data import (
     get_daily_share_data,
     get_period_statistics,
 )
-from src.utils import calculate_confidence_interval
+from src.utils import calculate_confidence_intervals
 from src.simulator import convert_signature_to_deckgym, DECKS_DIR
 
 # Setup logging
@@ -68,6 +68,8 @@ def main():
     # 3. Process and sort decks
     logger.info("Processing deck statistics and calculating lower CI...")
     deck_list = []
+    deck_wins = []
+    deck_totals = []
     for label, info in stats_map.items():
         # Label format: "Archetype Name (signature)"
         try:
@@ -81,16 +83,19 @@ def main():
         wins = stats.get("wins", 0)
         losses = stats.get("losses", 0)
         ties = stats.get("ties", 0)
-        total = wins + losses + ties
-        
-        lower_ci, _ = calculate_confidence_interval(wins, total)
+        deck_wins.append(wins)
+        deck_totals.append(wins + losses + ties)
         
         deck_list.append({
             "signature": sig,
-            "lower_ci": lower_ci,
             "archetype": name
         })
 
+    # Score all decks in one call
+    lower_cis, _ = calculate_confidence_intervals(deck_wins, deck_totals)
+    for deck, lower_ci in zip(deck_list, lower_cis.tolist()):
+        deck["lower_ci"] = lower_ci
+
     # Sort by lower_ci descending
     deck_list.sort(key=lambda x: x["lower_ci"], reverse=True)
 
@@ -16,17 +16,21 @@ logger = logging.getLogger(__name__)
 def main():
     parser = argparse.ArgumentParser(description='Refresh daily exact stats cache.')
     parser.add_argument('--init', action='store_true', help='Refresh all history (approx 10 years) instead of recent 90 days.')
+    parser.add_argument('--force', action='store_true', help='Hash every tournament file in range again instead of trusting unchanged sizes and mtimes, and re-derive all stats from appearances.')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='Processes used to parse tournaments (default: all cores).')
     args = parser.parse_args()
 
     days_back = 90
     if args.init:
         days_back = 3650 # ~10 years
 
-    logger.info(f"Refreshing daily exact stats cache (days_back={days_back})...")
+    logger.info(f"Refreshing daily exact stats cache (days_back={days_back}, force={args.force}, workers={args.workers})...")
     try:
-        # scan_and_aggregate(days_back=30, force_refresh=True)
-        # We use force_refresh=True to ensure everything is recalculated correctly
-        _scan_and_aggregate(days_back=days_back, force_refresh=True, update_cache=True)
+        # Incremental: every day in range is checked against the cache manifest, which is a stat()
+        # walk for files whose size and mtime did not change, and only new, edited or deleted
+        # tournaments are re-parsed. --force hashes every file again instead of trusting size and
+        # mtime, and re-derives every signature's stats from its appearances.
+        _scan_and_aggregate(days_back=days_back, force_refresh=args.force, update_cache=True, workers=args.workers)
         logger.info("✅ Cache refreshed successfully.")
     except Exception as e:
         logger.error(f"❌ Failed to refresh cache: {e}")
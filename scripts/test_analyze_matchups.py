@@ -0,0 +1,120 @@
+import os
+import shutil
+import sys
+import unittest
+from datetime import datetime, timedelta
+
+sys.path.append(os.getcwd())
+
+import src.data as data
+import analyze_matchups as am
+from cache_fixtures import CacheTestCase, player
+
+DECK_A, DECK_B = [("A1", "1"), ("A1", "2")], [("A1", "3")]
+
+def pairings(*winners):
+    """pairings.json rounds of ann against bob, won by each of winners (None for a tie)."""
+    return [{"round": i + 1, "player1": "ann", "player2": "bob", "winner": w} for i, w in enumerate(winners)]
+
+class TestMatchupStats(CacheTestCase):
+    def setUp(self):
+        super().setUp()
+        today = datetime.now()
+        self.day1 = (today - timedelta(days=10)).strftime("%Y-%m-%d")
+        self.day2 = (today - timedelta(days=9)).strftime("%Y-%m-%d")
+        # Newest first, like get_set_periods
+        self.periods = [
+            {"name": "New", "code": "B", "start": self.day2, "end": None},
+            {"name": "Old", "code": "A", "start": None, "end": self.day1},
+        ]
+
+    def _scan(self):
+        data._scan_and_aggregate(start_date=self.day1, end_date=self.day2, update_cache=True)
+
+    def _update(self, state=None):
+        return am.update_matchup_stats(state or am._empty_matchup_stats(self.periods), self.periods)
+
+    def _sigs(self):
+        """(sig of DECK_A, sig of DECK_B), told apart by their last card."""
+        sigs = {info["cards"][-1]["number"]: sig for sig, info in data._get_all_signatures().items()}
+        return sigs["2"], sigs["3"]
+
+    def test_incremental_update_matches_full_rebuild(self):
+        self._write(self.day1, "t1", [player("ann", DECK_A, 1, 1), player("bob", DECK_B, 1, 1)], pairings("ann", "bob"))
+        self._scan()
+        state, folded = self._update()
+        self.assertEqual(folded, 1)
+
+        self._write(self.day2, "t2", [player("ann", DECK_A, 1, 0), player("bob", DECK_B, 0, 1)], pairings("ann", None))
+        self._scan()
+        state, folded = self._update(state)
+        self.assertEqual(folded, 1)
+        self.assertEqual(state, self._update()[0])
+        self.assertEqual(self._update(state), (state, 0))
+
+        sig_a, sig_b = self._sigs()
+        key = "_".join(sorted([sig_a, sig_b]))
+        wins_a = 2.5 if sig_a < sig_b else 1.5
+        self.assertEqual(state["all_time"], {key: {"wins": wins_a, "total": 4}})
+        self.assertEqual(state["period_counts"], {"A": {key: 2}, "B": {key: 2}})
+
+    def test_standings_edit_rebuilds(self):
+        self._write(self.day1, "t1", [player("ann", DECK_A, 1, 0), player("bob", DECK_B, 0, 1)], pairings("ann"))
+        self._scan()
+        state, _ = self._update()
+
+        # Same pairings, but ann and bob swapped decks
+        self._write(self.day1, "t1", [player("ann", DECK_B, 1, 0), player("bob", DECK_A, 0, 1)])
+        self._scan()
+        state, folded = self._update(state)
+        self.assertEqual(folded, 1)
+        self.assertEqual(state, self._update()[0])
+
+        sig_a, sig_b = self._sigs()
+        key = "_".join(sorted([sig_a, sig_b]))
+        self.assertEqual(state["all_time"][key]["wins"], 1 if sig_b < sig_a else 0)
+
+    def test_deletion_rebuilds(self):
+        self._write(self.day1, "t1", [player("ann", DECK_A, 1, 0), player("bob", DECK_B, 0, 1)], pairings("ann"))
+        # A tournament without pairings.json is tracked too
+        self._write(self.day2, "t2", [player("ann", DECK_A, 0, 1), player("bob", DECK_B, 1, 0)])
+        self._scan()
+        state, _ = self._update()
+        self.assertEqual(len(state["tournaments"]), 2)
+
+        shutil.rmtree(os.path.join(data.TOURNAMENTS_DIR, *self.day2.split("-"), "t2"))
+        self._scan()
+        state, folded = self._update(state)
+        self.assertEqual(folded, 1)
+        self.assertEqual(state, self._update()[0])
+        self.assertEqual(list(state["tournaments"]), [f"{self.day1}/t1"])
+
+class TestMatchupHelpers(unittest.TestCase):
+    def test_get_period_lookup(self):
+        periods = [
+            {"code": "C", "start": "2025-03-01", "end": None},
+            {"code": "B", "start": "2025-02-01", "end": "2025-02-28"},
+            {"code": "A", "start": None, "end": "2025-01-31"},
+        ]
+        lookup = am.get_period_lookup(periods, ["2025-01-31", "2025-02-01", "2025-02-28", "2025-03-15"])
+        self.assertEqual(lookup, {"2025-01-31": ["A"], "2025-02-01": ["B"], "2025-02-28": ["B"], "2025-03-15": ["C"]})
+        self.assertEqual(am.get_period_lookup(periods, []), {})
+
+    def test_get_top_matchups(self):
+        periods = [{"code": "A", "start": None, "end": None}, {"code": "B", "start": None, "end": None}]
+        state = {
+            "all_time": {
+                "x_y": {"wins": 5, "total": 10},
+                "x_z": {"wins": 1, "total": 2},
+                "y_z": {"wins": 4, "total": 8},
+                "x_x": {"wins": 10, "total": 20},
+            },
+            "period_counts": {"A": {"x_y": 3, "x_z": 9, "y_z": 6, "x_x": 20}, "B": {"x_z": 2}},
+        }
+        top = am.get_top_matchups(state, periods, top_n=2, min_total=5)
+        # Mirrors and pairs below min_total all-time matches are left out
+        self.assertEqual(top, {"A": [{"pair": ["y", "z"], "count": 6}, {"pair": ["x", "y"], "count": 3}]})
+        self.assertEqual(am.get_top_matchups(state, periods, top_n=1, min_total=0)["B"], [{"pair": ["x", "z"], "count": 2}])
+
+if __name__ == "__main__":
+    unittest.main()
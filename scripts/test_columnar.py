@@ -0,0 +1,201 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+sys.path.append(os.getcwd())
+
+from src.columnar import (
+    AppearanceTable, DailyDeckMatrix, MatchTable, card_bitsets, dates_to_ordinals, signature_card_matrix
+)
+from src.interning import Interner
+
+def _app(t_id, player, date, w, l, t=0):
+    return {"t_id": t_id, "player_id": player, "record": {"wins": w, "losses": l, "ties": t}, "date": date}
+
+class TestAppearanceTable(unittest.TestCase):
+    def setUp(self):
+        self.signatures = {
+            "aaaa0001": {"name": "A", "appearances": [
+                _app("t2", "bob", "2025-01-03", 3, 1),
+                _app("t1", "ann", "2025-01-01", 2, 2, 1),
+                _app("t1", "cid", "2025-01-01", 0, 4),
+            ]},
+            "bbbb0002": {"name": "B", "appearances": [
+                _app("t2", "ann", "2025-01-03", 4, 0),
+            ]},
+            "cccc0003": {"name": "C", "appearances": []},
+        }
+        self.table = AppearanceTable.from_signatures(self.signatures)
+
+    def test_rows_sorted_by_sig_and_date(self):
+        rows = self.table.rows(["aaaa0001"])
+        self.assertEqual(len(rows), 3)
+        records = self.table.records(rows)
+        self.assertEqual([r["date"] for r in records], ["2025-01-01", "2025-01-01", "2025-01-03"])
+        # Same-day rows keep their original order
+        self.assertEqual([r["player_id"] for r in records[:2]], ["ann", "cid"])
+        self.assertEqual(len(self.table.rows(["cccc0003", "missing"])), 0)
+
+    def test_date_range_and_totals(self):
+        rows = self.table.rows(["aaaa0001"], start_date="2025-01-02")
+        self.assertEqual(self.table.totals(rows), {"wins": 3, "losses": 1, "ties": 0, "players": 1})
+        rows = self.table.rows(["aaaa0001", "bbbb0002"], end_date="2025-01-01")
+        self.assertEqual(self.table.totals(rows), {"wins": 2, "losses": 6, "ties": 1, "players": 2})
+
+    def test_daily_totals_ignores_days_outside_grid(self):
+        rows = self.table.rows(["aaaa0001", "bbbb0002"])
+        grid = dates_to_ordinals(["2025-01-02", "2025-01-03"])
+        daily = self.table.daily_totals(rows, grid)
+        np.testing.assert_array_equal(daily["wins"], [0, 7])
+        np.testing.assert_array_equal(daily["count"], [0, 2])
+
+    def test_grouped_daily_totals(self):
+        grid = dates_to_ordinals(["2025-01-01", "2025-01-03"])
+        # A and C share key 1, B is skipped
+        daily = self.table.grouped_daily_totals(np.array([1, -1, 1]), 2, grid)
+        np.testing.assert_array_equal(daily["count"], [[0, 0], [2, 1]])
+        np.testing.assert_array_equal(daily["losses"], [[0, 0], [6, 1]])
+        np.testing.assert_array_equal(daily["ties"], [[0, 0], [1, 0]])
+
+    def test_sig_totals_over_period(self):
+        # Positions in sigs: A, B, C (no appearances)
+        totals = self.table.sig_totals([1, 0, 2], start_date="2025-01-02")
+        np.testing.assert_array_equal(totals["wins"], [4, 3, 0])
+        np.testing.assert_array_equal(totals["count"], [1, 1, 0])
+        totals = self.table.sig_totals([0], end_date="2025-01-01")
+        np.testing.assert_array_equal(totals["losses"], [6])
+        np.testing.assert_array_equal(totals["ties"], [1])
+        totals = self.table.sig_totals([0, 1], start_date="2025-01-02", end_date="2025-01-02")
+        np.testing.assert_array_equal(totals["count"], [0, 0])
+
+    def test_membership_daily_totals_allows_overlap(self):
+        grid = dates_to_ordinals(["2025-01-01", "2025-01-03"])
+        # group 0: A + B, group 1: B only
+        membership = csr_matrix(np.array([[1, 0], [1, 1], [0, 0]]))
+        daily = self.table.membership_daily_totals(membership, grid)
+        np.testing.assert_array_equal(daily["wins"], [[2, 7], [0, 4]])
+        np.testing.assert_array_equal(daily["count"], [[2, 2], [0, 1]])
+
+    def test_records_round_trip(self):
+        rows = self.table.rows(["bbbb0002"])
+        self.assertEqual(self.table.records(rows), self.signatures["bbbb0002"]["appearances"])
+
+class TestDailyDeckMatrix(unittest.TestCase):
+    def setUp(self):
+        self.dates = {
+            "2025-01-01": {"tournaments": {
+                "t1": {"format": None, "bannedCards": None, "decks": {"aaaa0001": 2, "bbbb0002": 1}},
+                "t2": {"format": "NOEX", "bannedCards": None, "decks": {"aaaa0001": 1}},
+            }},
+            "2025-01-02": {"tournaments": {
+                "t3": {"format": None, "bannedCards": ["A1_1"], "decks": {"bbbb0002": 5}},
+            }},
+            "2025-01-03": {"decks": {"cccc0003": 4}},
+        }
+        self.matrix = DailyDeckMatrix.from_dates(self.dates, ["bbbb0002"])
+
+    def _dense(self, **kwargs):
+        days, counts = self.matrix.day_counts(**kwargs)
+        return days, counts.toarray()
+
+    def test_column_order_prefers_given_sigs(self):
+        self.assertEqual(self.matrix.sigs, ["bbbb0002", "aaaa0001", "cccc0003"])
+
+    def test_filter_modes(self):
+        days, counts = self._dense()
+        self.assertEqual(days, ["2025-01-01", "2025-01-02", "2025-01-03"])
+        np.testing.assert_array_equal(counts, [[1, 3, 0], [0, 0, 0], [0, 0, 4]])
+
+        _, counts = self._dense(standard_only=True)
+        np.testing.assert_array_equal(counts, [[1, 2, 0], [0, 0, 0], [0, 0, 0]])
+
+        _, counts = self._dense(exclude_banned=False)
+        np.testing.assert_array_equal(counts[1], [5, 0, 0])
+
+    def test_date_range_and_round_trip(self):
+        matrix = DailyDeckMatrix.from_dict(self.matrix.to_dict())
+        days, counts = matrix.day_counts(start_date="2025-01-02", end_date="2025-01-02", exclude_banned=False)
+        self.assertEqual(days, ["2025-01-02"])
+        np.testing.assert_array_equal(counts.toarray(), [[5, 0, 0]])
+        days, _ = matrix.day_counts(start_date="2025-02-01")
+        self.assertEqual(days, [])
+
+class TestMatchTable(unittest.TestCase):
+    def setUp(self):
+        self.matches = {
+            "2025-01-03": {"t3": {"name": None, "pairings": [(1, "Ann", None, 1, "ff00aa11", None)]}},
+            "2025-01-01": {
+                "t2": {"name": "Cup", "pairings": []},
+                "t1": {"name": "Open", "pairings": [
+                    (1, "Ann", "bob", 2, "ff00aa11", "0badc0de"),
+                    (None, "cid", "ANN", 0, None, "ff00aa11"),
+                ]},
+            },
+        }
+        self.table = MatchTable.from_matches(self.matches)
+
+    def test_rows_grouped_by_tournament(self):
+        self.assertEqual(self.table.t_ids, ["t1", "t2", "t3"])
+        self.assertEqual(self.table.t_ptr.tolist(), [0, 2, 2, 3])
+        self.assertEqual(self.table.round.tolist(), [1, -1, 1])
+        self.assertEqual(self.table.p2.tolist()[2], -1)
+        self.assertEqual(self.table.tournament("2025-01-03", "t3"), 2)
+        self.assertIsNone(self.table.tournament("2025-01-02", "t3"))
+        self.assertEqual(self.table.rows(start_date="2025-01-02"), (2, 3))
+        self.assertEqual(self.table.row_dates().tolist(), dates_to_ordinals(["2025-01-01"] * 2 + ["2025-01-03"]).tolist())
+
+    def test_player_keys_ignore_case(self):
+        keys = self.table.player_key
+        ann = self.table.player_keys.get("ann")
+        self.assertEqual(keys[self.table.p1[0]], ann)
+        self.assertEqual(keys[self.table.p2[1]], ann)
+
+        # Appearances built with the same key table share the IDs
+        table = AppearanceTable.from_signatures({"ff00aa11": {"appearances": [
+            {"t_id": "t1", "player_id": "ANN", "record": {}, "date": "2025-01-01"},
+        ]}}, self.table.player_keys)
+        self.assertEqual(table.player_key[table.player[0]], ann)
+
+    def test_matchup_counts_by_period(self):
+        counts = self.table.matchup_counts([(None, None), ("2025-01-02", None)])
+        a, b = self.table.sig_index["ff00aa11"], self.table.sig_index["0badc0de"]
+        self.assertEqual(counts["losses"][0][a, b], 1)
+        self.assertEqual(counts["wins"][0][b, a], 1)
+        self.assertEqual(counts["ties"][0].sum(), 0)
+        self.assertEqual(sum(counts[k][1].nnz for k in counts), 0)
+
+    def test_round_trip(self):
+        self.assertEqual(self.table.to_matches(), self.matches)
+        self.assertEqual(len(MatchTable.from_matches({})), 0)
+
+class TestInterning(unittest.TestCase):
+    def test_interner_assigns_dense_ids(self):
+        ids = Interner(["t1", "t2"])
+        self.assertEqual(ids.intern("t2"), 1)
+        self.assertEqual(ids.intern_all(["t3", "t1"]).tolist(), [2, 0])
+        self.assertEqual(ids.ids(["t3", "nope"]).tolist(), [2, -1])
+        self.assertEqual(ids[2], "t3")
+        self.assertEqual(len(ids), 3)
+
+    def test_signature_card_matrix(self):
+        signatures = {
+            "aaaa0001": {"cards": [{"set": "A1", "number": "1", "count": 2}, {"set": "A1", "number": "5", "count": 1}]},
+            "aaaa0002": {"cards": []},
+            "aaaa0003": {"cards": [{"set": "A1", "number": "5", "count": 2}]},
+        }
+        card_ids, matrix = signature_card_matrix(signatures)
+        self.assertEqual(card_ids.values, ["A1_1", "A1_5"])
+        self.assertEqual(matrix.toarray().tolist(), [[2, 1], [0, 0], [0, 2]])
+
+        bits = card_bitsets(matrix)
+        unpack = lambda b: np.unpackbits(b, count=3).tolist()
+        self.assertEqual(unpack(bits[0, 0]), [0, 0, 0])
+        self.assertEqual(unpack(bits[0, 1]), [1, 0, 0])
+        self.assertEqual(unpack(bits[1, 0]), [1, 0, 0])
+        self.assertEqual(unpack(bits[1, 1]), [0, 0, 1])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,165 @@
+import os
+import shutil
+import sys
+import unittest
+from datetime import datetime, timedelta
+
+sys.path.append(os.getcwd())
+
+import pandas as pd
+
+import src.data as data
+from src import store
+from cache_fixtures import CacheTestCase, player
+
+class TestIncrementalIngest(CacheTestCase):
+    enriched_cards = {"A1_1": {"name": "Bulbasaur", "set": "A1", "number": "1", "type": "Pokemon"}}
+
+    def setUp(self):
+        super().setUp()
+        # day1 is well outside the recent days, day2 is today
+        today = datetime.now()
+        self.day1 = (today - timedelta(days=10)).strftime("%Y-%m-%d")
+        self.day2 = today.strftime("%Y-%m-%d")
+
+    def _scan(self, force=False, workers=1):
+        data._scan_and_aggregate(start_date=self.day1, end_date=self.day2, force_refresh=force, update_cache=True, workers=workers)
+        return data._read_cache_file()["signatures"]
+
+    def test_rescan_replaces_only_that_day(self):
+        deck_a = [("A1", "1"), ("A1", "2")]
+        deck_b = [("A1", "3")]
+        self._write(self.day1, "t1", [player("ann", deck_a, 3, 1), player("bob", deck_b, 1, 3)])
+        self._write(self.day2, "t2", [player("ann", deck_a, 2, 2)])
+        signatures = self._scan()
+        self.assertEqual(sorted(s["stats"]["players"] for s in signatures.values()), [1, 2])
+
+        # Rescanning the same day with changed standings must not double count
+        self._write(self.day2, "t2", [player("ann", deck_a, 4, 0), player("cid", deck_b, 0, 4, 1)])
+        signatures = self._scan()
+        self.assertEqual(self._scan(force=True), signatures)
+
+        by_size = {len(s["cards"]): s for s in signatures.values()}
+        self.assertEqual(by_size[2]["stats"], {"wins": 7, "losses": 1, "ties": 0, "players": 2})
+        self.assertEqual(by_size[1]["stats"], {"wins": 1, "losses": 7, "ties": 1, "players": 2})
+        self.assertEqual([a["date"] for a in by_size[1]["appearances"]], [self.day1, self.day2])
+
+    def test_unchanged_tournaments_are_skipped_and_deletions_detected(self):
+        # Older days are checked against the manifest too, not only new and recent ones
+        deck_a = [("A1", "1"), ("A1", "2")]
+        self._write(self.day1, "t1", [player("ann", deck_a, 3, 1)])
+        self._write(self.day1, "t2", [player("bob", deck_a, 1, 3)])
+        self._scan()
+
+        parsed, loaded = [], []
+        original, original_load = data._parse_tournament, store.StoreUpdate.from_reader
+        data._parse_tournament = lambda t_dir: parsed.append(os.path.basename(t_dir)) or original(t_dir)
+        store.StoreUpdate.from_reader = lambda reader: loaded.append(reader) or original_load(reader)
+        try:
+            key = store.store_key(data.STORE_DIR)
+            self._scan()
+            self.assertEqual(parsed, [])
+            # Nothing changed: the store is neither loaded nor rewritten
+            self.assertEqual(loaded, [])
+            self.assertEqual(store.store_key(data.STORE_DIR), key)
+
+            # Rewriting identical content only refreshes the manifest
+            self._write(self.day1, "t1", [player("ann", deck_a, 3, 1)])
+            self._scan()
+            self.assertEqual(parsed, [])
+            self.assertEqual(loaded, [])
+            self.assertNotEqual(store.store_key(data.STORE_DIR), key)
+
+            # An edit that keeps the size and mtime passes the stat() check; --force hashes it again
+            path = os.path.join(data.TOURNAMENTS_DIR, *self.day1.split("-"), "t1", "standings.json")
+            st = os.stat(path)
+            self._write(self.day1, "t1", [player("ann", deck_a, 1, 3)])
+            os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+            self._scan()
+            self.assertEqual(parsed, [])
+            self._scan(force=True)
+            self.assertEqual(parsed, ["t1"])
+        finally:
+            data._parse_tournament = original
+            store.StoreUpdate.from_reader = original_load
+
+        shutil.rmtree(os.path.join(data.TOURNAMENTS_DIR, *self.day1.split("-"), "t2"))
+        signatures = self._scan()
+        (info,) = signatures.values()
+        self.assertEqual(info["stats"], {"wins": 1, "losses": 3, "ties": 0, "players": 1})
+        self.assertEqual(list(data._read_cache_file()["dates"][self.day1]["tournaments"]), ["t1"])
+
+    def test_pairings_are_ingested_for_match_history(self):
+        deck_a, deck_b = [("A1", "1"), ("A1", "2")], [("A1", "3")]
+        self._write(self.day2, "t1", [player("Ann", deck_a, 1, 1), player("bob", deck_b, 1, 1)])
+        self._scan()
+        self.assertEqual(data._read_cache_file()["matches"][self.day2]["t1"]["pairings"], [])
+
+        # Pairings added later change the fingerprint, so the tournament is parsed again
+        self._write(self.day2, "t1", [player("Ann", deck_a, 1, 1), player("bob", deck_b, 1, 1)], [
+            {"round": 1, "player1": "ann", "player2": "Bob", "winner": "bob"},
+            {"round": 2, "player1": {"name": "Bob"}, "player2": "Ann", "winner": "Ann"},
+            {"round": 3, "player1": "cid"},
+        ])
+        signatures = self._scan()
+        sig_a, sig_b = sorted(signatures, key=lambda s: -len(signatures[s]["cards"]))
+
+        history = data.get_match_history([{"t_id": "t1", "date": self.day2, "player_id": "Ann"}])
+        self.assertEqual([(m["round"], m["player"], m["opponent"], m["result"]) for m in history],
+                         [(1, "ann", "Bob", "Loss"), (2, "Ann", "Bob", "Win")])
+        self.assertEqual(history[0]["opponent_deck"], f"Test Deck ({sig_b})")
+        self.assertEqual([c["number"] for c in history[0]["opponent_cards"]], ["3"])
+        self.assertEqual(data.get_match_history([{"t_id": "t9", "date": self.day2, "player_id": "Ann"}]), [])
+
+        table = data._get_cache_snapshot().matches
+        self.assertEqual([str(table.sigs[i]) for i in table.p1_sig[:2]], [sig_a, sig_b])
+        self.assertEqual(table.p2[2], -1)
+
+        # Decoded tournaments are reused until the cache changes
+        snapshot = data._get_cache_snapshot()
+        bundle = data._tournament_bundle(snapshot, 0)
+        self.assertIs(data._tournament_bundle(snapshot, 0), bundle)
+        self.assertEqual(bundle["deck"][1][:2], [f"Test Deck ({sig_b})", f"Test Deck ({sig_a})"])
+        self.assertEqual(bundle["player"][1][2], None)
+        self._write(self.day2, "t1", [player("Ann", deck_a, 1, 1), player("bob", deck_b, 1, 1)], [])
+        self._scan()
+        self.assertEqual(data.get_match_history([{"t_id": "t1", "date": self.day2, "player_id": "Ann"}]), [])
+
+    def test_parallel_parse_matches_serial(self):
+        for i in range(6):
+            self._write(self.day1, f"t{i}", [
+                player("ann", [("A1", str(i)), ("A1", "9")], i, 3),
+                player("bob", [("A1", "9")], 1, i),
+            ])
+        serial = self._scan()
+        shutil.rmtree(data.STORE_DIR)
+        self.assertEqual(self._scan(workers=2), serial)
+
+    def test_legacy_pickle_is_migrated_to_store(self):
+        deck_a = [("A1", "1"), ("A1", "2")]
+        self._write(self.day1, "t1", [player("ann", deck_a, 3, 1), player("bob", [("A1", "3")], 1, 3)])
+        expected = self._scan()
+        cache = data._read_cache_file()
+
+        # Rewrite the same data as a legacy pickle with no store next to it
+        shutil.rmtree(data.STORE_DIR)
+        pd.to_pickle({"dates": cache["dates"], "signatures": cache["signatures"], "manifest": cache["manifest"]},
+                     data.CACHE_FILE, compression="gzip")
+        data._invalidate_cache_snapshot()
+        self.assertEqual(dict(data._get_all_signatures()), {
+            sig: {k: v for k, v in info.items() if k != "appearances"} for sig, info in expected.items()
+        })
+
+        self.assertEqual(self._scan(), expected)
+        self.assertFalse(os.path.exists(data.CACHE_FILE))
+        self.assertFalse(data._read_cache_file()["legacy"])
+
+        # Readers see the same signatures through the memory-mapped store
+        snapshot = data._get_cache_snapshot()
+        (sig,) = [s for s, info in expected.items() if len(info["cards"]) == 2]
+        self.assertEqual(snapshot.signatures[sig]["stats"], expected[sig]["stats"])
+        self.assertEqual(snapshot.dates, cache["dates"])
+        self.assertEqual(len(snapshot.appearances), 2)
+
+if __name__ == "__main__":
+    unittest.main()
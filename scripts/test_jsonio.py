@@ -0,0 +1,35 @@
+import os
+import sys
+import unittest
+
+sys.path.append(os.getcwd())
+
+from src import jsonio
+
+STANDINGS = b'[{"player": "ann", "placing": 1, "record": {"wins": 3, "losses": 1}, "decklist": {"pokemon": [{"name": "Pikachu", "set": "A1", "number": 94, "count": 2, "rarity": "C"}]}}]'
+
+class TestJsonIO(unittest.TestCase):
+    def _backends(self):
+        return [b for b in ("json", "orjson", "msgspec")
+                if b == "json" or getattr(jsonio, b) is not None]
+
+    def test_backends_agree_on_read_fields(self):
+        expected = jsonio.decode(STANDINGS, backend="json")
+        for backend in self._backends():
+            entry = jsonio.decode(STANDINGS, kind="standings", backend=backend)[0]
+            self.assertEqual(entry["record"], expected[0]["record"], backend)
+            self.assertEqual(entry["decklist"]["pokemon"][0]["number"], 94, backend)
+            if backend == "msgspec":
+                # Typed decoding skips fields we never read
+                self.assertNotIn("rarity", entry["decklist"]["pokemon"][0])
+                self.assertNotIn("placing", entry)
+
+    def test_schema_mismatch_and_nan_fall_back(self):
+        for backend in self._backends():
+            # Non-dict entries are skipped by the callers, so they must still decode
+            self.assertEqual(jsonio.decode(b'["x", {"player": "a"}]', kind="standings", backend=backend), ["x", {"player": "a"}])
+            value = jsonio.decode(b'{"a": NaN}', backend=backend)["a"]
+            self.assertNotEqual(value, value)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.getcwd())
+
+from src import rolling
+from src.utils import calculate_bayesian_win_probability, calculate_confidence_interval
+
+class TestRolling(unittest.TestCase):
+    def setUp(self):
+        self.wins = np.array([[1, 0, 3, 2, 0, 5], [0, 0, 0, 1, 1, 0]])
+        self.matches = np.array([[2, 0, 4, 3, 1, 6], [0, 0, 0, 2, 1, 0]])
+
+    def test_moving_sum_and_mean_match_pandas(self):
+        for window in (1, 3, 10):
+            expected = pd.DataFrame(self.wins.T).rolling(window=window, min_periods=1).sum().T.values
+            np.testing.assert_array_equal(rolling.moving_sum(self.wins, window), expected)
+
+        wr = rolling.win_rate(self.wins, self.matches)
+        self.assertTrue(np.isnan(wr[0, 1]))
+        expected = pd.DataFrame(wr.T).rolling(window=3, min_periods=1).mean().T.values
+        np.testing.assert_allclose(rolling.moving_mean(wr, 3), expected)
+
+    def test_wilson_bounds_match_scalar(self):
+        lower, upper = rolling.wilson_bounds(self.wins, self.matches)
+        for (i, j), n in np.ndenumerate(self.matches):
+            if n == 0:
+                self.assertTrue(np.isnan(lower[i, j]) and np.isnan(upper[i, j]))
+            else:
+                expected = calculate_confidence_interval(int(self.wins[i, j]), int(n))
+                self.assertAlmostEqual(lower[i, j], expected[0])
+                self.assertAlmostEqual(upper[i, j], expected[1])
+
+    def test_win_stats(self):
+        stats = rolling.win_stats(self.wins, self.matches, window=2)
+        np.testing.assert_array_equal(stats["matches_moving"][0], [2, 2, 4, 7, 4, 7])
+        np.testing.assert_array_equal(stats["wins_cumulative"][1], [0, 0, 0, 1, 2, 2])
+        self.assertTrue(np.isnan(stats["wilson_cumulative"][0][1, 2]))
+        self.assertAlmostEqual(stats["wilson_moving"][0][0, 3], calculate_confidence_interval(5, 7)[0])
+        self.assertTrue(np.isnan(stats["bayes_cumulative"][1, 0]))
+        self.assertAlmostEqual(stats["bayes_cumulative"][0, 2], calculate_bayesian_win_probability(4, 6))
+
+if __name__ == "__main__":
+    unittest.main()
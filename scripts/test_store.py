@@ -0,0 +1,149 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.append(os.getcwd())
+
+from src import store
+
+def _sig(name, n_apps):
+    return {
+        "name": name,
+        "cards": [{"name": name, "set": "A1", "number": "1", "count": 2, "type": "Pokemon"}],
+        "stats": {"wins": n_apps, "losses": 0, "ties": 0, "players": n_apps},
+        "appearances": [
+            {"t_id": "t1", "player_id": f"p{i}", "record": {"wins": 1, "losses": 0, "ties": 0}, "date": "2025-01-02"}
+            for i in range(n_apps)
+        ],
+    }
+
+class TestStore(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.dates = {
+            "2025-01-01": {"decks": {"ff00aa11": 2}},
+            "2025-01-02": {"tournaments": {
+                "t1": {"format": "NOEX", "bannedCards": ["A1_1"], "decks": {"0badc0de": 1, "ff00aa11": 2}},
+                "t2": {"format": None, "bannedCards": None, "decks": {}},
+            }},
+        }
+        self.signatures = {"ff00aa11": _sig("Pikachu", 2), "0badc0de": _sig("Mewtwo", 1), "12345678": _sig("Eevee", 0)}
+        self.manifest = {"2025-01-02": {"t1": {"standings": (10, 20, "abc"), "details": None}}}
+        self.matches = {"2025-01-02": {
+            "t1": {"name": "Open", "pairings": [(1, "p0", "p1", 1, "ff00aa11", "ff00aa11"), (2, "p2", None, 1, "0badc0de", None)]},
+            "t2": {"name": None, "pairings": []},
+        }}
+        store.write_store(self.root, self.dates, self.signatures, self.manifest, self.matches)
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_round_trip(self):
+        cache = store.open_store(self.root).to_cache()
+        self.assertEqual(cache["dates"], self.dates)
+        self.assertEqual(cache["signatures"], self.signatures)
+        self.assertEqual(cache["manifest"], self.manifest)
+        self.assertEqual(cache["matches"], self.matches)
+
+    def test_update_drops_and_adds_tournaments(self):
+        update = store.StoreUpdate.from_reader(store.open_store(self.root))
+        update.drop_tournament("2025-01-02", "t1")
+        update.add_tournament("2025-01-03", "t3", {
+            "name": "Cup", "format": "A", "bannedCards": None,
+            "decks": {"abcdef01": 1, "0badc0de": 1},
+            "cards": {"abcdef01": [{"name": "Mew", "set": "A1a", "number": "2", "count": 1}], "0badc0de": []},
+            "names": {"abcdef01": "Mew", "0badc0de": "Mewtwo"},
+            "players": [("abcdef01", "p9", {"wins": 1, "losses": 2, "ties": 0}),
+                        ("0badc0de", "P0", {"wins": 2, "losses": 1, "ties": 0})],
+            "matches": [(1, "p9", "P0", 2, "abcdef01", "0badc0de")],
+        }, {("A1a", "2"): "Pokemon"})
+        update.manifest = {}
+        update.write(self.root)
+
+        cache = store.open_store(self.root).to_cache()
+        expected = dict(self.dates)
+        expected["2025-01-02"] = {"tournaments": {"t2": self.dates["2025-01-02"]["tournaments"]["t2"]}}
+        expected["2025-01-03"] = {"tournaments": {"t3": {"format": "A", "bannedCards": None, "decks": {"abcdef01": 1, "0badc0de": 1}}}}
+        self.assertEqual(cache["dates"], expected)
+        self.assertEqual(list(cache["signatures"]), ["ff00aa11", "0badc0de", "12345678", "abcdef01"])
+        self.assertEqual(cache["signatures"]["ff00aa11"]["stats"], {"wins": 0, "losses": 0, "ties": 0, "players": 0})
+        self.assertEqual(cache["signatures"]["0badc0de"]["stats"], {"wins": 2, "losses": 1, "ties": 0, "players": 1})
+        self.assertEqual(cache["signatures"]["abcdef01"]["cards"], [{"name": "Mew", "set": "A1a", "number": "2", "count": 1, "type": "Pokemon"}])
+        self.assertEqual(cache["signatures"]["abcdef01"]["appearances"],
+                         [{"t_id": "t3", "player_id": "p9", "record": {"wins": 1, "losses": 2, "ties": 0}, "date": "2025-01-03"}])
+        self.assertEqual(cache["matches"], {
+            "2025-01-02": {"t2": self.matches["2025-01-02"]["t2"]},
+            "2025-01-03": {"t3": {"name": "Cup", "pairings": [(1, "p9", "P0", 2, "abcdef01", "0badc0de")]}},
+        })
+        self.assertEqual(cache["manifest"], {})
+
+        # New players share canonical IDs with the ones already stored
+        reader = store.open_store(self.root)
+        appearances, matches = reader.appearance_table(), reader.match_table()
+        p0 = appearances.player_keys.get("p0")
+        self.assertEqual(matches.player_key[matches.p2[0]], p0)
+
+    def test_manifest_only_update_keeps_columns(self):
+        gen_dir = store.write_manifest(self.root, {"2025-01-02": {}})
+        cache = store.open_store(self.root).to_cache()
+        self.assertEqual(cache["manifest"], {"2025-01-02": {}})
+        self.assertEqual(cache["signatures"], self.signatures)
+        self.assertEqual(cache["matches"], self.matches)
+        self.assertEqual(os.path.basename(gen_dir), store.store_key(self.root)[1])
+
+    def test_signature_index_lookups(self):
+        reader = store.open_store(self.root)
+        index = reader.sig_index
+        for i, sig in enumerate(self.signatures):
+            self.assertEqual(index[sig], i)
+        self.assertNotIn("00000000", index)
+        self.assertNotIn("ffffffff", index)
+
+        view = store.SignatureView(reader)
+        self.assertEqual(view["0badc0de"]["name"], "Mewtwo")
+        self.assertEqual(len(view), 3)
+
+        table = reader.appearance_table()
+        rows = table.rows(["ff00aa11"])
+        self.assertEqual([a["player_id"] for a in table.records(rows)], ["p0", "p1"])
+
+    def test_player_keys_are_shared(self):
+        reader = store.open_store(self.root)
+        appearances, matches = reader.appearance_table(), reader.match_table()
+        self.assertIs(appearances.player_keys, matches.player_keys)
+        p0 = appearances.player_keys.get("p0")
+        self.assertEqual(appearances.player_key[appearances.player[0]], p0)
+        self.assertEqual(matches.player_key[matches.p1[0]], p0)
+
+    def test_new_generation_replaces_current(self):
+        first = store.store_key(self.root)
+        self.signatures["ff00aa11"]["name"] = "Raichu"
+        store.write_store(self.root, self.dates, self.signatures, self.manifest)
+        self.assertNotEqual(store.store_key(self.root), first)
+        self.assertEqual(store.SignatureView(store.open_store(self.root))["ff00aa11"]["name"], "Raichu")
+
+    def test_key_follows_generation_name(self):
+        current = os.path.join(self.root, store.CURRENT_FILE)
+        st = os.stat(current)
+        first = store.store_key(self.root)
+        store.write_store(self.root, self.dates, self.signatures, self.manifest)
+        # Same mtime and size as before: the key must still change
+        os.utime(current, ns=(st.st_atime_ns, st.st_mtime_ns))
+        self.assertNotEqual(store.store_key(self.root), first)
+
+    def test_old_generations_are_removed_after_grace_period(self):
+        saved = store.GENERATION_GRACE_SECONDS
+        try:
+            store.write_store(self.root, self.dates, self.signatures, self.manifest)
+            store.write_store(self.root, self.dates, self.signatures, self.manifest)
+            self.assertEqual(len([n for n in os.listdir(self.root) if n.startswith("v")]), 3)
+            store.GENERATION_GRACE_SECONDS = -1
+            store.write_store(self.root, self.dates, self.signatures, self.manifest)
+            self.assertEqual(len([n for n in os.listdir(self.root) if n.startswith("v")]), 2)
+        finally:
+            store.GENERATION_GRACE_SECONDS = saved
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+import json
+import os
+import sys
+import unittest
+from datetime import datetime, timedelta
+
+sys.path.append(os.getcwd())
+
+import src.data as data
+from src.hashing import compute_deck_signature
+from cache_fixtures import CacheTestCase, player
+
+class TestClusteredTrends(CacheTestCase):
+    def setUp(self):
+        super().setUp()
+        today = datetime.now()
+        self.day1 = (today - timedelta(days=10)).strftime("%Y-%m-%d")
+        self.day2 = (today - timedelta(days=9)).strftime("%Y-%m-%d")
+        deck_12, deck_13, deck_9 = [("A1", "1"), ("A1", "2")], [("A1", "1"), ("A1", "3")], [("A1", "9")]
+        self._write(self.day1, "t1", [player("ann", deck_12, 3, 1), player("bob", deck_13, 1, 3), player("cid", deck_9, 2, 2)])
+        self._write(self.day2, "t2", [player("ann", deck_12, 2, 0, 1), player("dan", deck_9, 0, 2)])
+        data._scan_and_aggregate(start_date=self.day1, end_date=self.day2, update_cache=True)
+
+        # Decks are told apart by their last card
+        sigs = {info["cards"][-1]["number"]: sig for sig, info in data._get_all_signatures().items()}
+        self.sig_12, self.sig_13, self.sig_9 = sigs["2"], sigs["3"], sigs["9"]
+        with open(data.CLUSTERS_FILE, "w") as f:
+            json.dump([{"id": 7, "representative_name": "Card 1", "representative_sig": self.sig_12,
+                        "signatures": [self.sig_12, self.sig_13], "count": 2}], f)
+
+    def test_clustered_share_and_period_stats(self):
+        df = data.get_clustered_daily_share_data(window=1, min_total_players=0, start_date=self.day1, end_date=self.day2)
+        cluster_label, single_label = "Card 1 (Cluster 7)", f"Unclustered ({self.sig_9})"
+        self.assertEqual(list(df.columns), [cluster_label, single_label])
+        self.assertAlmostEqual(df.loc[self.day1, cluster_label], 200 / 3)
+        self.assertAlmostEqual(df.loc[self.day2, single_label], 50.0)
+
+        stats = data.get_period_statistics(df, start_date=self.day1, end_date=self.day2, clustered=True)
+        self.assertEqual(stats[cluster_label]["stats"], {"wins": 6, "losses": 4, "ties": 1, "players": 3})
+        self.assertEqual(stats[cluster_label]["cluster_id"], "7")
+        self.assertEqual(stats[single_label]["sig"], self.sig_9)
+        self.assertAlmostEqual(stats[single_label]["avg_share"], 40.0)
+        self.assertEqual(len(stats[cluster_label]["deck_info"]["cards"]), 2)
+
+        # Same numbers as the per-cluster detail lookup
+        details = data.get_cluster_details("7", start_date=self.day2, end_date=self.day2)
+        stats = data.get_period_statistics(df, start_date=self.day2, end_date=self.day2, clustered=True)
+        self.assertEqual(stats[cluster_label]["stats"], details["stats"])
+
+    def test_period_stats_for_signature_labels(self):
+        df = data.get_daily_share_data(window=1, min_total_players=0, start_date=self.day1, end_date=self.day2)
+        stats = data.get_period_statistics(df, start_date=self.day2, end_date=self.day2)
+        label_12 = next(label for label in df.columns if label.endswith(f"({self.sig_12})"))
+        self.assertEqual(stats[label_12]["stats"], {"wins": 2, "losses": 0, "ties": 1, "players": 1})
+        self.assertAlmostEqual(stats[label_12]["avg_share"], 50.0)
+        self.assertEqual(stats[label_12]["stats"], data.get_deck_details(self.sig_12, start_date=self.day2, end_date=self.day2)["stats"])
+        # sig_13 only played on day 1
+        label_13 = next(label for label in df.columns if label.endswith(f"({self.sig_13})"))
+        self.assertEqual(stats[label_13]["stats"]["players"], 0)
+        self.assertEqual([c["number"] for c in stats[label_12]["deck_info"]["cards"]], ["1", "2"])
+
+        # Labels without a known signature are left out
+        df["Gone (deadbeef)"] = 0.0
+        df["No signature"] = 0.0
+        stats = data.get_period_statistics(df, start_date=self.day2, end_date=self.day2)
+        self.assertNotIn("Gone (deadbeef)", stats)
+        self.assertNotIn("No signature", stats)
+        self.assertEqual(stats[label_12]["sig"], self.sig_12)
+
+    def test_signature_cards_follow_card_db_updates(self):
+        cards = data.get_signature_cards(self.sig_12)
+        self.assertEqual([c["number"] for c in cards], ["1", "2"])
+        self.assertIs(data.get_signature_cards(self.sig_12)[0], cards[0])
+        self.assertEqual(data.get_signature_cards("missing"), [])
+        self.assertFalse(any(key[1] == "missing" for key in data._SIGNATURE_CARDS_CACHE))
+
+        with open(data.ENRICHED_CARDS_FILE, "w") as f:
+            json.dump({"A1_2": {"type": "Pokemon", "image": "x.png", "name_ja": "カード2"}}, f)
+        mtime = os.path.getmtime(data.ENRICHED_CARDS_FILE) + 10
+        os.utime(data.ENRICHED_CARDS_FILE, (mtime, mtime))
+        cards = data.get_signature_cards(self.sig_12, sort=True)
+        self.assertEqual([c["number"] for c in cards], ["2", "1"])
+        self.assertEqual(cards[0]["name_ja"], "カード2")
+
+    def test_signature_cards_follow_cache_refreshes(self):
+        eve = player("eve", [("A1", "4"), ("A1", "5")], 1, 0)
+        new_sig, _ = compute_deck_signature(eve["decklist"]["pokemon"])
+        self.assertEqual(data.get_signature_cards(new_sig), [])
+
+        self._write(self.day2, "t3", [eve])
+        data._scan_and_aggregate(start_date=self.day1, end_date=self.day2, force_refresh=True, update_cache=True)
+        self.assertEqual([c["number"] for c in data.get_signature_cards(new_sig)], ["4", "5"])
+
+    def test_card_info_by_name_uses_first_match(self):
+        with open(data.ENRICHED_CARDS_FILE, "w") as f:
+            json.dump({"A1_1": {"name": "Sabrina’s Psychic"}, "A2_1": {"name": "Sabrina's Psychic"}, "A1_2": {"name": "Pikachu"}}, f)
+        mtime = os.path.getmtime(data.ENRICHED_CARDS_FILE) + 10
+        os.utime(data.ENRICHED_CARDS_FILE, (mtime, mtime))
+        self.assertEqual(data.get_card_info_by_name("Sabrina's Psychic")["name"], "Sabrina’s Psychic")
+        self.assertEqual(data.get_card_info_by_name("Pikachu")["name"], "Pikachu")
+        self.assertIsNone(data.get_card_info_by_name("Raichu"))
+
+    def test_matchup_matrix(self):
+        t1_dir = os.path.join(data.TOURNAMENTS_DIR, *self.day1.split("-"), "t1")
+        with open(os.path.join(t1_dir, "pairings.json"), "w") as f:
+            json.dump([
+                {"round": 1, "player1": "ann", "player2": "cid", "winner": "ann"},
+                {"round": 1, "player1": "bob", "winner": "bob"},
+                {"round": 2, "player1": "bob", "player2": "cid", "winner": 0},
+                {"round": 3, "player1": "ann", "player2": "bob", "winner": "bob"},
+            ], f)
+        data._scan_and_aggregate(start_date=self.day1, end_date=self.day2, force_refresh=True, update_cache=True)
+
+        grid = data.get_matchup_matrix(["Cluster 7", self.sig_12, self.sig_9], periods=[(None, None), (self.day2, None)])
+        # Cluster 7 holds both ann's and bob's decks, so their game is a mirror
+        self.assertEqual(grid["wins"][0].tolist(), [[1, 1, 1], [0, 0, 1], [0, 0, 0]])
+        self.assertEqual(grid["losses"][0].tolist(), [[1, 0, 0], [1, 0, 0], [1, 1, 0]])
+        self.assertEqual(grid["ties"][0].tolist(), [[0, 0, 1], [0, 0, 0], [1, 0, 0]])
+        self.assertEqual(grid["wins"][1].sum() + grid["losses"][1].sum() + grid["ties"][1].sum(), 0)
+
+        grid = data.get_matchup_matrix(["missing"], ["7"])
+        self.assertEqual(grid["wins"].shape, (1, 1, 1))
+
+    def test_card_filter_keeps_clusters_with_a_matching_member(self):
+        df = data.get_clustered_daily_share_data(card_filters=["A1_3"], window=1, min_total_players=0)
+        self.assertEqual(list(df.columns), ["Card 1 (Cluster 7)"])
+
+if __name__ == "__main__":
+    unittest.main()
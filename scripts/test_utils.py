@@ -0,0 +1,40 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+from scipy import stats
+
+sys.path.append(os.getcwd())
+
+from src.utils import (
+    calculate_bayesian_win_probabilities, calculate_bayesian_win_probability,
+    calculate_confidence_interval, calculate_confidence_intervals
+)
+
+class TestIntervals(unittest.TestCase):
+    def setUp(self):
+        self.wins = np.array([0, 3, 7, 10, 55])
+        self.totals = np.array([0, 4, 10, 10, 100])
+
+    def test_confidence_intervals_match_scalar(self):
+        lower, upper = calculate_confidence_intervals(self.wins, self.totals)
+        self.assertEqual((lower[0], upper[0]), (0.0, 0.0))
+        for i in range(len(self.wins)):
+            self.assertEqual((lower[i], upper[i]), calculate_confidence_interval(int(self.wins[i]), int(self.totals[i])))
+        self.assertEqual(upper[3], 100.0)
+
+    def test_bayesian_probabilities(self):
+        approx = calculate_bayesian_win_probabilities(self.wins, self.totals)
+        self.assertEqual(approx[0], 50.0)
+        for i in range(len(self.wins)):
+            self.assertAlmostEqual(approx[i], calculate_bayesian_win_probability(int(self.wins[i]), int(self.totals[i])))
+
+        exact = calculate_bayesian_win_probabilities(self.wins, self.totals, exact=True)
+        expected = stats.beta.sf(0.5, self.wins + 1, self.totals - self.wins + 1) * 100
+        np.testing.assert_allclose(exact[1:], expected[1:])
+        self.assertEqual(exact[0], 50.0)
+        self.assertAlmostEqual(calculate_bayesian_win_probability(3, 4, exact=True), exact[1])
+
+if __name__ == "__main__":
+    unittest.main()
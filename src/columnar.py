@@ -0,0 +1,578 @@
+import bisect
+from datetime import date
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+from src.interning import Interner, card_id, player_key_ids
+
+_ORDINAL_CACHE = {}
+
+def date_to_ordinal(date_str):
+    """Convert a 'YYYY-MM-DD' string to a proleptic Gregorian day ordinal."""
+    o = _ORDINAL_CACHE.get(date_str)
+    if o is None:
+        o = date.fromisoformat(date_str).toordinal()
+        _ORDINAL_CACHE[date_str] = o
+    return o
+
+def ordinal_to_date(ordinal):
+    """Convert a day ordinal back to a 'YYYY-MM-DD' string."""
+    return date.fromordinal(int(ordinal)).isoformat()
+
+def dates_to_ordinals(date_strs):
+    return np.array([date_to_ordinal(d) for d in date_strs], dtype=np.int32)
+
+class AppearanceTable:
+    """
+    Columnar store of every player appearance in the stats cache.
+
+    Rows are sorted by (sig, date) so the appearances of one signature are a
+    contiguous slice, and a date range inside it is found with a binary search.
+    Columns:
+        sig, date (day ordinal), tournament, player: int32 indexes
+        wins, losses, ties: int16
+    String tables (sigs, tournaments, players) map the indexes back to IDs.
+    player_key[p] is the canonical ID of players[p] in the player_keys Interner (see interning.player_key),
+    shared with the MatchTable of the same cache; built from players if omitted.
+    sig_index: optional sig -> row lookup (anything with get/in); built from sigs if omitted.
+    Period totals per signature come from W/L/T prefix sums over the rows (see sig_totals).
+    """
+    def __init__(self, sigs, tournaments, players, sig, date, tournament, player, wins, losses, ties, sig_ptr=None, sig_index=None,
+                 player_key=None, player_keys=None):
+        self.sigs = sigs
+        self.sig_index = sig_index if sig_index is not None else {s: i for i, s in enumerate(sigs)}
+        self.tournaments = tournaments
+        self.players = players
+        if player_keys is None:
+            player_keys = Interner()
+        if player_key is None:
+            player_key = player_key_ids(players, player_keys)
+        self.player_key = player_key
+        self.player_keys = player_keys
+        self.sig = sig
+        self.date = date
+        self.tournament = tournament
+        self.player = player
+        self.wins = wins
+        self.losses = losses
+        self.ties = ties
+        # sig_ptr[i]:sig_ptr[i+1] is the row range of signature i
+        if sig_ptr is None:
+            sig_ptr = np.searchsorted(sig, np.arange(len(sigs) + 1)).astype(np.int64)
+        self.sig_ptr = sig_ptr
+        self._keys = None
+        self._prefix = None
+
+    def __len__(self):
+        return len(self.sig)
+
+    @classmethod
+    def from_signatures(cls, signatures, player_keys=None):
+        """
+        Build the table from the per-signature 'appearances' dict lists of the cache.
+        player_keys: Interner of canonical player IDs to extend (a new one if omitted).
+        """
+        sigs = list(signatures.keys())
+        tournaments = Interner()
+        players = Interner()
+
+        sig_col, date_col, t_col, p_col = [], [], [], []
+        w_col, l_col, t_ties = [], [], []
+        for i, sig in enumerate(sigs):
+            for app in signatures[sig].get("appearances", []):
+                rec = app.get("record", {})
+
+                sig_col.append(i)
+                date_col.append(date_to_ordinal(app["date"]))
+                t_col.append(tournaments.intern(app.get("t_id")))
+                p_col.append(players.intern(app.get("player_id")))
+                w_col.append(rec.get("wins", 0) or 0)
+                l_col.append(rec.get("losses", 0) or 0)
+                t_ties.append(rec.get("ties", 0) or 0)
+
+        sig_arr = np.array(sig_col, dtype=np.int32)
+        date_arr = np.array(date_col, dtype=np.int32)
+        # Stable sort keeps the original order of same-day appearances
+        order = np.lexsort((date_arr, sig_arr))
+        return cls(
+            sigs, tournaments.values, players.values,
+            sig_arr[order], date_arr[order],
+            np.array(t_col, dtype=np.int32)[order],
+            np.array(p_col, dtype=np.int32)[order],
+            np.array(w_col, dtype=np.int16)[order],
+            np.array(l_col, dtype=np.int16)[order],
+            np.array(t_ties, dtype=np.int16)[order],
+            player_keys=player_keys,
+        )
+
+    def rows(self, sigs, start_date=None, end_date=None):
+        """Return the row indexes of the given signatures, optionally within [start_date, end_date]."""
+        ids = [self.sig_index.get(sig) for sig in sigs]
+        return self.rows_for_ids([i for i in ids if i is not None], start_date, end_date)
+
+    def rows_for_ids(self, ids, start_date=None, end_date=None):
+        """Like rows(), for signature IDs (positions in sigs) instead of signature strings."""
+        los, his = self.sig_ranges(ids, start_date, end_date)
+        ranges = [np.arange(lo, hi) for lo, hi in zip(los.tolist(), his.tolist()) if hi > lo]
+        if not ranges:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate(ranges)
+
+    def _range_index(self):
+        """(sig, date) composite row keys and W/L/T prefix sums, built on first use."""
+        if self._keys is None:
+            self._keys = (self.sig.astype(np.int64) << 32) | self.date.astype(np.int64)
+            self._prefix = {
+                k: np.concatenate(([0], np.cumsum(col, dtype=np.int64)))
+                for k, col in (("wins", self.wins), ("losses", self.losses), ("ties", self.ties))
+            }
+        return self._keys, self._prefix
+
+    def sig_ranges(self, ids, start_date=None, end_date=None):
+        """
+        Row ranges of the given signature IDs within [start_date, end_date],
+        found with one vectorized binary search over the (sig, date) row order.
+        Returns (lo, hi) int64 arrays aligned with ids: rows lo[i]:hi[i] belong to ids[i].
+        """
+        ids = np.asarray(ids, dtype=np.int64)
+        lo, hi = self.sig_ptr[ids], self.sig_ptr[ids + 1]
+        if start_date or end_date:
+            keys, _ = self._range_index()
+            if start_date:
+                lo = np.searchsorted(keys, (ids << 32) | date_to_ordinal(start_date), side="left")
+            if end_date:
+                hi = np.searchsorted(keys, (ids << 32) | date_to_ordinal(end_date), side="right")
+            hi = np.maximum(hi, lo)
+        return lo, hi
+
+    def sig_totals(self, ids, start_date=None, end_date=None):
+        """
+        W/L/T and player counts of each signature ID within [start_date, end_date]:
+        two prefix-sum lookups per signature, whatever the period length.
+        Returns a dict of int64 arrays aligned with ids: wins, losses, ties, count.
+        """
+        lo, hi = self.sig_ranges(ids, start_date, end_date)
+        _, prefix = self._range_index()
+        result = {k: prefix[k][hi] - prefix[k][lo] for k in ("wins", "losses", "ties")}
+        result["count"] = (hi - lo).astype(np.int64)
+        return result
+
+    def totals(self, rows):
+        """Sum W/L/T over the given rows. Returns a cache-style stats dict."""
+        return {
+            "wins": int(self.wins[rows].sum()),
+            "losses": int(self.losses[rows].sum()),
+            "ties": int(self.ties[rows].sum()),
+            "players": int(len(rows)),
+        }
+
+    def daily_totals(self, rows, ordinals):
+        """
+        Sum W/L/T and player counts per day for the given rows.
+        ordinals: sorted array of day ordinals defining the output grid; rows on other days are ignored.
+        Returns a dict of int64 arrays aligned with ordinals: wins, losses, ties, count.
+        """
+        n = len(ordinals)
+        result = {k: np.zeros(n, dtype=np.int64) for k in ("wins", "losses", "ties", "count")}
+        if n == 0 or len(rows) == 0:
+            return result
+        dates = self.date[rows]
+        pos = np.searchsorted(ordinals, dates)
+        valid = pos < n
+        valid[valid] = ordinals[pos[valid]] == dates[valid]
+        pos = pos[valid]
+        rows = rows[valid]
+        result["wins"] = np.bincount(pos, weights=self.wins[rows], minlength=n).astype(np.int64)
+        result["losses"] = np.bincount(pos, weights=self.losses[rows], minlength=n).astype(np.int64)
+        result["ties"] = np.bincount(pos, weights=self.ties[rows], minlength=n).astype(np.int64)
+        result["count"] = np.bincount(pos, minlength=n).astype(np.int64)
+        return result
+
+    def grouped_daily_totals(self, sig_keys, n_keys, ordinals, sparse=False):
+        """
+        Sum W/L/T and player counts per (key, day) over the whole table in one pass.
+        sig_keys: int array giving each signature (position in sigs) a key in [0, n_keys), or -1 to skip it.
+        ordinals: sorted array of day ordinals defining the output grid; rows on other days are ignored.
+        Returns a dict of int64 arrays of shape (n_keys, len(ordinals)): wins, losses, ties, count.
+        sparse: return CSR matrices instead, for many keys over long periods.
+        """
+        n = len(ordinals)
+        shape = (n_keys, n)
+        if n == 0 or n_keys == 0 or len(self) == 0:
+            empty = (lambda: csr_matrix(shape, dtype=np.int64)) if sparse else (lambda: np.zeros(shape, dtype=np.int64))
+            return {k: empty() for k in ("wins", "losses", "ties", "count")}
+        keys = np.asarray(sig_keys)[self.sig]
+        pos = np.searchsorted(ordinals, self.date)
+        valid = (keys >= 0) & (pos < n)
+        valid[valid] = ordinals[pos[valid]] == self.date[valid]
+        rows = np.flatnonzero(valid)
+        if sparse:
+            cells = (keys[rows], pos[rows])
+            return {
+                "wins": csr_matrix((self.wins[rows].astype(np.int64), cells), shape=shape),
+                "losses": csr_matrix((self.losses[rows].astype(np.int64), cells), shape=shape),
+                "ties": csr_matrix((self.ties[rows].astype(np.int64), cells), shape=shape),
+                "count": csr_matrix((np.ones(len(rows), dtype=np.int64), cells), shape=shape),
+            }
+        result = {}
+        cell = keys[rows].astype(np.int64) * n + pos[rows]
+        size = n_keys * n
+        result["wins"] = np.bincount(cell, weights=self.wins[rows], minlength=size).astype(np.int64).reshape(shape)
+        result["losses"] = np.bincount(cell, weights=self.losses[rows], minlength=size).astype(np.int64).reshape(shape)
+        result["ties"] = np.bincount(cell, weights=self.ties[rows], minlength=size).astype(np.int64).reshape(shape)
+        result["count"] = np.bincount(cell, minlength=size).astype(np.int64).reshape(shape)
+        return result
+
+    def membership_daily_totals(self, membership, ordinals):
+        """
+        Sum W/L/T and player counts per (group, day) for possibly overlapping groups.
+        membership: sparse (len(sigs), n_groups) matrix of each signature's weight in each group.
+        ordinals: sorted array of day ordinals defining the output grid; rows on other days are ignored.
+        Returns a dict of int64 arrays of shape (n_groups, len(ordinals)): wins, losses, ties, count.
+        """
+        n = len(ordinals)
+        n_groups = membership.shape[1]
+        if n == 0 or n_groups == 0 or len(self) == 0:
+            return {k: np.zeros((n_groups, n), dtype=np.int64) for k in ("wins", "losses", "ties", "count")}
+        pos = np.searchsorted(ordinals, self.date)
+        valid = pos < n
+        valid[valid] = ordinals[pos[valid]] == self.date[valid]
+        rows = np.flatnonzero(valid)
+        cells = (self.sig[rows], pos[rows])
+        to_groups = membership.T.tocsr().astype(np.int64)
+        result = {}
+        for key, values in (("wins", self.wins[rows]), ("losses", self.losses[rows]),
+                            ("ties", self.ties[rows]), ("count", np.ones(len(rows), dtype=np.int64))):
+            # signature x day totals, then summed into groups with one sparse product
+            by_sig = csr_matrix((values.astype(np.int64), cells), shape=(len(self.sig_ptr) - 1, n))
+            result[key] = np.asarray((to_groups @ by_sig).todense(), dtype=np.int64)
+        return result
+
+    def records(self, rows):
+        """Materialize rows as cache-style appearance dicts (t_id, player_id, record, date)."""
+        return [
+            {
+                "t_id": self.tournaments[t],
+                "player_id": self.players[p],
+                "record": {"wins": int(w), "losses": int(l), "ties": int(ti)},
+                "date": ordinal_to_date(d),
+            }
+            for t, p, w, l, ti, d in zip(
+                self.tournament[rows], self.player[rows],
+                self.wins[rows], self.losses[rows], self.ties[rows], self.date[rows]
+            )
+        ]
+
+class DailyDeckMatrix:
+    """
+    Sparse tournament x signature deck counts, with per-tournament flags.
+
+    Built once when the cache is written. Tournament rows are sorted by day and
+    reduced on demand into day x signature CSR matrices for each filter mode
+    (standard only / excluding tournaments with banned cards), which are memoized.
+    """
+    def __init__(self, days, t_ids, t_day, t_has_format, t_banned, sigs, counts):
+        self.days = days
+        self.t_ids = t_ids
+        self.t_day = t_day
+        self.t_has_format = t_has_format
+        self.t_banned = t_banned
+        self.sigs = sigs
+        self.sig_index = {s: i for i, s in enumerate(sigs)}
+        self.counts = counts
+        self._day_matrices = {}
+
+    @classmethod
+    def from_dates(cls, dates, sigs=None):
+        """
+        Build from the cache's 'dates' half: date -> {"tournaments": {t_id: {format, bannedCards, decks}}}.
+        Old-format days ({"decks": ...}) become one untagged row that only non-standard views include.
+        sigs: optional preferred column order; signatures missing from it are appended.
+        """
+        sig_ids = Interner(sigs or [])
+        days = sorted(dates.keys())
+
+        t_ids, t_day, t_has_format, t_banned = [], [], [], []
+        rows, cols, vals = [], [], []
+
+        def add_row(t_id, day_idx, has_format, banned, decks):
+            r = len(t_ids)
+            t_ids.append(t_id)
+            t_day.append(day_idx)
+            t_has_format.append(has_format)
+            t_banned.append(banned)
+            for sig, count in decks.items():
+                rows.append(r)
+                cols.append(sig_ids.intern(sig))
+                vals.append(count)
+
+        for day_idx, date_str in enumerate(days):
+            day_entry = dates[date_str]
+            if "tournaments" in day_entry:
+                for t_id, t_data in day_entry["tournaments"].items():
+                    add_row(t_id, day_idx, t_data.get("format") is not None,
+                            t_data.get("bannedCards") is not None, t_data.get("decks", {}))
+            elif "decks" in day_entry:
+                add_row(None, day_idx, True, False, day_entry["decks"])
+
+        counts = csr_matrix(
+            (np.array(vals, dtype=np.int32), (np.array(rows, dtype=np.int64), np.array(cols, dtype=np.int64))),
+            shape=(len(t_ids), len(sig_ids)),
+        )
+        counts.sum_duplicates()
+        return cls(
+            days, t_ids,
+            np.array(t_day, dtype=np.int32),
+            np.array(t_has_format, dtype=bool),
+            np.array(t_banned, dtype=bool),
+            sig_ids.values, counts,
+        )
+
+    def to_dict(self):
+        """Plain-container form for storing alongside the cache."""
+        return {
+            "days": self.days,
+            "t_ids": self.t_ids,
+            "t_day": self.t_day,
+            "t_has_format": self.t_has_format,
+            "t_banned": self.t_banned,
+            "sigs": self.sigs,
+            "indptr": self.counts.indptr,
+            "indices": self.counts.indices,
+            "data": self.counts.data,
+        }
+
+    @classmethod
+    def from_dict(cls, d):
+        counts = csr_matrix((d["data"], d["indices"], d["indptr"]), shape=(len(d["t_ids"]), len(d["sigs"])))
+        return cls(d["days"], d["t_ids"], d["t_day"], d["t_has_format"], d["t_banned"], d["sigs"], counts)
+
+    def day_matrix(self, standard_only=False, exclude_banned=True):
+        """Day x signature counts over the tournaments selected by the filter flags."""
+        key = (standard_only, exclude_banned)
+        m = self._day_matrices.get(key)
+        if m is None:
+            mask = np.ones(len(self.t_ids), dtype=bool)
+            if standard_only:
+                mask &= ~self.t_has_format
+            if exclude_banned:
+                mask &= ~self.t_banned
+            sel = np.flatnonzero(mask)
+            # Indicator matrix mapping each selected tournament row to its day
+            to_day = csr_matrix(
+                (np.ones(len(sel), dtype=np.int32), (self.t_day[sel], np.arange(len(sel)))),
+                shape=(len(self.days), len(sel)),
+            )
+            m = (to_day @ self.counts[sel]).tocsr()
+            self._day_matrices[key] = m
+        return m
+
+    def day_counts(self, start_date=None, end_date=None, standard_only=False, exclude_banned=True):
+        """
+        Return (days, counts) for the days in [start_date, end_date]:
+        the list of date strings and the matching row slice of the day x signature matrix.
+        """
+        lo, hi = self.day_range(start_date, end_date)
+        m = self.day_matrix(standard_only=standard_only, exclude_banned=exclude_banned)
+        return self.days[lo:hi], m[lo:hi]
+
+    def day_range(self, start_date=None, end_date=None):
+        """Row range [lo, hi) of the days within [start_date, end_date]."""
+        lo = bisect.bisect_left(self.days, start_date) if start_date else 0
+        hi = bisect.bisect_right(self.days, end_date) if end_date else len(self.days)
+        return lo, max(lo, hi)
+
+class MatchTable:
+    """
+    Columnar table of every ingested pairing, with both players' signatures.
+
+    Rows are grouped by tournament and tournaments sorted by (date, t_id), so the
+    pairings of one tournament are the contiguous slice t_ptr[k]:t_ptr[k+1].
+    Tournament columns: t_date (day ordinal), t_ids, t_names (details.json name or None).
+    Row columns:
+        round: int32, -1 if unknown
+        p1, p2: int32 indexes into players (p2 is -1 for byes); player_key[p] is the canonical
+            ID of players[p] in the player_keys Interner, as in AppearanceTable
+        winner: int8, 1 or 2 for the winning side, 0 for ties and unknown winners
+        p1_sig, p2_sig: int32 indexes into sigs, -1 for players without a decklist
+    """
+    def __init__(self, t_date, t_ids, t_names, t_ptr, round, p1, p2, winner, p1_sig, p2_sig, players, sigs,
+                 player_key=None, player_keys=None):
+        self.t_date = t_date
+        self.t_ids = t_ids
+        self.t_names = t_names
+        self.t_ptr = t_ptr
+        self.round = round
+        self.p1 = p1
+        self.p2 = p2
+        self.winner = winner
+        self.p1_sig = p1_sig
+        self.p2_sig = p2_sig
+        self.players = players
+        self.sigs = sigs
+        if player_keys is None:
+            player_keys = Interner()
+        if player_key is None:
+            player_key = player_key_ids(players, player_keys)
+        self.player_key = player_key
+        self.player_keys = player_keys
+        self._t_index = None
+        self._sig_index = None
+
+    def __len__(self):
+        return len(self.p1)
+
+    @classmethod
+    def from_matches(cls, matches, player_keys=None):
+        """
+        Build from the cache's 'matches' half:
+        date -> {t_id: {"name", "pairings": [(round, p1, p2, winner, p1_sig, p2_sig)]}}
+        with player names and signatures as strings (None where missing).
+        player_keys: Interner of canonical player IDs to extend (a new one if omitted).
+        """
+        players = Interner()
+        sigs = Interner()
+        t_date, t_ids, t_names, t_ptr = [], [], [], [0]
+        cols = {k: [] for k in ("round", "p1", "p2", "winner", "p1_sig", "p2_sig")}
+        for date_str in sorted(matches):
+            for t_id in sorted(matches[date_str]):
+                t_data = matches[date_str][t_id]
+                t_date.append(date_to_ordinal(date_str))
+                t_ids.append(t_id)
+                t_names.append(t_data.get("name"))
+                for rnd, p1, p2, winner, p1_sig, p2_sig in t_data.get("pairings", []):
+                    cols["round"].append(-1 if rnd is None else rnd)
+                    cols["p1"].append(players.intern(p1))
+                    cols["p2"].append(-1 if p2 is None else players.intern(p2))
+                    cols["winner"].append(winner)
+                    cols["p1_sig"].append(-1 if p1_sig is None else sigs.intern(p1_sig))
+                    cols["p2_sig"].append(-1 if p2_sig is None else sigs.intern(p2_sig))
+                t_ptr.append(len(cols["p1"]))
+        return cls(
+            np.array(t_date, dtype=np.int32), t_ids, t_names, np.array(t_ptr, dtype=np.int64),
+            np.array(cols["round"], dtype=np.int32),
+            np.array(cols["p1"], dtype=np.int32), np.array(cols["p2"], dtype=np.int32),
+            np.array(cols["winner"], dtype=np.int8),
+            np.array(cols["p1_sig"], dtype=np.int32), np.array(cols["p2_sig"], dtype=np.int32),
+            players.values, sigs.values,
+            player_keys=player_keys,
+        )
+
+    def to_matches(self):
+        """Inverse of from_matches()."""
+        players = self.players.tolist() if hasattr(self.players, "tolist") else list(self.players)
+        sigs = self.sigs.tolist() if hasattr(self.sigs, "tolist") else list(self.sigs)
+        cols = [np.asarray(c).tolist() for c in (self.round, self.p1, self.p2, self.winner, self.p1_sig, self.p2_sig)]
+        t_ptr = np.asarray(self.t_ptr).tolist()
+        matches = {}
+        for k, t_id in enumerate(self.t_ids):
+            pairings = []
+            for rnd, p1, p2, winner, p1_sig, p2_sig in zip(*(c[t_ptr[k]:t_ptr[k + 1]] for c in cols)):
+                pairings.append((
+                    None if rnd < 0 else rnd, players[p1], None if p2 < 0 else players[p2], winner,
+                    None if p1_sig < 0 else sigs[p1_sig], None if p2_sig < 0 else sigs[p2_sig],
+                ))
+            day = matches.setdefault(ordinal_to_date(self.t_date[k]), {})
+            day[t_id] = {"name": self.t_names[k], "pairings": pairings}
+        return matches
+
+    def tournament(self, date_str, t_id):
+        """Index of the tournament held on date_str with ID t_id, or None."""
+        if self._t_index is None:
+            self._t_index = {(int(d), t): k for k, (d, t) in enumerate(zip(np.asarray(self.t_date).tolist(), self.t_ids))}
+        return self._t_index.get((date_to_ordinal(date_str), t_id))
+
+    def rows(self, start_date=None, end_date=None):
+        """Row range (lo, hi) of the tournaments within [start_date, end_date]."""
+        lo, hi = 0, len(self.t_date)
+        if start_date:
+            lo = int(np.searchsorted(self.t_date, date_to_ordinal(start_date), side="left"))
+        if end_date:
+            hi = int(np.searchsorted(self.t_date, date_to_ordinal(end_date), side="right"))
+        hi = max(hi, lo)
+        return int(self.t_ptr[lo]), int(self.t_ptr[hi])
+
+    def row_dates(self):
+        """Day ordinal of every row."""
+        return np.repeat(np.asarray(self.t_date), np.diff(np.asarray(self.t_ptr)))
+
+    @property
+    def sig_index(self):
+        """sig -> index into sigs."""
+        if self._sig_index is None:
+            sigs = self.sigs.tolist() if hasattr(self.sigs, "tolist") else self.sigs
+            self._sig_index = {sig: i for i, sig in enumerate(sigs)}
+        return self._sig_index
+
+    def matchup_counts(self, periods=((None, None),)):
+        """
+        Sparse (period, signature, opponent signature) W/L/T tensor.
+        Every pairing between two players with known signatures is counted from both sides.
+        periods: sequence of (start_date, end_date) ranges, None for an open end.
+        Returns a dict of lists with one (len(sigs), len(sigs)) int64 csr_matrix per period:
+        wins, losses, ties, where [i, j] counts the games signature i played against signature j.
+        """
+        n = len(self.sigs)
+        result = {"wins": [], "losses": [], "ties": []}
+        for start_date, end_date in periods:
+            lo, hi = self.rows(start_date, end_date)
+            p1_sig, p2_sig, winner = self.p1_sig[lo:hi], self.p2_sig[lo:hi], self.winner[lo:hi]
+            valid = (p1_sig >= 0) & (p2_sig >= 0)
+            p1_sig, p2_sig, winner = p1_sig[valid], p2_sig[valid], winner[valid]
+            # Each pairing from p1's side, then from p2's
+            own = np.concatenate([p1_sig, p2_sig])
+            opp = np.concatenate([p2_sig, p1_sig])
+            won = np.concatenate([winner == 1, winner == 2])
+            lost = np.concatenate([winner == 2, winner == 1])
+            tied = np.concatenate([winner == 0, winner == 0])
+            for key, mask in (("wins", won), ("losses", lost), ("ties", tied)):
+                result[key].append(csr_matrix(
+                    (np.ones(int(mask.sum()), dtype=np.int64), (own[mask], opp[mask])), shape=(n, n)
+                ))
+        return result
+
+def signature_card_matrix(signatures, card_ids=None):
+    """
+    Sparse signature x card count matrix of the cache's 'signatures' half.
+    Rows follow the signatures' order; columns are interned 'SET_NUMBER' card IDs.
+    Returns (card_ids Interner, CSR matrix).
+    """
+    card_ids = card_ids if card_ids is not None else Interner()
+    indptr = [0]
+    indices, data = [], []
+    for info in signatures.values():
+        for c in info.get("cards", []):
+            indices.append(card_ids.intern(card_id(c.get("set"), c.get("number"))))
+            data.append(c.get("count", 1))
+        indptr.append(len(indices))
+    matrix = csr_matrix(
+        (np.array(data, dtype=np.int32), np.array(indices, dtype=np.int32), np.array(indptr, dtype=np.int64)),
+        shape=(len(indptr) - 1, len(card_ids)),
+    )
+    return card_ids, matrix
+
+def card_bitsets(card_matrix):
+    """
+    Inverted card -> signature index of a signature x card count matrix, as packed bitsets.
+    Returns a uint8 array of shape (n_cards, 2, ceil(n_sigs / 8)): slot 0 holds the decks
+    with exactly one copy of the card, slot 1 the decks with two or more.
+    Bits follow np.packbits order, so np.unpackbits(..., count=n_sigs) gives a row mask.
+    """
+    n_sigs, n_cards = card_matrix.shape
+    bits = np.zeros((n_cards, 2, (n_sigs + 7) // 8), dtype=np.uint8)
+    coo = card_matrix.tocoo()
+    present = coo.data > 0
+    rows, cols = coo.row[present], coo.col[present]
+    slot = (coo.data[present] >= 2).astype(np.intp)
+    values = (0x80 >> (rows & 7)).astype(np.uint8)
+    np.bitwise_or.at(bits, (cols, slot, rows >> 3), values)
+    return bits
+
+def columns_by_first_use(counts):
+    """Indexes of the non-empty columns of a sparse matrix, ordered by the first row they appear in."""
+    coo = counts.tocoo()
+    first = np.full(counts.shape[1], counts.shape[0], dtype=np.int64)
+    np.minimum.at(first, coo.col, coo.row)
+    present = np.flatnonzero(first < counts.shape[0])
+    return present[np.argsort(first[present], kind="stable")]
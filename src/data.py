@@ -1,18 +1,30 @@
 
+import hashlib
 import json
 import logging
 import os
-import re
+import threading
 from datetime import datetime, timedelta
+import numpy as np
 import pandas as pd
-from collections import Counter, defaultdict
-
+from scipy.sparse import csr_matrix
+from collections import Counter, OrderedDict, defaultdict
+from collections.abc import Mapping
+
+from src.columnar import (
+    AppearanceTable, DailyDeckMatrix, MatchTable, card_bitsets, columns_by_first_use, date_to_ordinal, dates_to_ordinals,
+    signature_card_matrix
+)
+from src.interning import Interner, card_id, player_key, player_name
 from src.hashing import compute_deck_signature
+from src import jsonio, rolling, store
 
 logger = logging.getLogger(__name__)
 
 DATA_DIR = os.path.join(os.getcwd(), "data")
 TOURNAMENTS_DIR = os.path.join(DATA_DIR, "tournaments")
+STORE_DIR = os.path.join(DATA_DIR, "cache", "daily_exact_stats")
+# Legacy cache files, migrated into STORE_DIR on the next cache update
 CACHE_FILE = os.path.join(DATA_DIR, "cache", "daily_exact_stats.pkl.gz")
 OLD_CACHE_FILE = os.path.join(DATA_DIR, "cache", "daily_exact_stats.json")
 CLUSTERS_FILE = os.path.join(DATA_DIR, "cache", "clusters.json")
@@ -20,7 +32,19 @@ CARDS_DIR = os.path.join(DATA_DIR, "cards")
 ENRICHED_CARDS_FILE = os.path.join(CARDS_DIR, "enriched_cards.json")
 ENRICHED_SETS_FILE = os.path.join(CARDS_DIR, "enriched_sets.json")
 _ENRICHED_CARDS_CACHE = None
+_ENRICHED_CARDS_MTIME = 0
+_CARD_NAME_INDEX = None  # normalized name -> first enriched card with that name
 _ENRICHED_SETS_CACHE = None
+# Enriched card lists per (cache version, signature, sorted) for the current enriched_cards.json,
+# least recently used first
+_SIGNATURE_CARDS_CACHE = OrderedDict()
+_SIGNATURE_CARDS_LOCK = threading.Lock()
+SIGNATURE_CARDS_CACHE_SIZE = 4096
+# Decoded pairings per (cache version, tournament) for match history, least recently used first
+_TOURNAMENT_BUNDLE_CACHE = OrderedDict()
+_TOURNAMENT_BUNDLE_ROWS = 0
+_TOURNAMENT_BUNDLE_LOCK = threading.Lock()
+TOURNAMENT_BUNDLE_CACHE_ROWS = 200000
 
 def normalize_card_name(name):
     """Normalize apostrophes in card names to straight single quotes."""
@@ -29,19 +53,24 @@ def normalize_card_name(name):
     return name.replace('’', "'").replace('‘', "'")
 
 def load_enriched_cards():
-    """Load enriched card database from JSON. Errors if missing."""
-    global _ENRICHED_CARDS_CACHE
-    if _ENRICHED_CARDS_CACHE is not None:
-        return _ENRICHED_CARDS_CACHE
-    
+    """Load enriched card database from JSON, reloading it when the file changes. Errors if missing."""
+    global _ENRICHED_CARDS_CACHE, _ENRICHED_CARDS_MTIME, _CARD_NAME_INDEX
     if not os.path.exists(ENRICHED_CARDS_FILE):
         error_msg = f"Enriched card data not found at {ENRICHED_CARDS_FILE}. Please run 'python3 scripts/enrich_cards.py' first."
         logger.error(error_msg)
         raise FileNotFoundError(error_msg)
+
+    mtime = os.path.getmtime(ENRICHED_CARDS_FILE)
+    if _ENRICHED_CARDS_CACHE is not None and mtime == _ENRICHED_CARDS_MTIME:
+        return _ENRICHED_CARDS_CACHE
     
     try:
         with open(ENRICHED_CARDS_FILE, "r") as f:
             _ENRICHED_CARDS_CACHE = json.load(f)
+        _ENRICHED_CARDS_MTIME = mtime
+        _CARD_NAME_INDEX = None
+        with _SIGNATURE_CARDS_LOCK:
+            _SIGNATURE_CARDS_CACHE.clear()
         return _ENRICHED_CARDS_CACHE
     except Exception as e:
         logger.error(f"Error loading enriched cards: {e}")
@@ -109,11 +138,7 @@ def enrich_card_data(cards):
     enriched = []
     for c in cards:
         new_c = c.copy()
-        c_set = new_c.get("set")
-        c_num = new_c.get("number")
-        key = f"{c_set}_{c_num}"
-        
-        info = db.get(key)
+        info = db.get(card_id(new_c.get("set"), new_c.get("number")))
         if info:
             new_c["type"] = info["type"]
             new_c["image"] = info["image"]
@@ -131,6 +156,45 @@ def enrich_card_data(cards):
         enriched.append(new_c)
     return enriched
 
+# Deck list order: Pokemon > Goods > Item > Stadium > Support, then by name
+CARD_TYPE_ORDER = {"Pokemon": 0, "Goods": 1, "Item": 2, "Stadium": 3, "Support": 4, "Unknown": 5}
+
+def card_sort_key(card):
+    return (CARD_TYPE_ORDER.get(card.get("type", "Unknown"), 5), card.get("name", ""))
+
+def get_signature_cards(sig, sort=False):
+    """
+    Enriched card list of a signature, optionally in deck list order (see card_sort_key).
+    Lists are built once per cache version and enriched_cards.json version and kept in an
+    LRU cache shared by every session. The returned list is new, but its card dicts are shared:
+    do not modify them. Returns [] for signatures missing from the current cache (not cached,
+    so they show up once a refresh adds them).
+    """
+    load_enriched_cards()  # Clears the cache if the card DB changed
+    snapshot = _get_cache_snapshot()
+    key = (snapshot.key, sig, sort)
+    with _SIGNATURE_CARDS_LOCK:
+        cards = _SIGNATURE_CARDS_CACHE.pop(key, None)
+        if cards is not None:
+            _SIGNATURE_CARDS_CACHE[key] = cards  # Mark as most recently used
+            return list(cards)
+
+    if sort:
+        cards = tuple(sorted(get_signature_cards(sig), key=card_sort_key))
+    else:
+        info = snapshot.signatures.get(sig)
+        if info is None:
+            return []
+        cards = tuple(enrich_card_data(info.get("cards", [])))
+    if not cards:
+        return []
+
+    with _SIGNATURE_CARDS_LOCK:
+        _SIGNATURE_CARDS_CACHE[key] = cards
+        if len(_SIGNATURE_CARDS_CACHE) > SIGNATURE_CARDS_CACHE_SIZE:
+            _SIGNATURE_CARDS_CACHE.popitem(last=False)
+    return list(cards)
+
 def get_all_card_ids():
     """Return unique list of all card IDs (SetID_Number), already sorted in enriched_cards.json."""
     db = load_enriched_cards()
@@ -142,31 +206,38 @@ def get_all_card_names():
 
 def get_card_info_by_name(name):
     """Return enriched card info for a given name. Returns the first match found."""
+    global _CARD_NAME_INDEX
     db = load_enriched_cards()
-    norm_name = normalize_card_name(name)
-    for info in db.values():
-        if normalize_card_name(info.get("name")) == norm_name:
-            return info
-    return None
+    index = _CARD_NAME_INDEX
+    if index is None:
+        index = {}
+        for info in db.values():
+            index.setdefault(normalize_card_name(info.get("name")), info)
+        _CARD_NAME_INDEX = index
+    return index.get(normalize_card_name(name))
 
 def get_card_info_by_id(card_id):
     """Return enriched card info for a given card ID (e.g., 'A1_1')."""
     db = load_enriched_cards()
     return db.get(card_id)
 
-def _scan_and_aggregate(days_back=30, force_refresh=False, start_date=None, end_date=None, update_cache=False):
+def _read_legacy_cache_file():
     """
-    Scan standings.json files and aggregate exact deck counts.
-    If update_cache is False, strictly read from the existing cache file without scanning new files or writing.
+    Read a cache written before the column store: the gzip pickle (or the even older JSON cache).
+    Returns a freshly loaded, private dict with keys:
+        dates, signatures: the two halves of the cache
+        daily_matrix: stored DailyDeckMatrix.to_dict() form, or None for caches written without it
+        manifest: date -> {t_id: fingerprint} of the ingested tournament files ({} if absent)
     """
-    cache = {}
-    signatures = {}
+    result = {"dates": {}, "signatures": {}, "daily_matrix": None, "manifest": {}}
 
     if os.path.exists(CACHE_FILE):
         try:
             data = pd.read_pickle(CACHE_FILE)
-            cache = data.get("dates", {})
-            signatures = data.get("signatures", {})
+            result["dates"] = data.get("dates", {})
+            result["signatures"] = data.get("signatures", {})
+            result["daily_matrix"] = data.get("daily_matrix")
+            result["manifest"] = data.get("manifest", {})
         except Exception as e:
             logger.error(f"Error loading cache: {e}")
     elif os.path.exists(OLD_CACHE_FILE):
@@ -174,16 +245,560 @@ def _scan_and_aggregate(days_back=30, force_refresh=False, start_date=None, end_
             logger.info(f"Migrating cache from {OLD_CACHE_FILE}...")
             with open(OLD_CACHE_FILE, "r") as f:
                 data = json.load(f)
-                cache = data.get("dates", {})
-                signatures = data.get("signatures", {})
+                result["dates"] = data.get("dates", {})
+                result["signatures"] = data.get("signatures", {})
         except Exception as e:
             logger.error(f"Error loading old cache: {e}")
 
+    return result
+
+def _read_cache_file():
+    """
+    Load the whole stats cache into plain dicts (the cache writer works on store columns instead).
+    Returns a freshly loaded, private dict with keys:
+        dates, signatures: the two halves of the cache (signatures include their appearances)
+        manifest: date -> {t_id: fingerprint} of the ingested tournament files ({} if absent)
+        matches: date -> {t_id: {"name", "pairings"}} of the ingested pairings ({} if absent)
+        legacy: True if the data came from a pre-store pickle/JSON cache that should be migrated
+    """
+    reader = store.open_store(STORE_DIR)
+    if reader is not None:
+        try:
+            result = reader.to_cache()
+            result["legacy"] = False
+            return result
+        except Exception as e:
+            logger.error(f"Error loading cache store: {e}")
+
+    result = _read_legacy_cache_file()
+    result["matches"] = {}
+    result["legacy"] = bool(result["dates"] or result["signatures"])
+    return result
+
+class _CacheSnapshot:
+    """
+    Read-only view of one version of the stats cache, shared by every reader in the process.
+
+    Backed either by the column store (memory-mapped, each structure built on first use)
+    or by a legacy pickle loaded into memory:
+        signatures: sig -> {name, cards, stats}
+        appearances: columnar AppearanceTable of every player appearance
+        daily_matrix: sparse DailyDeckMatrix of per-tournament deck counts
+        dates: the nested date -> tournaments dict (rebuilt on demand for store-backed snapshots)
+        matches: columnar MatchTable of the ingested pairings (empty for legacy caches)
+        manifest: date -> {t_id: fingerprint} of the ingested tournament files
+        sig_index: sig -> row of the signature table
+        sig_names: deck name of each signature table row
+        sig_rows(): vectorized sig -> row lookup over a sorted copy of the signature strings
+        matrix_sig_rows: signature table row of each daily_matrix column (-1 if it has none)
+        card_ids, card_matrix: interned card IDs and the signature x card count matrix
+        card_bits: packed card -> signature bitset postings (see columnar.card_bitsets)
+    """
+    def __init__(self, key, reader=None, data=None):
+        self.key = key
+        self._reader = reader
+        self._data = data if data is not None else {"dates": {}, "signatures": {}, "daily_matrix": None}
+        self._signatures = None
+        self._appearances = None
+        self._daily_matrix = None
+        self._dates = None
+        self._matches = None
+        self._manifest = None
+        self._sig_index = None
+        self._sig_names = None
+        self._matrix_sig_rows = None
+        self._sorted_sigs = None
+        self._card_ids = None
+        self._card_matrix = None
+        self._card_bits = None
+
+    @property
+    def signatures(self):
+        if self._signatures is None:
+            if self._reader is not None:
+                self._signatures = store.SignatureView(self._reader)
+            else:
+                self._signatures = {
+                    sig: {k: v for k, v in info.items() if k != "appearances"}
+                    for sig, info in self._data["signatures"].items()
+                }
+        return self._signatures
+
+    @property
+    def appearances(self):
+        if self._appearances is None:
+            if self._reader is not None:
+                self._appearances = self._reader.appearance_table()
+            else:
+                self._appearances = AppearanceTable.from_signatures(self._data["signatures"])
+        return self._appearances
+
+    @property
+    def daily_matrix(self):
+        if self._daily_matrix is None:
+            if self._reader is not None:
+                self._daily_matrix = self._reader.daily_matrix()
+            elif self._data["daily_matrix"] is not None:
+                self._daily_matrix = DailyDeckMatrix.from_dict(self._data["daily_matrix"])
+            else:
+                self._daily_matrix = DailyDeckMatrix.from_dates(self._data["dates"], self._data["signatures"].keys())
+        return self._daily_matrix
+
+    @property
+    def dates(self):
+        if self._dates is None:
+            if self._reader is not None:
+                self._dates = self._reader.dates(self.daily_matrix)
+            else:
+                self._dates = self._data["dates"]
+        return self._dates
+
+    @property
+    def matches(self):
+        if self._matches is None:
+            table = self._reader.match_table() if self._reader is not None else None
+            # Legacy caches and stores written before pairings were ingested have none
+            self._matches = table if table is not None else MatchTable.from_matches({})
+        return self._matches
+
+    @property
+    def manifest(self):
+        if self._manifest is None:
+            if self._reader is not None:
+                self._manifest = self._reader.manifest()
+            else:
+                self._manifest = self._data.get("manifest", {})
+        return self._manifest
+
+    @property
+    def sig_index(self):
+        if self._sig_index is None:
+            if self._reader is not None:
+                self._sig_index = self._reader.sig_index
+            else:
+                self._sig_index = Interner(self._data["signatures"]).index
+        return self._sig_index
+
+    @property
+    def sig_names(self):
+        if self._sig_names is None:
+            if self._reader is not None:
+                self._sig_names = self._reader.strings("sig_name").tolist()
+            else:
+                self._sig_names = [info.get("name", "Unknown") for info in self._data["signatures"].values()]
+        return self._sig_names
+
+    @property
+    def matrix_sig_rows(self):
+        if self._matrix_sig_rows is None:
+            sigs = self.daily_matrix.sigs
+            rows = np.full(len(sigs), -1, dtype=np.int64)
+            if self._reader is not None:
+                # Store matrices list the signature table first, then matrix_extra_sigs
+                n = len(self._reader.strings("sig"))
+                rows[:n] = np.arange(n)
+            else:
+                get = self.sig_index.get
+                rows[:] = np.fromiter((get(sig, -1) for sig in sigs), dtype=np.int64, count=len(sigs))
+            self._matrix_sig_rows = rows
+        return self._matrix_sig_rows
+
+    def sig_rows(self, sigs):
+        """Signature table rows of sigs as an int64 array, -1 for unknown ones, from one searchsorted call."""
+        if self._sorted_sigs is None:
+            if self._reader is not None:
+                all_sigs = np.array(self._reader.sigs, dtype=str)
+                order = np.asarray(self._reader.sig_index.order, dtype=np.int64)
+            else:
+                all_sigs = np.array(list(self._data["signatures"]), dtype=str)
+                order = np.argsort(all_sigs, kind="stable")
+            self._sorted_sigs = (all_sigs[order], order)
+        sorted_sigs, order = self._sorted_sigs
+        queries = np.array(list(sigs), dtype=str)
+        rows = np.full(len(queries), -1, dtype=np.int64)
+        if len(sorted_sigs) == 0 or len(queries) == 0:
+            return rows
+        pos = np.minimum(np.searchsorted(sorted_sigs, queries), len(sorted_sigs) - 1)
+        hit = sorted_sigs[pos] == queries
+        rows[hit] = order[pos[hit]]
+        return rows
+
+    def _load_cards(self):
+        card_ids = self._reader.card_ids() if self._reader is not None else None
+        if card_ids is not None:
+            self._card_matrix = self._reader.card_matrix(card_ids)
+        else:
+            # Legacy caches and stores written before card IDs were interned
+            card_ids, self._card_matrix = signature_card_matrix(self.signatures)
+        self._card_ids = card_ids
+
+    @property
+    def card_ids(self):
+        if self._card_ids is None:
+            self._load_cards()
+        return self._card_ids
+
+    @property
+    def card_matrix(self):
+        if self._card_matrix is None:
+            self._load_cards()
+        return self._card_matrix
+
+    @property
+    def card_bits(self):
+        if self._card_bits is None:
+            bits = self._reader.card_bits() if self._reader is not None else None
+            if bits is None:
+                bits = card_bitsets(self.card_matrix)
+            self._card_bits = bits
+        return self._card_bits
+
+    def card_bitset(self, card, copies=None):
+        """
+        Packed bitset of the signature rows whose deck contains card ('SET_NUMBER').
+        copies: None for any number of copies, 1 for exactly one, 2 for two or more.
+        """
+        j = self.card_ids.get(card)
+        if j is None:
+            return np.zeros(self.card_bits.shape[2], dtype=np.uint8)
+        postings = self.card_bits[j]
+        if copies is None:
+            return postings[0] | postings[1]
+        return np.array(postings[0 if copies == 1 else 1])
+
+# Process-wide snapshot of the cache file, replaced whenever the file changes on disk
+_CACHE_SNAPSHOT = None
+_CACHE_LOCK = threading.Lock()
+
+def _cache_file_key():
+    """Identify the current on-disk cache version by path, mtime and size."""
+    key = store.store_key(STORE_DIR)
+    if key is not None:
+        return key
+    for path in (CACHE_FILE, OLD_CACHE_FILE):
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        return (path, st.st_mtime_ns, st.st_size)
+    return None
+
+def _load_cache_snapshot(key):
+    """Open the cache version identified by key. Returns None if nothing could be read."""
+    reader = store.open_store(STORE_DIR)
+    if reader is not None:
+        return _CacheSnapshot(key, reader=reader)
+    data = _read_legacy_cache_file()
+    if not data["dates"] and not data["signatures"]:
+        return None
+    return _CacheSnapshot(key, data=data)
+
+def _get_cache_snapshot():
+    """
+    Return the shared snapshot of the stats cache, reloading it only when the
+    cache has changed on disk. Safe to call from concurrent Streamlit sessions.
+    """
+    global _CACHE_SNAPSHOT
+    key = _cache_file_key()
+    snapshot = _CACHE_SNAPSHOT
+    if snapshot is not None and snapshot.key == key:
+        return snapshot
+
+    with _CACHE_LOCK:
+        # Another thread may have loaded this version while we waited
+        snapshot = _CACHE_SNAPSHOT
+        if snapshot is not None and snapshot.key == key:
+            return snapshot
+
+        if key is None:
+            snapshot = _CacheSnapshot(None)
+        else:
+            loaded = _load_cache_snapshot(key)
+            if loaded is None:
+                if snapshot is not None:
+                    # Keep serving the previous version if the new one could not be read
+                    return snapshot
+                loaded = _CacheSnapshot(key)
+            snapshot = loaded
+        _CACHE_SNAPSHOT = snapshot
+        return snapshot
+
+def _invalidate_cache_snapshot():
+    global _CACHE_SNAPSHOT
+    with _CACHE_LOCK:
+        _CACHE_SNAPSHOT = None
+
+def _file_fingerprint(path, previous=None):
+    """
+    Return (size, mtime_ns, sha256) for a file, or None if it does not exist.
+    The file is only read and hashed when its size or mtime differ from the previous fingerprint.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    if previous is not None and previous[0] == st.st_size and previous[1] == st.st_mtime_ns:
+        return previous
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return (st.st_size, st.st_mtime_ns, h.hexdigest())
+
+def _tournament_fingerprint(t_dir, previous=None):
+    """Fingerprint a tournament directory's standings, details and pairings files. None if there are no standings."""
+    previous = previous or {}
+    standings = _file_fingerprint(os.path.join(t_dir, "standings.json"), previous.get("standings"))
+    if standings is None:
+        return None
+    details = _file_fingerprint(os.path.join(t_dir, "details.json"), previous.get("details"))
+    pairings = _file_fingerprint(os.path.join(t_dir, "pairings.json"), previous.get("pairings"))
+    return {"standings": standings, "details": details, "pairings": pairings}
+
+def _same_content(fp_a, fp_b):
+    """Compare two tournament fingerprints by content hash, ignoring mtimes."""
+    if fp_a is None or fp_b is None:
+        return False
+    for name in ("standings", "details", "pairings"):
+        a, b = fp_a.get(name), fp_b.get(name)
+        if (a is None) != (b is None):
+            return False
+        if a is not None and a[2] != b[2]:
+            return False
+    return True
+
+def _parse_pairings(pairings_path, player_sigs):
+    """
+    Read pairings.json into [(round, p1, p2, winner, p1_sig, p2_sig)] rows for MatchTable:
+    winner is 1 or 2 for the winning side and 0 otherwise, p2 is None for byes and the
+    signatures come from player_sigs (canonical player ID -> sig).
+    """
+    pairings = jsonio.load_pairings(pairings_path)
+    rows = []
+    for m in pairings:
+        if not isinstance(m, dict): continue
+        p1, p2 = player_name(m.get("player1")), player_name(m.get("player2"))
+        if not p1: continue # Bye or invalid
+        p1, p2 = str(p1), str(p2) if p2 else None
+
+        winner = player_name(m.get("winner"))
+        winner = player_key(winner) if winner is not None else None
+        p1_key = player_key(p1)
+        p2_key = player_key(p2) if p2 else None
+        # A missing winner against a missing opponent counts as a p1 loss, as it always has
+        side = 1 if winner == p1_key else 2 if winner == p2_key else 0
+
+        rnd = m.get("round")
+        rnd = rnd if isinstance(rnd, int) and not isinstance(rnd, bool) and rnd >= 0 else None
+        rows.append((rnd, p1, p2, side, player_sigs.get(p1_key), player_sigs.get(p2_key)))
+    return rows
+
+def _parse_tournament(t_dir):
+    """
+    Read one tournament directory (standings.json + optional details.json and pairings.json).
+    Returns None if there are no readable standings, otherwise a compact, picklable dict:
+        name, format, bannedCards: from details.json
+        decks: {sig: count}
+        cards, names: {sig: normalized cards / deck name} of the first player with each sig
+        players: [(sig, player_id, record)] in standings order
+        matches: pairings rows (see _parse_pairings), [] without pairings.json
+    Has no side effects, so it can run in worker processes.
+    """
+    standings_path = os.path.join(t_dir, "standings.json")
+    details_path = os.path.join(t_dir, "details.json")
+    pairings_path = os.path.join(t_dir, "pairings.json")
+    
+    if not os.path.exists(standings_path):
+        return None
+        
+    # Get tournament format and banned cards
+    t_name = None
+    t_format = None
+    t_banned = None
+    if os.path.exists(details_path):
+        try:
+            det = jsonio.load(details_path)
+            t_name = det.get("name")
+            t_format = det.get("format")
+            t_banned = det.get("bannedCards")
+        except: pass
+    
+    try:
+        standings = jsonio.load_standings(standings_path)
+    except Exception as e:
+        logger.error(f"Error reading {standings_path}: {e}")
+        return None
+
+    decks, cards, names, players = {}, {}, {}, []
+    try:
+        for player in standings:
+            if not isinstance(player, dict): continue
+            
+            decklist = player.get("decklist", {})
+            if not decklist: continue
+            
+            all_cards_raw = []
+            for cat in ["pokemon", "trainer", "energy"]:
+                items = decklist.get(cat, [])
+                if isinstance(items, list):
+                    for item in items:
+                        if isinstance(item, dict):
+                            all_cards_raw.append(item)
+                            
+            if not all_cards_raw: continue
+            
+            sig, normalized_cards = compute_deck_signature(all_cards_raw)
+            
+            rec = player.get("record", {})
+            w, l, t = rec.get("wins", 0), rec.get("losses", 0), rec.get("ties", 0)
+            
+            p_id = player_name(player.get("player") or player.get("name"))
+                
+            if sig not in decks:
+                decks[sig] = 0
+                cards[sig] = normalized_cards
+                names[sig] = player.get("deck", {}).get("name", "Unknown")
+            decks[sig] += 1
+            players.append((sig, str(p_id) if p_id else "Unknown", {"wins": w, "losses": l, "ties": t}))
+    except Exception as e:
+        logger.error(f"Error reading {standings_path}: {e}")
+        return None
+
+    matches = []
+    if os.path.exists(pairings_path):
+        player_sigs = {player_key(p_id): sig for sig, p_id, _ in players}
+        try:
+            matches = _parse_pairings(pairings_path, player_sigs)
+        except Exception as e:
+            logger.error(f"Error reading {pairings_path}: {e}")
+
+    return {
+        "name": t_name,
+        "format": t_format,
+        "bannedCards": t_banned,
+        "decks": decks,
+        "cards": cards,
+        "names": names,
+        "players": players,
+        "matches": matches,
+    }
+
+def _plan_day_scan(date_str, day_path, known, day_manifest, known_matches=(), force=False):
+    """
+    Work out what rescanning one day involves without parsing anything.
+    known: t_ids ingested for the day last time; an old-format day entry is listed as None.
+    known_matches: t_ids whose pairings were ingested; known tournaments missing from it
+    (ingested before pairings were) are parsed again.
+    force: hash every file again instead of trusting unchanged sizes and mtimes.
+    Returns None if there is nothing to do, otherwise a plan dict:
+        old_format: the day holds an old-format entry, which is replaced as a whole
+        known, known_matches: sets of t_ids as above
+        manifest: new {t_id: fingerprint} for the tournaments on disk
+        unchanged / changed: sorted t_ids whose content matches / differs from the manifest
+    """
+    is_old_format = None in known
+
+    # A vanished day directory only counts as deleted data if we tracked its files
+    if not os.path.exists(day_path) and not day_manifest:
+        return None
+    if is_old_format:
+        # No per-tournament index in the old format: the whole day is replaced
+        day_manifest = {}
+
+    t_ids = sorted(os.listdir(day_path)) if os.path.exists(day_path) else []
+    plan = {
+        "date": date_str,
+        "day_path": day_path,
+        "old_format": is_old_format,
+        "known": set() if is_old_format else set(known),
+        "known_matches": set() if is_old_format else set(known_matches),
+        "manifest": {},
+        "unchanged": [],
+        "changed": [],
+    }
+    for t_id in t_ids:
+        previous = day_manifest.get(t_id)
+        fingerprint = _tournament_fingerprint(os.path.join(day_path, t_id), None if force else previous)
+        if fingerprint is None:
+            continue
+        plan["manifest"][t_id] = fingerprint
+        if _same_content(previous, fingerprint) and (t_id in plan["known_matches"] or t_id not in plan["known"]):
+            plan["unchanged"].append(t_id)
+        else:
+            plan["changed"].append(t_id)
+    return plan
+
+def _plan_changes_data(plan):
+    """True if applying the plan changes the ingested data, not just the manifest."""
+    return plan["old_format"] or bool(plan["changed"]) or any(t_id not in plan["manifest"] for t_id in plan["known"])
+
+def _apply_day_scan(plan, parsed_results, update, card_type_map):
+    """
+    Apply a day plan to a store.StoreUpdate: drop the changed and deleted tournaments and add the re-parsed ones.
+    parsed_results: {t_id: _parse_tournament() result} for plan["changed"].
+    """
+    date_str = plan["date"]
+    if plan["old_format"]:
+        update.drop_tournament(date_str, None)
+
+    for t_id in plan["changed"]:
+        if t_id in plan["known"]:
+            update.drop_tournament(date_str, t_id)
+        parsed = parsed_results.get(t_id)
+        if parsed is None or not parsed["decks"]:
+            continue
+        update.add_tournament(date_str, t_id, parsed, card_type_map)
+
+    # Tournaments ingested before whose files are gone
+    for t_id in plan["known"]:
+        if t_id not in plan["manifest"]:
+            update.drop_tournament(date_str, t_id)
+
+def _iter_parsed_tournaments(t_dirs, workers=1):
+    """
+    Parse tournament directories, yielding results in input order.
+    With workers > 1 the parsing is spread over a process pool.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1 or len(t_dirs) < 2:
+        for t_dir in t_dirs:
+            yield _parse_tournament(t_dir)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+    chunk_size = max(1, min(32, len(t_dirs) // (workers * 4)))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(_parse_tournament, t_dirs, chunksize=chunk_size)
+
+def _scan_and_aggregate(days_back=30, force_refresh=False, start_date=None, end_date=None, update_cache=False, workers=1):
+    """
+    Scan standings.json files and aggregate exact deck counts.
+    If update_cache is False, strictly read from the existing cache file without scanning new files or writing.
+    Returns the (dates, signatures) of the shared cache snapshot, which must not be mutated.
+    workers: processes used to parse changed tournaments (None = all cores); the result is identical for any value.
+    """
     # If we are not allowed to update the cache, simply return what we loaded.
     # The UI should use this mode.
     if not update_cache:
-        # We might want to ensure we have the signatures lookup even if we don't scan
-        return cache, signatures
+        snapshot = _get_cache_snapshot()
+        return snapshot.dates, snapshot.signatures
+
+    # Plan from the store's tournament index; the columns are only loaded if something changed
+    reader = store.open_store(STORE_DIR)
+    legacy = None
+    if reader is not None:
+        ingested = reader.tournament_index()
+        ingested_matches = reader.match_index()
+        manifest = reader.manifest()
+    else:
+        legacy = _read_legacy_cache_file()
+        ingested = {
+            d: [None] if "decks" in entry and "tournaments" not in entry else list(entry.get("tournaments", {}))
+            for d, entry in legacy["dates"].items()
+        }
+        ingested_matches = {}
+        manifest = legacy["manifest"]
 
     # Determine date range to scan
     today_dt = datetime.now()
@@ -199,263 +814,126 @@ def _scan_and_aggregate(days_back=30, force_refresh=False, start_date=None, end_
     
     current = datetime.strptime(cutoff_date, "%Y-%m-%d")
     end = datetime.strptime(last_date, "%Y-%m-%d")
-    
-    updated = False
-    
-    # Pre-load card DB for type enrichment
-    card_db_list = load_card_database()
-    card_type_map = {
-        (c["set"], c["num"]): c["type"] for c in card_db_list
-    }
 
+    # Check every day in range against the manifest: a stat() walk for unchanged files,
+    # which also catches edited and deleted tournaments on days ingested long ago
+    plans = []
     while current <= end:
         date_str = current.strftime("%Y-%m-%d")
         year, month, day = date_str.split("-")
-        
-        # Simple check: if not in cache or recent (<=2 days), scan
-        # Note: We also scan if the cache entry is in the OLD format (has 'decks' but no 'tournaments')
-        is_recent = (today_dt - current).days <= 2
-        entry = cache.get(date_str, {})
-        is_old_format = "decks" in entry and "tournaments" not in entry
-        should_scan = force_refresh or date_str not in cache or is_recent or is_old_format
-        
-        if should_scan:
-            day_path = os.path.join(TOURNAMENTS_DIR, year, month, day)
-            day_tournaments = {}
-            
-            if os.path.exists(day_path):
-                # Before scanning this date, remove existing appearances for this date to avoid dupes
-                for sig in signatures:
-                    signatures[sig]["appearances"] = [
-                        app for app in signatures[sig].get("appearances", []) 
-                        if app.get("date") != date_str
-                    ]
-
-                for t_id in os.listdir(day_path):
-                    t_dir = os.path.join(day_path, t_id)
-                    standings_path = os.path.join(t_dir, "standings.json")
-                    details_path = os.path.join(t_dir, "details.json")
-                    
-                    if not os.path.exists(standings_path):
-                        continue
-                        
-                    # Get tournament format and banned cards
-                    t_format = None
-                    t_banned = None
-                    if os.path.exists(details_path):
-                        try:
-                            with open(details_path, "r") as dfp:
-                                det = json.load(dfp)
-                                t_format = det.get("format")
-                                t_banned = det.get("bannedCards")
-                        except: pass
-                    
-                    try:
-                        with open(standings_path, "r") as f:
-                            standings = json.load(f)
-                            
-                        t_decks = {}
-                        for player in standings:
-                            if not isinstance(player, dict): continue
-                            
-                            decklist = player.get("decklist", {})
-                            if not decklist: continue
-                            
-                            all_cards_raw = []
-                            for cat in ["pokemon", "trainer", "energy"]:
-                                items = decklist.get(cat, [])
-                                if isinstance(items, list):
-                                    for item in items:
-                                        if isinstance(item, dict):
-                                            all_cards_raw.append(item)
-                                            
-                            if not all_cards_raw: continue
-                            
-                            sig, normalized_cards = compute_deck_signature(all_cards_raw)
-                            
-                            if sig not in signatures:
-                                enriched = []
-                                for c in normalized_cards:
-                                    c_type = card_type_map.get((c["set"], c["number"]), "Unknown")
-                                    c["type"] = c_type
-                                    enriched.append(c)
-                                    
-                                signatures[sig] = {
-                                    "name": player.get("deck", {}).get("name", "Unknown"),
-                                    "cards": enriched,
-                                    "stats": {"wins": 0, "losses": 0, "ties": 0, "players": 0},
-                                    "appearances": []
-                                }
-                            
-                            rec = player.get("record", {})
-                            w, l, t = rec.get("wins", 0), rec.get("losses", 0), rec.get("ties", 0)
-                            
-                            # Stats are re-derived from appearances at the end to avoid double-counting
-                            
-                            p_id = player.get("player") or player.get("name")
-                            if isinstance(p_id, dict):
-                                p_id = p_id.get("name") or p_id.get("id") or str(p_id)
-                                
-                            signatures[sig]["appearances"].append({
-                                "t_id": t_id,
-                                "player_id": str(p_id) if p_id else "Unknown",
-                                "record": {"wins": w, "losses": l, "ties": t},
-                                "date": date_str
-                            })
-                            
-                            t_decks[sig] = t_decks.get(sig, 0) + 1
-                        
-                        if t_decks:
-                            day_tournaments[t_id] = {
-                                "format": t_format,
-                                "bannedCards": t_banned,
-                                "decks": t_decks
-                            }
-                            
-                    except Exception as e:
-                        logger.error(f"Error reading {standings_path}: {e}")
-            
-            if day_tournaments:
-                cache[date_str] = {"tournaments": day_tournaments}
-                updated = True
-            elif date_str in cache:
-                # If we scanned and found nothing, but it was there before, we might want to keep it or clear it.
-                # For safety, if we explicitly scanned and found nothing, it means data is gone.
-                pass
+        day_path = os.path.join(TOURNAMENTS_DIR, year, month, day)
+        plan = _plan_day_scan(date_str, day_path, ingested.get(date_str, []), manifest.get(date_str, {}),
+                              ingested_matches.get(date_str, ()), force_refresh)
+        if plan is not None:
+            plans.append(plan)
 
         current += timedelta(days=1)
-        
-    # Recalculate all stats from appearances to ensure consistency and avoid double-counting
-    for sig in signatures:
-        apps = signatures[sig].get("appearances", [])
-        w_total = sum(app.get("record", {}).get("wins", 0) for app in apps)
-        l_total = sum(app.get("record", {}).get("losses", 0) for app in apps)
-        t_total = sum(app.get("record", {}).get("ties", 0) for app in apps)
-        signatures[sig]["stats"] = {
-            "wins": w_total,
-            "losses": l_total,
-            "ties": t_total,
-            "players": len(apps)
-        }
-    
-    # We always set updated to True if we are doing a scan that involves recalculation 
-    # to ensure the corrected stats are saved.
-    if force_refresh:
-        updated = True
-        
-    if updated and update_cache:
-        try:
-            os.makedirs(os.path.dirname(CACHE_FILE), exist_ok=True)
-            # Use mkstemp to avoid race conditions with fixed temp filename
-            import tempfile
-            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(CACHE_FILE), suffix='.tmp')
-            
+
+    new_manifest = dict(manifest)
+    for plan in plans:
+        if plan["manifest"]:
+            new_manifest[plan["date"]] = plan["manifest"]
+        else:
+            new_manifest.pop(plan["date"], None)
+
+    # A full refresh re-derives all stats, and legacy pickle/JSON caches are rewritten in the store format
+    migrate = legacy is not None and bool(legacy["dates"] or legacy["signatures"])
+    if not (force_refresh or migrate or any(_plan_changes_data(p) for p in plans)):
+        if reader is not None and new_manifest != manifest:
+            # Only file mtimes moved: record them so the files are not hashed again
             try:
-                with os.fdopen(fd, 'wb') as f:
-                    pd.to_pickle({"dates": cache, "signatures": signatures}, f, compression='gzip')
-                os.replace(temp_path, CACHE_FILE)
-                
-                # Clear internal cache to force reload
-                global _SIGNATURES_CACHE
-                _SIGNATURES_CACHE = None
+                store.write_manifest(STORE_DIR, new_manifest)
+                _invalidate_cache_snapshot()
             except Exception as e:
-                # Clean up temp file if something failed before replace
-                if os.path.exists(temp_path):
-                    os.remove(temp_path)
-                raise e
-            
-            # Clean up old JSON cache if it exists
-            if os.path.exists(OLD_CACHE_FILE):
+                logger.error(f"Error saving cache manifest: {e}")
+        snapshot = _get_cache_snapshot()
+        return snapshot.dates, snapshot.signatures
+
+    if reader is not None:
+        update = store.StoreUpdate.from_reader(reader)
+    else:
+        update = store.StoreUpdate.from_cache(legacy["dates"], legacy["signatures"], manifest)
+    update.manifest = new_manifest
+
+    # Pre-load card DB for type enrichment
+    card_db_list = load_card_database()
+    card_type_map = {
+        (c["set"], c["num"]): c["type"] for c in card_db_list
+    }
+
+    # Parse changed tournaments (optionally in parallel) and apply them in (date, t_id) order,
+    # so the result does not depend on the number of workers
+    t_dirs = [os.path.join(p["day_path"], t_id) for p in plans for t_id in p["changed"]]
+    if t_dirs:
+        logger.info(f"Parsing {len(t_dirs)} tournaments (workers={workers})...")
+    parsed_iter = _iter_parsed_tournaments(t_dirs, workers)
+    for plan in plans:
+        parsed_results = {t_id: next(parsed_iter) for t_id in plan["changed"]}
+        _apply_day_scan(plan, parsed_results, update, card_type_map)
+    parsed_iter.close()
+
+    try:
+        # A full refresh re-derives all stats from appearances to repair any drift
+        update.write(STORE_DIR, rederive_stats=force_refresh)
+        # Clear internal cache to force reload
+        _invalidate_cache_snapshot()
+
+        # Clean up legacy cache files once the store holds their data
+        for legacy_file in (CACHE_FILE, OLD_CACHE_FILE):
+            if os.path.exists(legacy_file):
                 try:
-                    os.remove(OLD_CACHE_FILE)
-                    logger.info(f"Removed old JSON cache: {OLD_CACHE_FILE}")
+                    os.remove(legacy_file)
+                    logger.info(f"Migrated and removed legacy cache: {legacy_file}")
                 except Exception as e:
-                    logger.warning(f"Could not remove old JSON cache: {e}")
-                
-        except Exception as e:
-            logger.error(f"Error saving cache: {e}")
-            
-    return cache, signatures
+                    logger.warning(f"Could not remove legacy cache {legacy_file}: {e}")
+
+    except Exception as e:
+        logger.error(f"Error saving cache: {e}")
+
+    snapshot = _get_cache_snapshot()
+    return snapshot.dates, snapshot.signatures
 
 def get_daily_share_data(card_filters=None, exclude_cards=None, window=7, min_total_players=5, start_date=None, end_date=None, standard_only=False):
     """
     Get daily deck share data.
     """
-    # Scan a bit more than window to allow rolling mean calculation if needed
-    # If explicit dates provided, we use them.
-    scan_start = start_date
-    if not scan_start:
-        scan_days = window + 7
-        scan_start = (datetime.now() - timedelta(days=scan_days)).strftime("%Y-%m-%d")
-
-    daily_raw, sig_lookup = _scan_and_aggregate(start_date=scan_start, end_date=end_date)
-    
-    if not daily_raw:
-        return pd.DataFrame()
-        
-    all_dates = sorted(daily_raw.keys())
-    
-    # Filter and aggregate daily_raw into a cleaner daily format: date -> {sig: count}
-    daily_aggregated = {}
-    valid_signatures_meta = set() # To identify which sigs exist in the filtered set
+    snapshot = _get_cache_snapshot()
+    matrix = snapshot.daily_matrix
 
-    for date_str in all_dates:
-        if start_date and date_str < start_date: continue
-        if end_date and date_str > end_date: continue
-        
-        day_entry = daily_raw[date_str]
-        day_decks = Counter()
-        
-        # Support both old and new cache format for robustness during transition
-        if "tournaments" in day_entry:
-            for t_id, t_data in day_entry["tournaments"].items():
-                if standard_only and t_data.get("format") is not None:
-                    continue
-                if t_data.get("bannedCards") is not None:
-                    continue
-                day_decks.update(t_data.get("decks", {}))
-        elif "decks" in day_entry:
-            # Old format doesn't have format info, include if not standard_only
-            if not standard_only:
-                day_decks.update(day_entry["decks"])
-        
-        if day_decks:
-            daily_aggregated[date_str] = day_decks
-            valid_signatures_meta.update(day_decks.keys())
-
-    if not daily_aggregated:
-        return pd.DataFrame()
+    days, counts = matrix.day_counts(start_date, end_date, standard_only=standard_only)
 
-    # Convert to DataFrame
-    df = pd.DataFrame.from_dict(daily_aggregated, orient='index').fillna(0)
-    
     # Calculate daily totals for meta-share normalization (BEFORE filtering)
-    daily_metagame_totals = df.sum(axis=1)
+    daily_metagame_totals = np.asarray(counts.sum(axis=1)).ravel()
 
-    # Filter columns by card criteria
-    final_cols = []
-    for sig in df.columns:
-        info = sig_lookup.get(sig)
-        if not info: continue
-        
-        card_ids = set(f"{c['set']}_{c['number']}" for c in info.get("cards", []))
-        if card_filters and not all(f in card_ids for f in card_filters):
-            continue
-        if exclude_cards and any(f in card_ids for f in exclude_cards):
-            continue
-        
-        final_cols.append(sig)
-    
-    if not final_cols:
+    # Days without any deck in the selected tournaments are left out
+    active_days = np.flatnonzero(daily_metagame_totals > 0)
+    if len(active_days) == 0:
+        return pd.DataFrame()
+    counts = counts[active_days]
+    daily_metagame_totals = daily_metagame_totals[active_days]
+    days = [days[i] for i in active_days]
+
+    # Filter columns by card criteria, on the columns' signature table rows
+    card_mask = _card_filter_mask(snapshot, card_filters, exclude_cards)
+    cols = columns_by_first_use(counts)
+    rows = snapshot.matrix_sig_rows[cols]
+    keep = rows >= 0
+    keep[keep] = card_mask[rows[keep]]
+    final_cols, final_rows = cols[keep], rows[keep]
+
+    if len(final_cols) == 0:
         return pd.DataFrame()
         
-    df = df[final_cols]
-    
-    # Rename columns to display format f"{name} ({sig})"
-    df.columns = [f"{sig_lookup.get(s, {}).get('name', 'Unknown')} ({s})" for s in df.columns]
+    values = counts[:, final_cols].toarray().astype(np.float64)
 
     # Normalize by the sum of FILTERED decks on each day (back to 100% within the view)
-    df_normalized = df.div(df.sum(axis=1), axis=0).fillna(0) * 100
+    view_totals = values.sum(axis=1, keepdims=True)
+    shares = np.divide(values, view_totals, out=np.zeros_like(values), where=view_totals > 0) * 100
+
+    # Rename columns to display format f"{name} ({sig})"
+    sig_names = snapshot.sig_names
+    columns = [f"{sig_names[r]} ({matrix.sigs[c]})" for c, r in zip(final_cols.tolist(), final_rows.tolist())]
+    df_normalized = pd.DataFrame(shares, index=days, columns=columns)
     
     if window > 1:
         df_normalized = df_normalized.rolling(window=window, min_periods=1).mean()
@@ -466,36 +944,33 @@ def get_daily_share_data(card_filters=None, exclude_cards=None, window=7, min_to
 
     return df_normalized
 
-# Global variable to cache the signatures part of the JSON to avoid repetitive large reads
-_SIGNATURES_CACHE = None
-_CACHE_MTIME = 0
-
 def _get_all_signatures():
-    """Internal helper to load and cache all signatures from the large JSON file."""
-    global _SIGNATURES_CACHE, _CACHE_MTIME
-    if not os.path.exists(CACHE_FILE):
-        return {}
-    
-    mtime = os.path.getmtime(CACHE_FILE)
-    if _SIGNATURES_CACHE is not None and mtime == _CACHE_MTIME:
-        return _SIGNATURES_CACHE
-    
-    try:
-        data = pd.read_pickle(CACHE_FILE)
-        _SIGNATURES_CACHE = data.get("signatures", {})
-        _CACHE_MTIME = mtime
-        return _SIGNATURES_CACHE
-    except Exception as e:
-        logger.error(f"Error loading cache for signatures: {e}")
-        return _SIGNATURES_CACHE or {}
+    """Internal helper returning all signatures from the shared cache snapshot."""
+    return _get_cache_snapshot().signatures
 
-def get_deck_details_by_signature(signatures, start_date=None, end_date=None):
+def _card_filter_mask(snapshot, card_filters=None, exclude_cards=None):
+    """
+    Boolean mask over the snapshot's signature rows: decks containing every card in
+    card_filters and none of exclude_cards (card IDs "SET_NUMBER").
+    Evaluated as AND / AND NOT over the packed card bitsets.
+    """
+    n_sigs = snapshot.card_matrix.shape[0]
+    bits = np.full(snapshot.card_bits.shape[2], 0xFF, dtype=np.uint8)
+    for card in card_filters or []:
+        bits &= snapshot.card_bitset(card)
+    for card in exclude_cards or []:
+        bits &= ~snapshot.card_bitset(card)
+    return np.unpackbits(bits, count=n_sigs).astype(bool)
+
+def get_deck_details_by_signature(signatures, start_date=None, end_date=None, include_appearances=True):
     """
     Get deck details (name, cards) for a list of signatures.
     If dates are provided, statistics are filtered to that period.
+    include_appearances: set to False when only name/cards/stats are needed (tooltips, simulator decks).
     Returns a dictionary: sig -> {name, cards, stats, appearances}
     """
-    all_sigs = _get_all_signatures()
+    snapshot = _get_cache_snapshot()
+    all_sigs = snapshot.signatures
     result = {}
     for sig in signatures:
         if sig in all_sigs:
@@ -503,28 +978,18 @@ def get_deck_details_by_signature(signatures, start_date=None, end_date=None):
             
             # Enrich cards
             if "cards" in info:
-                info["cards"] = enrich_card_data(info["cards"])
+                info["cards"] = get_signature_cards(sig)
             
             # Filter appearances and recalculate stats if dates provided
+            if include_appearances:
+                table = snapshot.appearances
+                info["appearances"] = table.records(table.rows([sig], start_date=start_date, end_date=end_date))
             if start_date or end_date:
-                apps = info.get("appearances", [])
-                filtered_apps = []
-                for app in apps:
-                    date = app.get("date")
-                    if start_date and date < start_date: continue
-                    if end_date and date > end_date: continue
-                    filtered_apps.append(app)
-                
-                w = sum(a.get("record", {}).get("wins", 0) for a in filtered_apps)
-                l = sum(a.get("record", {}).get("losses", 0) for a in filtered_apps)
-                t = sum(a.get("record", {}).get("ties", 0) for a in filtered_apps)
-                
-                info["appearances"] = filtered_apps
+                table = snapshot.appearances
+                totals = table.sig_totals([table.sig_index[sig]], start_date=start_date, end_date=end_date)
                 info["stats"] = {
-                    "wins": w,
-                    "losses": l,
-                    "ties": t,
-                    "players": len(filtered_apps)
+                    "wins": int(totals["wins"][0]), "losses": int(totals["losses"][0]),
+                    "ties": int(totals["ties"][0]), "players": int(totals["count"][0]),
                 }
             
             result[sig] = info
@@ -533,128 +998,126 @@ def get_deck_details_by_signature(signatures, start_date=None, end_date=None):
 def get_deck_details(sig, start_date=None, end_date=None):
     return get_deck_details_by_signature([sig], start_date=start_date, end_date=end_date).get(sig)
 
+def _tournament_bundle(snapshot, k):
+    """
+    Decoded pairings of tournament k of the snapshot's match table:
+        name: details.json name or the tournament ID
+        round, winner: per pairing ("?" for unknown rounds; winner side 1, 2 or 0)
+        player, key, sig, deck: (p1, p2) pairs of per-pairing lists / arrays of display names,
+            canonical player IDs (-1 for byes), signatures and "name (sig)" deck labels (None / "Unknown" if missing)
+    Bundles are shared by every session and kept per cache version in an LRU bounded by
+    their total number of pairings (TOURNAMENT_BUNDLE_CACHE_ROWS). Do not modify them.
+    """
+    global _TOURNAMENT_BUNDLE_ROWS
+    key = (snapshot.key, k)
+    with _TOURNAMENT_BUNDLE_LOCK:
+        bundle = _TOURNAMENT_BUNDLE_CACHE.pop(key, None)
+        if bundle is not None:
+            _TOURNAMENT_BUNDLE_CACHE[key] = bundle  # Mark as most recently used
+            return bundle
+
+    table = snapshot.matches
+    sig_lookup = snapshot.signatures
+    lo, hi = int(table.t_ptr[k]), int(table.t_ptr[k + 1])
+    deck_labels = {}
+
+    def _decode(players, sigs):
+        names = [None if p < 0 else str(table.players[p]) for p in players.tolist()]
+        keys = np.where(players >= 0, table.player_key[np.maximum(players, 0)], -1)
+        sig_strs = [None if i < 0 else str(table.sigs[i]) for i in sigs.tolist()]
+        decks = []
+        for sig in sig_strs:
+            if sig not in deck_labels:
+                opp_info = (sig_lookup.get(sig) or {}) if sig else {}
+                deck_labels[sig] = f"{opp_info.get('name', 'Unknown')} ({sig})" if sig else "Unknown"
+            decks.append(deck_labels[sig])
+        return names, keys, sig_strs, decks
+
+    p1 = _decode(table.p1[lo:hi], table.p1_sig[lo:hi])
+    p2 = _decode(table.p2[lo:hi], table.p2_sig[lo:hi])
+    bundle = {
+        "name": table.t_names[k] or table.t_ids[k],
+        "round": [r if r >= 0 else "?" for r in table.round[lo:hi].tolist()],
+        "winner": table.winner[lo:hi].tolist(),
+        "player": (p1[0], p2[0]),
+        "key": (p1[1], p2[1]),
+        "sig": (p1[2], p2[2]),
+        "deck": (p1[3], p2[3]),
+    }
+
+    with _TOURNAMENT_BUNDLE_LOCK:
+        if key not in _TOURNAMENT_BUNDLE_CACHE:
+            _TOURNAMENT_BUNDLE_CACHE[key] = bundle
+            _TOURNAMENT_BUNDLE_ROWS += max(hi - lo, 1)
+            while _TOURNAMENT_BUNDLE_ROWS > TOURNAMENT_BUNDLE_CACHE_ROWS and len(_TOURNAMENT_BUNDLE_CACHE) > 1:
+                _, evicted = _TOURNAMENT_BUNDLE_CACHE.popitem(last=False)
+                _TOURNAMENT_BUNDLE_ROWS -= max(len(evicted["winner"]), 1)
+    return bundle
+
 def get_match_history(appearances):
     """
-    Look up detailed matches for a list of player appearances.
+    Look up detailed matches for a list of player appearances in the ingested pairings.
     """
     if not appearances:
         return []
-        
-    # Group appearances by tournament to avoid redundant IO
-    from collections import defaultdict
+
+    snapshot = _get_cache_snapshot()
+    table = snapshot.matches
+
+    # Group canonical player IDs by tournament, in order of first appearance
     tournaments_to_players = defaultdict(set)
     for app in appearances:
         t_id = app.get("t_id")
         date_str = app.get("date")
-        p_name = app.get("player_id")
-        if isinstance(p_name, dict):
-            p_name = p_name.get("name") or p_name.get("id") or str(p_name)
+        p_name = player_name(app.get("player_id"))
         if t_id and date_str and p_name:
-            tournaments_to_players[(date_str, t_id)].add(str(p_name))
+            p_key = table.player_keys.get(player_key(p_name))
+            if p_key is not None:
+                tournaments_to_players[(date_str, t_id)].add(p_key)
 
     matches = []
-    
     for (date_str, t_id), target_players in tournaments_to_players.items():
-        year, month, day = date_str.split("-")
-        t_path = os.path.join(TOURNAMENTS_DIR, year, month, day, t_id)
-
-        pairings_path = os.path.join(t_path, "pairings.json")
-        standings_path = os.path.join(t_path, "standings.json")
-
-        if os.path.exists(pairings_path) and os.path.exists(standings_path):
-            try:
-                with open(pairings_path, "r") as f:
-                    pairings = json.load(f)
-                with open(standings_path, "r") as f:
-                    standings = json.load(f)
-
-                # Map names to deck info for ALL players in this tournament
-                # We can pre-filter standings slightly if we want, but usually it's small enough
-                player_deck_info = {}
-                for p in standings:
-                    dlist = p.get("decklist", {})
-                    if not dlist: continue
-                    
-                    all_cards = []
-                    for cat in ["pokemon", "trainer", "energy"]:
-                        items = dlist.get(cat, [])
-                        if items: 
-                            for item in items:
-                                if isinstance(item, dict):
-                                    all_cards.append(item)
-
-                    if all_cards:
-                        from src.hashing import compute_deck_signature
-                        opp_sig, _ = compute_deck_signature(all_cards)
-                        deck_name = p.get("deck", {}).get("name", "Unknown")
-                        info = {"sig": opp_sig, "deck_name": deck_name, "cards": all_cards}
-                        p_id = (p.get("player") or p.get("name", "")).lower()
-                        if p_id:
-                            player_deck_info[p_id] = info
-                
-                # Tournament Name
-                t_name = t_id
-                det_path = os.path.join(t_path, "details.json")
-                if os.path.exists(det_path):
-                    with open(det_path, "r") as f:
-                        t_name = json.load(f).get("name", t_id)
-
-                # Normalize target players for matching
-                target_players_lower = {p.lower() for p in target_players}
-
-                for m in pairings:
-                    if not isinstance(m, dict): continue
-                    p1, p2 = m.get("player1"), m.get("player2")
-                    if not p1: continue # Bye or invalid
-                    
-                    if isinstance(p1, dict): p1 = p1.get("name") or p1.get("id") or str(p1)
-                    if isinstance(p2, dict): p2 = p2.get("name") or p2.get("id") or str(p2)
-                    
-                    p1_match = p1.lower() if isinstance(p1, str) else p1
-                    p2_match = p2.lower() if isinstance(p2, str) else p2
-
-                    # Check if either player is one of our targets
-                    is_p1_target = p1_match in target_players_lower
-                    is_p2_target = p2_match in target_players_lower
-
-                    if is_p1_target or is_p2_target:
-                        # Process for EVERY target player involved (could be both in a mirror match)
-                        for target_match, original_p_name in zip([p1_match, p2_match], [p1, p2]):
-                            if target_match not in target_players_lower:
-                                continue
-                                
-                            opp_name = p2 if target_match == p1_match else p1
-                            opp_id = opp_name.lower() if isinstance(opp_name, str) else opp_name
-                            winner = m.get("winner")
-                            winner_match = winner.lower() if isinstance(winner, str) else winner
-                            
-                            res = "Tie"
-                            if winner_match == target_match: res = "Win"
-                            elif winner_match == opp_id: res = "Loss"
-                            
-                            opp_info = player_deck_info.get(opp_id, {})
-                            opp_sig = opp_info.get("sig")
-                                
-                            matches.append({
-                                "date": date_str,
-                                "tournament": t_name,
-                                "t_id": t_id,
-                                "player": original_p_name,
-                                "round": m.get("round", "?"),
-                                "opponent": opp_name,
-                                "opponent_deck": f"{opp_info.get('deck_name', 'Unknown')} ({opp_sig})" if opp_sig else "Unknown",
-                                "opponent_sig": opp_sig,
-                                "opponent_cards": opp_info.get("cards", []),
-                                "result": res
-                            })
-            except Exception as e:
-                logger.error(f"Error lookup pairings for {t_id}: {e}")
+        k = table.tournament(date_str, t_id)
+        if k is None:
+            continue
+        bundle = _tournament_bundle(snapshot, k)
+        targets = list(target_players)
+        is_target = (np.isin(bundle["key"][0], targets), np.isin(bundle["key"][1], targets))
+
+        for row in np.flatnonzero(is_target[0] | is_target[1]).tolist():
+            winner = bundle["winner"][row]
+            # Process for EVERY target player involved (could be both in a mirror match)
+            for side in (0, 1):
+                if not is_target[side][row]:
+                    continue
+                opp = 1 - side
+
+                res = "Tie"
+                if winner == side + 1: res = "Win"
+                elif winner: res = "Loss"
+
+                opp_sig = bundle["sig"][opp][row]
+                matches.append({
+                    "date": date_str,
+                    "tournament": bundle["name"],
+                    "t_id": t_id,
+                    "player": bundle["player"][side][row],
+                    "round": bundle["round"][row],
+                    "opponent": bundle["player"][opp][row],
+                    "opponent_deck": bundle["deck"][opp][row],
+                    "opponent_sig": opp_sig,
+                    "opponent_cards": get_signature_cards(opp_sig) if opp_sig else [],
+                    "result": res
+                })
     return matches
 
 # Global variable to cache cluster mapping
 _SIG_TO_CLUSTER = None
 _ID_TO_CLUSTER = None
 _CLUSTERS_MTIME = 0
+# Cluster rollup of the current (cache snapshot, clusters.json) pair
+_CLUSTER_ROLLUP = None
+_CLUSTER_ROLLUP_LOCK = threading.Lock()
 
 def get_cluster_mapping():
     """Returns a map of sig -> cluster_info and cluster_id -> cluster_info."""
@@ -684,97 +1147,146 @@ def get_cluster_mapping():
         logger.error(f"Error loading clusters: {e}")
         return {}, {}
 
+class _ClusterRollup:
+    """
+    Archetype-level aggregates of one cache snapshot and clusters.json version.
+
+    Keys are archetypes: every cluster of clusters.json, then one key per unclustered signature.
+        labels[k]: display label, "{name} (Cluster {id})" or "Unclustered ({sig})"
+        cluster_ids[k], sigs[k]: cluster ID (None if unclustered) / the unclustered signature
+        key_of_label: label -> key
+        sig_keys: key of each signature table row; col_keys: key of each daily matrix column
+        day_ordinals + wins/losses/ties/players: sparse key x day totals of every appearance
+    """
+    def __init__(self, snapshot, clusters, sig_to_cluster):
+        matrix = snapshot.daily_matrix
+        self.labels, self.cluster_ids, self.sigs = [], [], []
+        for c in clusters:
+            self._add(f"{c['representative_name']} (Cluster {c['id']})", str(c["id"]), None)
+        cluster_key = {cid: k for k, cid in enumerate(self.cluster_ids)}
+
+        def key_of(sig):
+            c_info = sig_to_cluster.get(sig)
+            if c_info:
+                return cluster_key[str(c_info["id"])]
+            return self._add(f"Unclustered ({sig})", None, sig)
+
+        # Matrix columns start with the signature table, followed by signatures only seen in tournament rows
+        self.col_keys = np.array([key_of(sig) for sig in matrix.sigs], dtype=np.int64)
+        sig_list = list(snapshot.signatures)
+        if sig_list == matrix.sigs[:len(sig_list)]:
+            self.sig_keys = self.col_keys[:len(sig_list)]
+        else:
+            self.sig_keys = np.array([key_of(sig) for sig in sig_list], dtype=np.int64)
+        self.key_of_label = {label: k for k, label in enumerate(self.labels)}
+        # Unclustered keys of signatures without stats (only seen in tournament rows) have no details
+        self.has_stats = np.array([cid is not None for cid in self.cluster_ids], dtype=bool)
+        self.has_stats[self.sig_keys] = True
+
+        n_keys = len(self.labels)
+        self._to_key = csr_matrix(
+            (np.ones(len(self.col_keys), dtype=np.int32), (np.arange(len(self.col_keys)), self.col_keys)),
+            shape=(len(self.col_keys), n_keys),
+        )
+        self._day_matrices = {}
+
+        table = snapshot.appearances
+        self.day_ordinals = np.unique(np.asarray(table.date))
+        totals = table.grouped_daily_totals(self.sig_keys, n_keys, self.day_ordinals, sparse=True)
+        self.wins, self.losses, self.ties, self.players = (totals[k] for k in ("wins", "losses", "ties", "count"))
+        self._matrix = matrix
+
+    def _add(self, label, cluster_id, sig):
+        self.labels.append(label)
+        self.cluster_ids.append(cluster_id)
+        self.sigs.append(sig)
+        return len(self.labels) - 1
+
+    def day_counts(self, start_date=None, end_date=None, standard_only=False, exclude_banned=True):
+        """Day x key deck counts: DailyDeckMatrix.day_counts summed into archetypes."""
+        mode = (standard_only, exclude_banned)
+        m = self._day_matrices.get(mode)
+        if m is None:
+            m = self._day_matrices[mode] = (
+                self._matrix.day_matrix(standard_only=standard_only, exclude_banned=exclude_banned) @ self._to_key
+            ).tocsr()
+        lo, hi = self._matrix.day_range(start_date, end_date)
+        return self._matrix.days[lo:hi], m[lo:hi]
+
+    def period_stats(self, keys, start_date=None, end_date=None):
+        """Summed W/L/T and players of the given keys over [start_date, end_date], as cache-style stats dicts."""
+        lo = np.searchsorted(self.day_ordinals, date_to_ordinal(start_date), side="left") if start_date else 0
+        hi = np.searchsorted(self.day_ordinals, date_to_ordinal(end_date), side="right") if end_date else len(self.day_ordinals)
+        sums = {
+            name: np.asarray(m[keys][:, lo:hi].sum(axis=1)).ravel().tolist()
+            for name, m in (("wins", self.wins), ("losses", self.losses), ("ties", self.ties), ("players", self.players))
+        }
+        return [{name: int(sums[name][i]) for name in ("wins", "losses", "ties", "players")} for i in range(len(keys))]
+
+def _get_cluster_rollup(snapshot=None):
+    """
+    Return the cluster rollup, rebuilding it only when the cache or clusters.json changed.
+    Safe to call from concurrent Streamlit sessions.
+    """
+    global _CLUSTER_ROLLUP
+    snapshot = snapshot or _get_cache_snapshot()
+    sig_to_cluster, id_to_cluster = get_cluster_mapping()
+    key = (snapshot.key, _CLUSTERS_MTIME if id_to_cluster else None)
+    rollup = _CLUSTER_ROLLUP
+    if rollup is not None and rollup.key == key:
+        return rollup
+
+    with _CLUSTER_ROLLUP_LOCK:
+        # Another thread may have built this version while we waited
+        rollup = _CLUSTER_ROLLUP
+        if rollup is not None and rollup.key == key:
+            return rollup
+        rollup = _ClusterRollup(snapshot, list(id_to_cluster.values()), sig_to_cluster)
+        rollup.key = key
+        _CLUSTER_ROLLUP = rollup
+        return rollup
+
 def get_clustered_daily_share_data(card_filters=None, exclude_cards=None, window=7, min_total_players=5, start_date=None, end_date=None, standard_only=False):
     """
     Get daily deck share data aggregated by cluster.
     """
-    scan_start = start_date
-    if not scan_start:
-        scan_days = window + 7
-        scan_start = (datetime.now() - timedelta(days=scan_days)).strftime("%Y-%m-%d")
+    snapshot = _get_cache_snapshot()
+    matrix = snapshot.daily_matrix
+    rollup = _get_cluster_rollup(snapshot)
 
-    daily_raw, sig_lookup = _scan_and_aggregate(start_date=scan_start, end_date=end_date)
-    sig_to_cluster, _ = get_cluster_mapping()
-    
-    if not daily_raw:
-        return pd.DataFrame()
-        
-    all_dates = sorted(daily_raw.keys())
-    daily_aggregated = {}
-    valid_clusters = set()
+    days, counts = matrix.day_counts(start_date, end_date, standard_only=standard_only)
 
-    for date_str in all_dates:
-        if start_date and date_str < start_date: continue
-        if end_date and date_str > end_date: continue
-        
-        day_entry = daily_raw[date_str]
-        
-        # Aggregate by cluster
-        cluster_counts = Counter()
-        
-        t_data_list = []
-        if "tournaments" in day_entry:
-            for t_id, t_data in day_entry["tournaments"].items():
-                if standard_only and t_data.get("format") is not None:
-                    continue
-                if t_data.get("bannedCards") is not None:
-                    continue
-                for sig, count in t_data.get("decks", {}).items():
-                    c_info = sig_to_cluster.get(sig)
-                    c_label = f"{c_info['representative_name']} (Cluster {c_info['id']})" if c_info else f"Unclustered ({sig})"
-                    cluster_counts[c_label] += count
-                    
-                    # Store which sigs are in this cluster for filtering
-                    valid_clusters.add(c_label)
-        elif "decks" in day_entry and not standard_only:
-            for sig, count in day_entry["decks"].items():
-                c_info = sig_to_cluster.get(sig)
-                c_label = f"{c_info['representative_name']} (Cluster {c_info['id']})" if c_info else f"Unclustered ({sig})"
-                cluster_counts[c_label] += count
-                valid_clusters.add(c_label)
-        
-        if cluster_counts:
-            daily_aggregated[date_str] = cluster_counts
+    # Calculate daily totals for meta-share normalization (BEFORE filtering)
+    daily_metagame_totals = np.asarray(counts.sum(axis=1)).ravel()
 
-    if not daily_aggregated:
+    active_days = np.flatnonzero(daily_metagame_totals > 0)
+    if len(active_days) == 0:
         return pd.DataFrame()
+    counts = counts[active_days]
+    daily_metagame_totals = daily_metagame_totals[active_days]
+    days = [days[i] for i in active_days]
 
-    # Convert to DataFrame
-    df = pd.DataFrame.from_dict(daily_aggregated, orient='index').fillna(0)
-    
-    # Calculate daily totals for meta-share normalization (BEFORE filtering)
-    daily_metagame_totals = df.sum(axis=1)
+    # Archetypes in order of first use (by the first of their signatures to appear)
+    col_keys = rollup.col_keys[columns_by_first_use(counts)]
+    _, first = np.unique(col_keys, return_index=True)
+    keep = col_keys[np.sort(first)]
 
-    # Filter by cards if requested
+    # Filter by cards if requested: keep archetypes with at least one matching signature
     if card_filters or exclude_cards:
-        matching_sigs = set()
-        for sig, info in sig_lookup.items():
-            card_ids = set(f"{c['set']}_{c['number']}" for c in info.get("cards", []))
-            if card_filters and not all(f in card_ids for f in card_filters):
-                continue
-            if exclude_cards and any(f in card_ids for f in exclude_cards):
-                continue
-            matching_sigs.add(sig)
-            
-        _, id_to_cluster = get_cluster_mapping()
-        filtered_labels = set()
-        for label in df.columns:
-            if "Cluster" in label:
-                cid = label.split("Cluster ")[1].split(")")[0]
-                c_info = id_to_cluster.get(cid)
-                if c_info and any(s in matching_sigs for s in c_info["signatures"]):
-                    filtered_labels.add(label)
-            else:
-                match = re.search(r"\(([\da-f]{8})\)$", label)
-                if match and match.group(1) in matching_sigs:
-                    filtered_labels.add(label)
-        
-        if not filtered_labels:
+        card_mask = _card_filter_mask(snapshot, card_filters, exclude_cards)
+        matching = np.zeros(len(rollup.labels), dtype=bool)
+        matching[rollup.sig_keys[card_mask]] = True
+        keep = keep[matching[keep]]
+        if not len(keep):
             return pd.DataFrame()
-        df = df[list(filtered_labels)]
-        
+
+    _, key_counts = rollup.day_counts(start_date, end_date, standard_only=standard_only)
+    values = key_counts[active_days][:, keep].toarray().astype(np.float64)
+
     # Normalize by the sum of FILTERED clusters on each day (back to 100% within the view)
-    df_normalized = df.div(df.sum(axis=1), axis=0).fillna(0) * 100
+    view_totals = values.sum(axis=1, keepdims=True)
+    shares = np.divide(values, view_totals, out=np.zeros_like(values), where=view_totals > 0) * 100
+    df_normalized = pd.DataFrame(shares, index=days, columns=[rollup.labels[k] for k in keep])
     
     if window > 1:
         df_normalized = df_normalized.rolling(window=window, min_periods=1).mean()
@@ -839,18 +1351,13 @@ def get_daily_winrate_for_decks(identifiers, window=7, start_date=None, end_date
     identifiers: List of raw signatures or cluster IDs (strings).
     Returns: pd.DataFrame where columns are formatted names and valus are WR %.
     """
-    scan_start = start_date
-    if not scan_start:
-        scan_days = window + 7
-        scan_start = (datetime.now() - timedelta(days=scan_days)).strftime("%Y-%m-%d")
-
-    daily_raw, sig_lookup = _scan_and_aggregate(start_date=scan_start, end_date=end_date)
+    snapshot = _get_cache_snapshot()
+    sig_lookup = snapshot.signatures
     sig_to_cluster, id_to_cluster = get_cluster_mapping()
 
-    if not daily_raw:
+    all_dates = snapshot.daily_matrix.days
+    if not all_dates:
         return pd.DataFrame()
-
-    all_dates = sorted(daily_raw.keys())
     
     # Store daily stats: identifier -> date -> {wins, losses, ties}
     daily_stats = {i: {} for i in identifiers}
@@ -877,27 +1384,14 @@ def get_daily_winrate_for_decks(identifiers, window=7, start_date=None, end_date
     if not date_grid:
          return pd.DataFrame()
 
-    # identifier -> date -> {w, l, t}
-    agg_data = {ident: {d: {"w": 0, "m": 0} for d in date_grid} for ident in identifiers}
+    table = snapshot.appearances
+    grid_ordinals = dates_to_ordinals(date_grid)
 
+    # Group the relevant signatures by the identifier they roll up into
+    target_to_sigs = defaultdict(list)
     for sig in relevant_sigs:
-        info = sig_lookup.get(sig)
-        if not info: continue
-        
-        target_id = sig_to_target_id.get(sig)
-        if target_id not in agg_data: continue
-
-        for app in info.get("appearances", []):
-            d = app.get("date")
-            if d in agg_data[target_id]:
-                rec = app.get("record", {})
-                w = rec.get("wins", 0)
-                l = rec.get("losses", 0)
-                t = rec.get("ties", 0)
-                mtch = w + l + t
-                
-                agg_data[target_id][d]["w"] += w
-                agg_data[target_id][d]["m"] += mtch
+        if sig not in sig_lookup: continue
+        target_to_sigs[sig_to_target_id[sig]].append(sig)
 
     # Build DataFrame
     # Columns needs to be formatted names
@@ -915,23 +1409,14 @@ def get_daily_winrate_for_decks(identifiers, window=7, start_date=None, end_date
              if info:
                  name_label = f"{info.get('name', 'Unknown')} ({ident})"
         
-        # Build Series
-        dates = []
-        wrs = []
-        
-        for d in date_grid:
-            stats = agg_data[ident][d]
-            wr = 0.0
-            if stats["m"] > 0:
-                wr = (stats["w"] / stats["m"]) * 100
-            else:
-                wr = float('nan') # Gap if no matches
+        # Daily wins / matches for every appearance of the identifier's signatures
+        rows = table.rows(target_to_sigs.get(ident, []))
+        daily = table.daily_totals(rows, grid_ordinals)
+        matches = daily["wins"] + daily["losses"] + daily["ties"]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            wrs = np.where(matches > 0, daily["wins"] / matches * 100, np.nan)  # Gap if no matches
             
-            dates.append(d)
-            wrs.append(wr)
-            
-        final_series = pd.Series(data=wrs, index=dates)
-        final_data[name_label] = final_series
+        final_data[name_label] = pd.Series(data=wrs, index=date_grid)
 
     df = pd.DataFrame(final_data)
     
@@ -950,150 +1435,62 @@ def get_multi_group_trend_data(groups, window=7, start_date=None, end_date=None,
         "totals": pd.Series (daily match totals)
     }
     """
-    scan_start = start_date
-    if not scan_start:
-        scan_days = window + 7
-        scan_start = (datetime.now() - timedelta(days=scan_days)).strftime("%Y-%m-%d")
+    snapshot = _get_cache_snapshot()
 
-    daily_raw, sig_lookup = _scan_and_aggregate(start_date=scan_start, end_date=end_date)
-    
-    if not daily_raw:
+    if not snapshot.daily_matrix.days:
         return {"share": pd.DataFrame(), "wr": pd.DataFrame(), "totals": pd.Series()}
 
-    all_dates = sorted(daily_raw.keys())
-    
     # 1. Calculate Daily Totals (Denominator for Share)
-    daily_totals = {}
-    for date_str in all_dates:
-        if start_date and date_str < start_date: continue
-        if end_date and date_str > end_date: continue
-        
-        day_entry = daily_raw[date_str]
-        day_total = 0
-        
-        if "tournaments" in day_entry:
-            for t_id, t_data in day_entry["tournaments"].items():
-                if standard_only and t_data.get("format") is not None:
-                    continue
-                if t_data.get("bannedCards") is not None:
-                    continue
-                day_total += sum(t_data.get("decks", {}).values())
-        elif "decks" in day_entry:
-             if not standard_only:
-                day_total += sum(day_entry["decks"].values())
-        
-        daily_totals[date_str] = day_total
+    days, counts = snapshot.daily_matrix.day_counts(start_date, end_date, standard_only=standard_only)
+    daily_totals = dict(zip(days, np.asarray(counts.sum(axis=1)).ravel().tolist()))
 
     # 2. Map Signatures to Groups
-    # 2. Map Signatures to Groups (Optimized)
-    # 2a. Identify all relevant cards from groups
-    relevant_cards = set()
+    # Resolve each group's include/exclude cards with the card bitset index into a
+    # signature x label membership matrix (groups sharing a label are summed)
+    label_index = {}
+    member_rows, member_cols = [], []
     for g in groups:
-        relevant_cards.update(g.get("include", []))
-        relevant_cards.update(g.get("exclude", []))
-
-    # 2b. Build Inverted Index: Card -> Decks
-    card_to_sigs = defaultdict(set)
-    all_relevant_sigs = set(sig_lookup.keys())
-
-    for sig, info in sig_lookup.items():
-        for c in info.get("cards", []):
-            cid = f"{c['set']}_{c['number']}"
-            if cid in relevant_cards:
-                card_to_sigs[cid].add(sig)
-    
-    # 2c. Resolve Groups
-    sig_to_groups = defaultdict(list)
-    
-    for g in groups:
-        inc = g.get("include", [])
-        exc = g.get("exclude", [])
-        
-        candidate_sigs = None
-        
-        # Handle Includes
-        if not inc:
-            candidate_sigs = all_relevant_sigs.copy()
-        else:
-            first_card = inc[0]
-            if first_card in card_to_sigs:
-                candidate_sigs = card_to_sigs[first_card].copy()
-            else:
-                candidate_sigs = set()
-            
-            for card in inc[1:]:
-                if not candidate_sigs: break
-                if card in card_to_sigs:
-                    candidate_sigs.intersection_update(card_to_sigs[card])
-                else:
-                    candidate_sigs = set()
-                    break
-        
-        if not candidate_sigs:
-            continue
-            
-        # Handle Excludes
-        if exc:
-            for card in exc:
-                if not candidate_sigs: break
-                if card in card_to_sigs:
-                    candidate_sigs.difference_update(card_to_sigs[card])
-        
-        # Map result to sig_to_groups
-        for sig in candidate_sigs:
-            sig_to_groups[sig].append(g["label"])
+        k = label_index.setdefault(g["label"], len(label_index))
+        mask = _card_filter_mask(snapshot, g.get("include", []), g.get("exclude", []))
+        sig_ids = np.flatnonzero(mask)
+        member_rows.append(sig_ids)
+        member_cols.append(np.full(len(sig_ids), k, dtype=np.int64))
+    n_sigs = snapshot.card_matrix.shape[0]
+    membership = csr_matrix(
+        (np.ones(sum(len(r) for r in member_rows), dtype=np.int64),
+         (np.concatenate(member_rows or [np.empty(0, dtype=np.int64)]),
+          np.concatenate(member_cols or [np.empty(0, dtype=np.int64)]))),
+        shape=(n_sigs, len(label_index)),
+    )
 
     # 3. Aggregate Stats by Group by Day
-    # label -> date -> {wins, losses, count}
-    # Pre-fill
-    group_daily_agg = {g["label"]: {d: {"wins": 0, "losses": 0, "ties": 0, "count": 0} for d in daily_totals} for g in groups}
-
-    for sig, labels in sig_to_groups.items():
-        info = sig_lookup.get(sig)
-        if not info: continue
-        
-        apps = info.get("appearances", [])
-        for app in apps:
-            d = app.get("date")
-            if d not in daily_totals: continue
-            
-            rec = app.get("record", {})
-            w, l, t = rec.get("wins", 0), rec.get("losses", 0), rec.get("ties", 0)
-            
-            for label in labels:
-                entry = group_daily_agg[label][d]
-                entry["wins"] += w
-                entry["losses"] += l
-                entry["ties"] += t
-                entry["count"] += 1
+    day_list = list(daily_totals.keys())
+    daily = snapshot.appearances.membership_daily_totals(membership, dates_to_ordinals(day_list))
+    labels = list(label_index)
 
     # 4. Build DataFrames
+    return _group_trend_frames(labels, daily, day_list, daily_totals, window)
+
+def _group_trend_frames(labels, daily, day_list, daily_totals, window):
+    """
+    Build the trend frames of get_multi_group_trend_data from grouped daily totals.
+    daily: dict of (len(labels), len(day_list)) arrays: wins, losses, ties, count.
+    """
+    day_total_arr = np.array([daily_totals[d] for d in day_list], dtype=np.float64)
+    total_matches = daily["wins"] + daily["losses"] + daily["ties"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        wr = np.where(total_matches > 0, daily["wins"] / total_matches * 100, 0)
+        share = np.where(day_total_arr > 0, daily["count"] / day_total_arr * 100, 0)
+
     share_data = {}
     wr_data = {}
     match_data = {}
     win_data = {}
-    
-    for label in group_daily_agg:
-        shares = {}
-        wrs = {}
-        matches = {}
-        wins = {}
-        for d, stats in group_daily_agg[label].items():
-            total_matches = stats["wins"] + stats["losses"] + stats["ties"]
-            wr = (stats["wins"] / total_matches * 100) if total_matches > 0 else 0
-            
-            day_total = daily_totals.get(d, 0)
-            share = (stats["count"] / day_total * 100) if day_total > 0 else 0
-            
-            shares[d] = share
-            wrs[d] = wr
-            matches[d] = total_matches
-            wins[d] = stats["wins"]
-            
-        share_data[label] = shares
-        wr_data[label] = wrs
-        match_data[label] = matches
-        win_data[label] = wins
+    for i, label in enumerate(labels):
+        share_data[label] = pd.Series(share[i], index=day_list)
+        wr_data[label] = pd.Series(wr[i], index=day_list)
+        match_data[label] = pd.Series(total_matches[i], index=day_list)
+        win_data[label] = pd.Series(daily["wins"][i], index=day_list)
         
     df_share = pd.DataFrame(share_data).fillna(0)
     df_wr = pd.DataFrame(wr_data).fillna(0)
@@ -1116,67 +1513,161 @@ def get_multi_group_trend_data(groups, window=7, start_date=None, end_date=None,
         "totals": pd.Series(daily_totals)
     }
 
+def get_combination_trend_data(var_cards, include=None, exclude=None, labels=None, window=7, start_date=None, end_date=None, standard_only=False):
+    """
+    Trend data for every presence/absence combination of var_cards, among the decks
+    matching the include/exclude filters.
+    Each deck is assigned its combination mask once (bit i set if it holds var_cards[i]),
+    then appearances are aggregated per mask in a single pass.
+    labels: optional {mask: label}; only these combinations are returned, in this order.
+            Defaults to every mask, labelled by the mask itself.
+    Returns the same dict as get_multi_group_trend_data.
+    """
+    snapshot = _get_cache_snapshot()
+
+    if not snapshot.daily_matrix.days:
+        return {"share": pd.DataFrame(), "wr": pd.DataFrame(), "totals": pd.Series()}
+
+    days, counts = snapshot.daily_matrix.day_counts(start_date, end_date, standard_only=standard_only)
+    daily_totals = dict(zip(days, np.asarray(counts.sum(axis=1)).ravel().tolist()))
+
+    n_masks = 1 << len(var_cards)
+    if labels is None:
+        labels = {m: m for m in range(n_masks)}
+
+    # Combination mask of every deck; decks outside the base filters are skipped (-1)
+    n_sigs = snapshot.card_matrix.shape[0]
+    sig_masks = np.zeros(n_sigs, dtype=np.int64)
+    for i, card in enumerate(var_cards):
+        sig_masks |= np.unpackbits(snapshot.card_bitset(card), count=n_sigs).astype(np.int64) << i
+    sig_masks[~_card_filter_mask(snapshot, include, exclude)] = -1
+
+    day_list = list(daily_totals.keys())
+    by_mask = snapshot.appearances.grouped_daily_totals(sig_masks, n_masks, dates_to_ordinals(day_list))
+    masks = list(labels.keys())
+    daily = {k: v[masks] for k, v in by_mask.items()}
+    return _group_trend_frames(list(labels.values()), daily, day_list, daily_totals, window)
+
 def get_period_statistics(df, start_date=None, end_date=None, clustered=False):
     """
-    Calculate period-wide statistics from the daily share dataframe and total counts.
-    Returns: { label: { avg_share, total_stats } }
+    Calculate period-wide statistics for every label of the daily share dataframe.
+    Stats of all labels are summed in one pass over the appearance (or cluster rollup) arrays;
+    names and cards in deck_info are only looked up when a row reads them.
+    Returns: { label: { avg_share, stats, deck_info, cluster_id, sig } }
     """
     if df.empty:
         return {}
-    
-    # We aggregate stats (Matches, Players, WR)
+
+    found = {}  # label -> (cluster_id, sig, stats, load_info)
+
+    # Clustered labels are archetype keys of the cluster rollup: their stats come from its arrays
+    rollup = _get_cluster_rollup() if clustered else None
+    if rollup is not None:
+        keys = [rollup.key_of_label[label] for label in df.columns if label in rollup.key_of_label]
+        keys = [k for k in keys if rollup.has_stats[k]]
+        for k, stats in zip(keys, rollup.period_stats(keys, start_date=start_date, end_date=end_date)):
+            found[rollup.labels[k]] = (rollup.cluster_ids[k], rollup.sigs[k], stats,
+                                       lambda k=k: _rollup_deck_info(rollup, k))
+
+    # Other labels end in "(sig)": resolve them all in one lookup, then sum their rows' prefix sums at once
+    snapshot = _get_cache_snapshot()
+    table = snapshot.appearances
+    labels = [
+        label for label in df.columns
+        if label not in found and not (rollup is not None and label in rollup.key_of_label) and label.endswith(")")
+    ]
+    label_sigs = [label[label.rfind("(") + 1:-1] for label in labels]
+    rows = snapshot.sig_rows(label_sigs)
+    resolved = np.flatnonzero(rows >= 0)
+    if len(resolved):
+        ids, key_of_label = np.unique(rows[resolved], return_inverse=True)
+        totals = table.sig_totals(ids, start_date=start_date, end_date=end_date)
+        for i, k in zip(resolved.tolist(), key_of_label.tolist()):
+            sig = label_sigs[i]
+            stats = {
+                "wins": int(totals["wins"][k]), "losses": int(totals["losses"][k]),
+                "ties": int(totals["ties"][k]), "players": int(totals["count"][k]),
+            }
+            found[labels[i]] = (None, sig, stats, lambda sig=sig: get_deck_details_by_signature([sig], include_appearances=False).get(sig))
+
+    total_period_players_in_view = sum(stats["players"] for _, _, stats, _ in found.values())
+
     stats_map = {}
-    
-    total_period_players_in_view = 0
-    all_details = {}
-    
     for label in df.columns:
-        sig = None
-        cid = None
-        if clustered:
-            if "Cluster" in label:
-                cid = label.split("Cluster ")[1].split(")")[0]
-                details = get_cluster_details(cid, start_date=start_date, end_date=end_date)
-            else:
-                match = re.search(r"\((\w+)\)$", label)
-                sig = match.group(1) if match else None
-                details = get_deck_details(sig, start_date=start_date, end_date=end_date) if sig else None
-        else:
-            match = re.search(r"\((\w+)\)$", label)
-            sig = match.group(1) if match else None
-            details = get_deck_details(sig, start_date=start_date, end_date=end_date) if sig else None
-        
-        if details:
-            all_details[label] = details
-            total_period_players_in_view += details.get("stats", {}).get("players", 0)
-            
-    for label, details in all_details.items():
-        deck_players = details.get("stats", {}).get("players", 0)
-        avg_share = (deck_players / total_period_players_in_view * 100) if total_period_players_in_view > 0 else 0
-        
+        if label not in found:
+            continue
+        cid, sig, stats, load_info = found[label]
+        avg_share = (stats["players"] / total_period_players_in_view * 100) if total_period_players_in_view > 0 else 0
         stats_map[label] = {
             "avg_share": avg_share,
-            "stats": details.get("stats", {}),
-            "deck_info": details
+            "stats": stats,
+            "deck_info": _LazyDeckInfo(stats, load_info),
+            "cluster_id": cid,
+            "sig": sig,
         }
-            
     return stats_map
 
+class _LazyDeckInfo(Mapping):
+    """
+    deck_info of a period-stats row. The stats are known up front; name, cards and the rest
+    are loaded on first access, so only rows that are actually rendered pay for enrichment.
+    """
+    def __init__(self, stats, load):
+        self._stats = stats
+        self._load = load
+        self._info = None
+
+    def _loaded(self):
+        if self._info is None:
+            info = dict(self._load() or {})
+            info["stats"] = self._stats
+            self._info = info
+        return self._info
+
+    def __getitem__(self, key):
+        if key == "stats":
+            return self._stats
+        return self._loaded()[key]
+
+    def __iter__(self):
+        return iter(self._loaded())
+
+    def __len__(self):
+        return len(self._loaded())
+
+    def __bool__(self):
+        return True
+
+def _rollup_deck_info(rollup, k):
+    """
+    Deck info of a rollup archetype for tooltips and tables: name and cards.
+    Clusters show the cards of their representative (or first cached member) signature.
+    """
+    if rollup.cluster_ids[k] is None:
+        return get_deck_details_by_signature([rollup.sigs[k]], include_appearances=False).get(rollup.sigs[k])
+
+    _, id_to_cluster = get_cluster_mapping()
+    c_info = id_to_cluster.get(rollup.cluster_ids[k], {})
+    all_sigs = _get_all_signatures()
+    rep_sig = c_info.get("representative_sig")
+    if rep_sig not in all_sigs:
+        rep_sig = next((s for s in c_info.get("signatures", []) if s in all_sigs), rep_sig)
+    rep = get_deck_details_by_signature([rep_sig], include_appearances=False).get(rep_sig, {}) if rep_sig else {}
+    return {
+        "id": rollup.cluster_ids[k],
+        "name": c_info.get("representative_name"),
+        "representative_sig": rep_sig,
+        "cards": rep.get("cards", []),
+    }
+
 def get_group_details(include_cards, exclude_cards, start_date=None, end_date=None, standard_only=False):
     """
     Get aggregated details for a group defined by include/exclude card filters.
     """
-    all_sigs = _get_all_signatures()
-    matching_sigs = []
-    
-    for sig, info in all_sigs.items():
-        deck_cards = set(f"{c['set']}_{c['number']}" for c in info.get("cards", []))
-        
-        has_inc = not include_cards or all(c in deck_cards for c in include_cards)
-        has_exc = exclude_cards and any(c in deck_cards for c in exclude_cards)
-        
-        if has_inc and not has_exc:
-            matching_sigs.append(sig)
+    snapshot = _get_cache_snapshot()
+    all_sig_list = list(snapshot.signatures)
+    card_mask = _card_filter_mask(snapshot, include_cards, exclude_cards)
+    matching_sigs = [all_sig_list[r] for r in np.flatnonzero(card_mask).tolist()]
             
     if not matching_sigs:
         return None
@@ -1239,157 +1730,142 @@ def get_card_name(english_name, lang="en"):
         trans = load_translations()
         return trans.get(normalize_card_name(english_name), english_name)
     return english_name
+
+def _identifier_signatures(ident, id_to_cluster):
+    """Signatures of a comparison identifier: "Cluster {id}", a bare cluster ID or a signature."""
+    if ident.startswith("Cluster "):
+        try:
+            # Format: "Cluster {id} ({name})" or "Cluster {id}"
+            cid = ident.split("Cluster ")[1].split(")")[0]
+            if cid in id_to_cluster:
+                return id_to_cluster[cid]["signatures"]
+        except: pass
+        return []
+    if ident in id_to_cluster:
+        return id_to_cluster[ident]["signatures"]
+    return [ident]
+
 def get_comparison_stats(signatures, window=7, start_date=None, end_date=None):
     """
     Get detailed comparison statistics for specific deck signatures.
+    All decks are aggregated together and their rolling stats computed as arrays (src.rolling).
     Returns: dict of DataFrames, one for each deck.
-    Each DataFrame has columns: [share, wr, wilson_cumulative, wilson_moving]
+    Each DataFrame has columns: [share, wr, wilson_cumulative, wilson_moving, bayes_cumulative, bayes_moving]
     """
-    scan_start = start_date
-    if not scan_start:
-        scan_days = window + 14 # Extra buffer for rolling
-        scan_start = (datetime.now() - timedelta(days=scan_days)).strftime("%Y-%m-%d")
+    snapshot = _get_cache_snapshot()
+    sig_lookup = snapshot.signatures
 
-    daily_raw, sig_lookup = _scan_and_aggregate(start_date=scan_start, end_date=None) # Always scan to latest for trends
-    
-    if not daily_raw:
+    all_dates = snapshot.daily_matrix.days
+    if not all_dates:
         return {}
-
-    all_dates = sorted(daily_raw.keys())
     date_grid = [d for d in all_dates if (not start_date or d >= start_date) and (not end_date or d <= end_date)]
     if not date_grid:
         return {}
 
     # 1. Daily Metagame Totals (Denominator for Share)
-    daily_metagame_totals = {}
-    for date_str in all_dates:
-        day_entry = daily_raw[date_str]
-        day_total = 0
-        if "tournaments" in day_entry:
-            for t_id, t_data in day_entry["tournaments"].items():
-                # We assume comparison is across all formats or matches main format
-                day_total += sum(t_data.get("decks", {}).values())
-        elif "decks" in day_entry:
-            day_total += sum(day_entry["decks"].values())
-        daily_metagame_totals[date_str] = day_total
-
-    from src.utils import calculate_confidence_interval
+    # We assume comparison is across all formats or matches main format
+    matrix = snapshot.daily_matrix
+    _, all_counts = matrix.day_counts(standard_only=False, exclude_banned=False)
+    daily_metagame_totals = np.asarray(all_counts.sum(axis=1), dtype=np.float64).ravel()
+
     _, id_to_cluster = get_cluster_mapping()
+    table = snapshot.appearances
 
-    result = {}
+    # 2. Resolve identifiers to signatures: one membership column per deck
+    idents = []
+    app_rows, app_cols, deck_rows, deck_cols = [], [], [], []
     for ident in signatures:
-        # Resolve identifier to signatures
-        target_sigs = []
-        if ident.startswith("Cluster "):
-            try:
-                # Format: "Cluster {id} ({name})" or "Cluster {id}"
-                cid = ident.split("Cluster ")[1].split(")")[0]
-                if cid in id_to_cluster:
-                    target_sigs = id_to_cluster[cid]["signatures"]
-            except: pass
-        elif ident in id_to_cluster:
-            target_sigs = id_to_cluster[ident]["signatures"]
-        else:
-            target_sigs = [ident]
-            
-        if not target_sigs:
-            continue
-            
-        # date -> {count, wins, matches}
-        daily_counts = {d: {"c": 0, "w": 0, "m": 0} for d in all_dates}
-        
-        found_any = False
-        for sig in target_sigs:
-            info = sig_lookup.get(sig)
-            if not info:
-                continue
-            found_any = True
-                
-            # Aggregate daily
-            for date_str, day_entry in daily_raw.items():
-                count = 0
-                if "tournaments" in day_entry:
-                    for t_id, t_data in day_entry["tournaments"].items():
-                        count += t_data.get("decks", {}).get(sig, 0)
-                elif "decks" in day_entry:
-                    count += day_entry["decks"].get(sig, 0)
-                daily_counts[date_str]["c"] += count
-
-            # Use appearances for win/loss
-            for app in info.get("appearances", []):
-                d = app.get("date")
-                if d in daily_counts:
-                    rec = app.get("record", {})
-                    w = rec.get("wins", 0)
-                    l = rec.get("losses", 0)
-                    t = rec.get("ties", 0)
-                    daily_counts[d]["w"] += w
-                    daily_counts[d]["m"] += (w + l + t)
-
-        if not found_any:
+        target_sigs = _identifier_signatures(ident, id_to_cluster)
+        found_sigs = [sig for sig in target_sigs if sig_lookup.get(sig)]
+        if not found_sigs:
             continue
+        k = len(idents)
+        idents.append(ident)
+        for sig in found_sigs:
+            if sig in table.sig_index:
+                app_rows.append(table.sig_index[sig])
+                app_cols.append(k)
+            if sig in matrix.sig_index:
+                deck_rows.append(matrix.sig_index[sig])
+                deck_cols.append(k)
+    if not idents:
+        return {}
 
-        # Build Stats
-        rows = []
-        cum_wins = 0
-        cum_matches = 0
-        
-        window_wins = []
-        window_matches = []
+    def _membership(rows, cols, n_rows):
+        return csr_matrix((np.ones(len(rows), dtype=np.int64), (rows, cols)), shape=(n_rows, len(idents)))
 
-        for d in all_dates:
-            stats = daily_counts[d]
-            
-            # Share
-            total_meta = daily_metagame_totals.get(d, 0)
-            share = (stats["c"] / total_meta * 100) if total_meta > 0 else 0
-            
-            # Win Rate
-            wr = (stats["w"] / stats["m"] * 100) if stats["m"] > 0 else float('nan')
-            
-            # Cumulative Wilson
-            cum_wins += stats["w"]
-            cum_matches += stats["m"]
-            if cum_matches > 0:
-                wilson_cum, _ = calculate_confidence_interval(cum_wins, cum_matches)
-            else:
-                wilson_cum = float('nan')
-            
-            # Moving Wilson
-            window_wins.append(stats["w"])
-            window_matches.append(stats["m"])
-            if len(window_wins) > window:
-                window_wins.pop(0)
-                window_matches.pop(0)
-            
-            mov_wins = sum(window_wins)
-            mov_matches = sum(window_matches)
-            if mov_matches > 0:
-                wilson_mov, _ = calculate_confidence_interval(mov_wins, mov_matches)
-            else:
-                wilson_mov = float('nan')
-            
-            rows.append({
-                "date": d,
-                "share": share,
-                "wr": wr,
-                "wilson_cumulative": wilson_cum,
-                "wilson_moving": wilson_mov,
-                "wins_daily": stats["w"],
-                "wins_cumulative": cum_wins,
-                "matches_daily": stats["m"],
-                "matches_moving": mov_matches,
-                "matches_cumulative": cum_matches
-            })
-
-        df = pd.DataFrame(rows).set_index("date")
-        
-        if window > 1:
-            df["share"] = df["share"].rolling(window=window, min_periods=1).mean()
-            df["wr"] = df["wr"].rolling(window=window, min_periods=1).mean()
+    # 3. Daily deck counts from the matrix, wins/matches from the appearances: (deck, day) arrays
+    daily_decks = np.asarray((all_counts @ _membership(deck_rows, deck_cols, all_counts.shape[1])).todense()).T
+    daily = table.membership_daily_totals(_membership(app_rows, app_cols, len(table.sigs)), dates_to_ordinals(all_dates))
+    daily_wins = daily["wins"]
+    daily_matches = daily["wins"] + daily["losses"] + daily["ties"]
+
+    # 4. Rolling stats for all decks at once
+    with np.errstate(divide="ignore", invalid="ignore"):
+        share = np.where(daily_metagame_totals > 0, daily_decks / daily_metagame_totals * 100, 0.0)
+    stats = rolling.win_stats(daily_wins, daily_matches, window)
+    wr = stats["wr"]
+    if window > 1:
+        share = rolling.moving_mean(share, window)
+        wr = rolling.moving_mean(wr, window)
+
+    result = {}
+    for k, ident in enumerate(idents):
+        df = pd.DataFrame({
+            "share": share[k],
+            "wr": wr[k],
+            "wilson_cumulative": stats["wilson_cumulative"][0][k],
+            "wilson_moving": stats["wilson_moving"][0][k],
+            "bayes_cumulative": stats["bayes_cumulative"][k],
+            "bayes_moving": stats["bayes_moving"][k],
+            "wins_daily": daily_wins[k],
+            "wins_cumulative": stats["wins_cumulative"][k],
+            "matches_daily": daily_matches[k],
+            "matches_moving": stats["matches_moving"][k],
+            "matches_cumulative": stats["matches_cumulative"][k],
+        }, index=pd.Index(all_dates, name="date"))
 
         # Filter to requested date window
-        df = df.reindex(date_grid)
-        result[ident] = df
+        result[ident] = df.reindex(date_grid)
 
     return result
+
+def get_matchup_matrix(row_idents, col_idents=None, periods=None):
+    """
+    Head-to-head W/L/T between decks, from the ingested pairings.
+    row_idents, col_idents: signatures or clusters ("Cluster {id}" or a bare cluster ID),
+    as in get_comparison_stats; col_idents defaults to row_idents (a full N x N grid).
+    periods: list of (start_date, end_date), None for an open end; defaults to all time.
+    Returns a dict of int64 arrays shaped (len(periods), len(row_idents), len(col_idents)):
+    wins, losses, ties of each row deck against each column deck.
+    Identifiers without pairings get zeros.
+    """
+    if col_idents is None:
+        col_idents = row_idents
+    if periods is None:
+        periods = [(None, None)]
+
+    table = _get_cache_snapshot().matches
+    _, id_to_cluster = get_cluster_mapping()
+
+    def _membership(idents):
+        # signature x identifier matrix (overlapping identifiers each get the signature)
+        rows, cols = [], []
+        for k, ident in enumerate(idents):
+            for sig in _identifier_signatures(ident, id_to_cluster):
+                i = table.sig_index.get(sig)
+                if i is not None:
+                    rows.append(i)
+                    cols.append(k)
+        return csr_matrix((np.ones(len(rows), dtype=np.int64), (rows, cols)), shape=(len(table.sigs), len(idents)))
+
+    to_rows = _membership(row_idents).T.tocsr()
+    to_cols = _membership(col_idents)
+    counts = table.matchup_counts(periods)
+    shape = (len(periods), len(row_idents), len(col_idents))
+    result = {}
+    for key in ("wins", "losses", "ties"):
+        result[key] = np.zeros(shape, dtype=np.int64)
+        for p, by_sig in enumerate(counts[key]):
+            result[key][p] = (to_rows @ by_sig @ to_cols).toarray()
+    return result
@@ -0,0 +1,80 @@
+"""
+Dense integer IDs for the string identities used across the stats cache:
+signatures, card IDs, tournaments and players.
+
+Hot paths intern each string once and then work on int32 arrays, instead of
+hashing (and re-formatting) the same strings in inner loops. The string tables
+are persisted with the cache store, so IDs are stable for one cache version.
+"""
+
+import numpy as np
+
+def card_id(set_code, number):
+    """Canonical 'SET_NUMBER' card ID, as used by the card filters and enriched_cards.json."""
+    return f"{set_code}_{number}"
+
+def player_name(player):
+    """Display name of a standings/pairings player entry: a name, or a dict with a name or id."""
+    if isinstance(player, dict):
+        player = player.get("name") or player.get("id") or str(player)
+    return player
+
+def player_key(name):
+    """Canonical player identity: standings and pairings spell the same player in different cases."""
+    return str(name).lower()
+
+def player_key_ids(players, key_ids):
+    """
+    Map a table of player names to canonical player IDs, interned in key_ids.
+    Returns an int32 array: entry p is the ID of player_key(players[p]).
+    """
+    if hasattr(players, "tolist"):
+        players = players.tolist()
+    return np.fromiter((key_ids.intern(player_key(p)) for p in players), dtype=np.int32, count=len(players))
+
+class Interner:
+    """
+    Bidirectional table between values and dense int IDs, assigned in first-seen order.
+    values[i] is the value with ID i; index maps a value back to its ID.
+    """
+    def __init__(self, values=()):
+        self.values = list(values)
+        self.index = dict(zip(self.values, range(len(self.values))))
+        if len(self.index) != len(self.values):
+            # Duplicates: keep the first ID of each value
+            values, self.values, self.index = self.values, [], {}
+            for v in values:
+                self.intern(v)
+
+    def intern(self, value):
+        """Return the ID of value, assigning the next one if it is new."""
+        i = self.index.get(value)
+        if i is None:
+            i = self.index[value] = len(self.values)
+            self.values.append(value)
+        return i
+
+    def intern_all(self, values):
+        """Intern every value. Returns their IDs as an int32 array."""
+        intern = self.intern
+        return np.fromiter((intern(v) for v in values), dtype=np.int32)
+
+    def get(self, value, default=None):
+        return self.index.get(value, default)
+
+    def ids(self, values):
+        """IDs of already-known values as an int32 array; unknown values map to -1."""
+        get = self.index.get
+        return np.fromiter((get(v, -1) for v in values), dtype=np.int32)
+
+    def __getitem__(self, i):
+        return self.values[i]
+
+    def __contains__(self, value):
+        return value in self.index
+
+    def __iter__(self):
+        return iter(self.values)
+
+    def __len__(self):
+        return len(self.values)
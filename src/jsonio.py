@@ -0,0 +1,107 @@
+import json
+import logging
+from typing import Any, List, TypedDict
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# Preferred decoder, picked from what is installed: "msgspec", "orjson" or "json"
+BACKEND = "msgspec" if msgspec is not None else ("orjson" if orjson is not None else "json")
+
+# Typed schemas for the tournament files. Only the fields we read are declared;
+# with msgspec everything else is skipped while decoding. Results are plain dicts,
+# so callers use them exactly like json.load() output.
+
+class Card(TypedDict, total=False):
+    name: Any
+    card_name: Any
+    set: Any
+    number: Any
+    count: Any
+    type: Any
+
+class Decklist(TypedDict, total=False):
+    pokemon: List[Card]
+    trainer: List[Card]
+    energy: List[Card]
+
+class DeckName(TypedDict, total=False):
+    name: Any
+
+class Record(TypedDict, total=False):
+    wins: Any
+    losses: Any
+    ties: Any
+
+class StandingEntry(TypedDict, total=False):
+    player: Any
+    name: Any
+    deck: DeckName
+    record: Record
+    decklist: Decklist
+
+class Pairing(TypedDict, total=False):
+    round: Any
+    player1: Any
+    player2: Any
+    winner: Any
+
+_SCHEMAS = {
+    "standings": List[StandingEntry],
+    "pairings": List[Pairing],
+}
+_DECODERS = {}
+
+def _typed_decoder(kind):
+    dec = _DECODERS.get(kind)
+    if dec is None:
+        dec = _DECODERS[kind] = msgspec.json.Decoder(_SCHEMAS[kind])
+    return dec
+
+def decode(data, kind=None, backend=None):
+    """
+    Decode JSON bytes.
+    kind: optional schema name ("standings", "pairings"). With msgspec the typed
+    schema is used; files that do not match it are decoded generically instead.
+    backend: override BACKEND (used by the benchmark).
+    Anything the fast decoders reject is retried with the stdlib json module.
+    """
+    backend = backend or BACKEND
+    if backend == "msgspec" and msgspec is not None:
+        if kind is not None:
+            try:
+                return _typed_decoder(kind).decode(data)
+            except msgspec.ValidationError:
+                pass
+            except msgspec.DecodeError:
+                return json.loads(data)
+        try:
+            return msgspec.json.decode(data)
+        except msgspec.DecodeError:
+            return json.loads(data)
+    if backend in ("msgspec", "orjson") and orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            return json.loads(data)
+    return json.loads(data)
+
+def load(path, kind=None, backend=None):
+    """Read and decode a JSON file. See decode()."""
+    with open(path, "rb") as f:
+        return decode(f.read(), kind=kind, backend=backend)
+
+def load_standings(path, backend=None):
+    return load(path, kind="standings", backend=backend)
+
+def load_pairings(path, backend=None):
+    return load(path, kind="pairings", backend=backend)
@@ -0,0 +1,85 @@
+"""
+Rolling win-rate statistics for many decks at once.
+
+Inputs are (n_series, n_days) arrays of daily counts. Moving and cumulative sums
+come from a single cumulative sum along the day axis, so a window of any length
+costs one subtraction per cell, instead of a Python loop per deck and day.
+"""
+
+import numpy as np
+
+from src.utils import calculate_bayesian_win_probabilities, calculate_confidence_intervals
+
+def moving_sum(values, window):
+    """
+    Trailing sum over the last `window` days along the last axis (fewer at the start),
+    like pandas rolling(window, min_periods=1).sum().
+    """
+    csum = np.cumsum(values, axis=-1)
+    window = max(int(window), 1)
+    if csum.shape[-1] <= window:
+        return csum
+    out = csum.copy()
+    out[..., window:] -= csum[..., :-window]
+    return out
+
+def moving_mean(values, window):
+    """
+    Trailing mean over the last `window` days that skips NaNs,
+    like pandas rolling(window, min_periods=1).mean(): NaN only where the whole window is NaN.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    valid = ~np.isnan(values)
+    sums = moving_sum(np.where(valid, values, 0.0), window)
+    counts = moving_sum(valid.astype(np.int64), window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(counts > 0, sums / counts, np.nan)
+
+def win_rate(wins, matches):
+    """Win rate in percent, NaN where there are no matches."""
+    wins = np.asarray(wins, dtype=np.float64)
+    matches = np.asarray(matches, dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(matches > 0, wins / matches * 100, np.nan)
+
+def wilson_bounds(wins, matches, z=1.96):
+    """
+    Wilson score interval of wins / matches, elementwise, as (lower, upper) percentages
+    clamped to [0, 100]. Both are NaN where there are no matches.
+    """
+    lower, upper = calculate_confidence_intervals(wins, matches, z)
+    empty = np.asarray(matches) <= 0
+    return np.where(empty, np.nan, lower), np.where(empty, np.nan, upper)
+
+def bayesian_win_probability(wins, matches, exact=False):
+    """
+    Posterior probability (percent) that the true win rate is above 50%, elementwise
+    (see utils.calculate_bayesian_win_probabilities). NaN where there are no matches.
+    """
+    prob = calculate_bayesian_win_probabilities(wins, matches, exact=exact)
+    return np.where(np.asarray(matches) <= 0, np.nan, prob)
+
+def win_stats(wins, matches, window, z=1.96):
+    """
+    Daily, moving and cumulative win statistics of daily wins / matches arrays.
+    The moving window covers the last `window` days.
+    Returns a dict of arrays shaped like the inputs:
+        wr: daily win rate (NaN without matches)
+        wins_moving, matches_moving, wins_cumulative, matches_cumulative: window and running totals
+        wilson_moving, wilson_cumulative: (lower, upper) Wilson bounds of those totals
+        bayes_moving, bayes_cumulative: Bayesian win probabilities of those totals
+    """
+    wins = np.asarray(wins, dtype=np.int64)
+    matches = np.asarray(matches, dtype=np.int64)
+    stats = {
+        "wr": win_rate(wins, matches),
+        "wins_moving": moving_sum(wins, window),
+        "matches_moving": moving_sum(matches, window),
+        "wins_cumulative": np.cumsum(wins, axis=-1),
+        "matches_cumulative": np.cumsum(matches, axis=-1),
+    }
+    stats["wilson_moving"] = wilson_bounds(stats["wins_moving"], stats["matches_moving"], z)
+    stats["wilson_cumulative"] = wilson_bounds(stats["wins_cumulative"], stats["matches_cumulative"], z)
+    stats["bayes_moving"] = bayesian_win_probability(stats["wins_moving"], stats["matches_moving"])
+    stats["bayes_cumulative"] = bayesian_win_probability(stats["wins_cumulative"], stats["matches_cumulative"])
+    return stats
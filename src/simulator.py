@@ -12,27 +12,65 @@ DECKGYM_DIR = "/workspaces/deckgym-core"
 DECKS_DIR = os.path.join(os.getcwd(), "simulator", "decks")
 DECKGYM_DB = os.path.join(DECKGYM_DIR, "database.json")
 CARGO_PATH = os.path.expanduser("~/.cargo/bin/cargo")
+EXTRA_CARDS_FILE = os.path.join(os.getcwd(), "data", "cards", "cards.extra.json")
 
-def load_deckgym_db():
-    if not os.path.exists(DECKGYM_DB):
+# path -> (mtime, index) of the lookup tables below, rebuilt when the file changes
+_INDEX_CACHE = {}
+
+def _load_index(path, build):
+    """Return build(parsed JSON of path), cached until the file's mtime changes. None if the file is missing."""
+    if not os.path.exists(path):
+        _INDEX_CACHE.pop(path, None)
+        return None
+    mtime = os.path.getmtime(path)
+    cached = _INDEX_CACHE.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    with open(path, "r") as f:
+        index = build(json.load(f))
+    _INDEX_CACHE[path] = (mtime, index)
+    return index
+
+def _build_deckgym_index(db):
+    """
+    Energy types of the DeckGym Pokemon, as {"id": {dg_id: (pos, type)}, "name": {name: (pos, type)}}.
+    pos is the entry's position in database.json, so lookups can still prefer the first matching entry.
+    """
+    by_id, by_name = {}, {}
+    for pos, item in enumerate(db):
+        if "Pokemon" in item:
+            p = item["Pokemon"]
+            by_id.setdefault(p.get("id"), (pos, p.get("energy_type")))
+            by_name.setdefault(p.get("name"), (pos, p.get("energy_type")))
+    return {"id": by_id, "name": by_name}
+
+def load_deckgym_index():
+    index = _load_index(DECKGYM_DB, _build_deckgym_index)
+    if index is None:
         logger.error(f"DeckGym database not found: {DECKGYM_DB}")
-        return []
-    with open(DECKGYM_DB, "r") as f:
-        return json.load(f)
+        return {"id": {}, "name": {}}
+    return index
 
-def get_energy_type_from_db(card_name, card_set, card_num, db):
+def get_energy_type_from_index(card_name, card_set, card_num, deckgym_index):
+    """Energy type of the first DeckGym Pokemon matching the card's ID or name (deckgym_index from load_deckgym_index)."""
     # DeckGym IDs are like "A1 001"
     try:
         dg_id = f"{card_set} {int(card_num):03d}"
     except:
         dg_id = f"{card_set} {card_num}"
-        
-    for item in db:
-        if "Pokemon" in item:
-            p = item["Pokemon"]
-            if p.get("id") == dg_id or p.get("name") == card_name:
-                return p.get("energy_type")
-    return None
+
+    matches = [m for m in (deckgym_index["id"].get(dg_id), deckgym_index["name"].get(card_name)) if m is not None]
+    return min(matches)[1] if matches else None
+
+def _build_element_map(extra_data):
+    element_map = {}
+    for item in extra_data:
+        c_set = item.get("set")
+        c_num = str(item.get("number"))
+        element = item.get("element")
+        if c_set and c_num and element:
+            element_map[(c_set, c_num)] = element.capitalize()
+    return element_map
 
 def convert_signature_to_deckgym(signature, output_filename=None):
     """
@@ -45,7 +83,7 @@ def convert_signature_to_deckgym(signature, output_filename=None):
     output_path = os.path.join(DECKS_DIR, output_filename)
     os.makedirs(DECKS_DIR, exist_ok=True)
     
-    details_map = get_deck_details_by_signature([signature])
+    details_map = get_deck_details_by_signature([signature], include_appearances=False)
     details = details_map.get(signature)
     
     if not details or "cards" not in details:
@@ -53,31 +91,22 @@ def convert_signature_to_deckgym(signature, output_filename=None):
         
     cards = details["cards"]
     # Load extra card data for energy types
-    extra_cards_path = os.path.join(os.getcwd(), "data", "cards", "cards.extra.json")
     element_map = {}
-    if os.path.exists(extra_cards_path):
-        try:
-            with open(extra_cards_path, "r") as f:
-                extra_data = json.load(f)
-                for item in extra_data:
-                    c_set = item.get("set")
-                    c_num = str(item.get("number"))
-                    element = item.get("element")
-                    if c_set and c_num and element:
-                        element_map[(c_set, c_num)] = element.capitalize()
-        except Exception as e:
-            logger.warning(f"Failed to load extra card data: {e}")
+    try:
+        element_map = _load_index(EXTRA_CARDS_FILE, _build_element_map) or {}
+    except Exception as e:
+        logger.warning(f"Failed to load extra card data: {e}")
 
     # Determine all energy types from Pokemon
     energy_types = set()
-    dg_db = load_deckgym_db()
+    dg_index = load_deckgym_index()
     for c in cards:
         if c.get("type") == "Pokemon":
             # Try element_map first
             e_type = element_map.get((c.get("set"), str(c.get("number"))))
             if not e_type:
                 # Fallback to DeckGym DB heuristic
-                e_type = get_energy_type_from_db(c.get("name"), c.get("set"), c.get("number"), dg_db)
+                e_type = get_energy_type_from_index(c.get("name"), c.get("set"), c.get("number"), dg_index)
             
             if e_type and e_type != "Colorless":
                 energy_types.add(e_type)
@@ -0,0 +1,905 @@
+"""
+Versioned, memory-mappable on-disk format of the stats cache.
+
+A store directory holds one or more generations plus a CURRENT file naming the live one.
+Each generation is a directory of .npy columns (memory-mapped on read) and a meta.json:
+
+    sig                 string   signature IDs; row i of every sig_* / card_ptr column
+    sig_order           int64    sig rows in sorted sig order (binary-search index)
+    sig_name            string   deck name
+    sig_stats           int64    (n_sigs, 4): wins, losses, ties, players
+    card_ptr            int64    cards of sig i are rows card_ptr[i]:card_ptr[i+1] of card_*
+    card_name/set/number/type  string,  card_count int64
+    card_id             int32    interned 'SET_NUMBER' ID of each card row (see card_ids)
+    card_ids            string   card ID table
+    card_bits           uint8    (n_card_ids, 2, ceil(n_sigs / 8)) packed sig bitsets per card:
+                                 decks with exactly one copy / with two or more
+
+    app_*               AppearanceTable columns (sorted by sig, date) and app_sig_ptr
+    app_tournaments, app_players   string tables for app_tournament / app_player
+    app_player_key      int32    canonical player ID of each app_players entry
+
+    days                string   sorted dates with cache entries
+    t_id, t_format      string   per tournament row (t_id null for old-format day entries)
+    t_banned_cards      string   JSON of details.json 'bannedCards' (null if absent)
+    t_day, t_has_format, t_banned, t_indptr, t_indices, t_data   DailyDeckMatrix
+    matrix_extra_sigs   string   matrix columns beyond the sig table
+
+    mt_date, mt_id, mt_name, mt_ptr    MatchTable tournaments (ordinal, ID, name) and row ranges
+    m_round, m_p1, m_p2, m_winner, m_p1_sig, m_p2_sig   MatchTable pairing rows
+    m_players, m_sigs   string   tables for m_p1/m_p2 and m_p1_sig/m_p2_sig
+    m_player_key        int32    canonical player ID of each m_players entry
+
+    player_keys         string   canonical player IDs (lowercased names), shared by appearances and pairings
+
+Strings are stored as a UTF-8 blob plus int64 offsets (and an optional null mask).
+Writers build a new generation and then atomically replace CURRENT, so readers never see
+a half-written store. The previous generation is kept for readers that still map it.
+Incremental updates (StoreUpdate) carry the kept rows over from the current generation's
+columns and only add or drop whole tournaments.
+"""
+
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+from collections.abc import Mapping
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+from src.columnar import (
+    AppearanceTable, DailyDeckMatrix, MatchTable, card_bitsets, date_to_ordinal, ordinal_to_date, signature_card_matrix,
+)
+from src.interning import Interner, card_id, player_key
+
+logger = logging.getLogger(__name__)
+
+# Bump when the column layout changes; readers ignore stores with another version
+STORE_VERSION = 1
+CURRENT_FILE = "CURRENT"
+META_FILE = "meta.json"
+MANIFEST_FILE = "manifest.json"
+# Replaced generations younger than this are kept for readers that opened them just before a swap
+GENERATION_GRACE_SECONDS = 600
+
+def _save(gen_dir, name, arr):
+    np.save(os.path.join(gen_dir, f"{name}.npy"), np.ascontiguousarray(arr))
+
+def _save_strings(gen_dir, name, values, base=None):
+    """
+    Save a string column. base: rows that come before values, either a list or a StringColumn
+    whose blob and offsets are copied as they are instead of being decoded and encoded again.
+    """
+    if base is not None and not isinstance(base, StringColumn):
+        values, base = list(base) + list(values), None
+    encoded = [b"" if v is None else str(v).encode("utf-8") for v in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum(np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded)), out=offsets[1:])
+    blob = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+    null = np.fromiter((v is None for v in values), dtype=bool, count=len(values))
+    if base is not None:
+        base_end = int(base.offsets[-1])
+        blob = np.concatenate([base.blob[:base_end], blob])
+        offsets = np.concatenate([base.offsets, base_end + offsets[1:]])
+        base_null = base.null if base.null is not None else np.zeros(len(base), dtype=bool)
+        null = np.concatenate([base_null, null])
+    _save(gen_dir, f"{name}.blob", blob)
+    _save(gen_dir, f"{name}.offsets", offsets)
+    if null.any():
+        _save(gen_dir, f"{name}.null", null)
+
+class StringColumn:
+    """Read-only sequence of strings backed by a UTF-8 blob and offsets."""
+    def __init__(self, blob, offsets, null=None):
+        self.blob = blob
+        self.offsets = offsets
+        self.null = null
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        if self.null is not None and self.null[i]:
+            return None
+        return self.blob[self.offsets[i]:self.offsets[i + 1]].tobytes().decode("utf-8")
+
+    def tolist(self, start=0, stop=None):
+        """Decode rows [start, stop) in one pass."""
+        stop = len(self) if stop is None else stop
+        offs = self.offsets[start:stop + 1].tolist()
+        if not offs:
+            return []
+        data = self.blob[offs[0]:offs[-1]].tobytes()
+        base = offs[0]
+        out = [data[a - base:b - base].decode("utf-8") for a, b in zip(offs[:-1], offs[1:])]
+        if self.null is not None:
+            for i in np.flatnonzero(self.null[start:stop]):
+                out[i] = None
+        return out
+
+def _tolist(values):
+    return values.tolist() if hasattr(values, "tolist") else list(values)
+
+def _record_totals(sig, wins, losses, ties, n_sigs):
+    """(n_sigs, 4) wins, losses, ties and players summed per signature over appearance rows."""
+    totals = np.zeros((n_sigs, 4), dtype=np.int64)
+    for k, col in enumerate((wins, losses, ties)):
+        totals[:, k] = np.bincount(sig, weights=col, minlength=n_sigs)[:n_sigs].astype(np.int64)
+    totals[:, 3] = np.bincount(sig, minlength=n_sigs)[:n_sigs]
+    return totals
+
+class StoreUpdate:
+    """
+    Columnar edit of the cache: drop whole tournaments, add newly parsed ones, then write
+    the result as a new generation. Kept rows are carried over as arrays (straight from the
+    memory-mapped generation for from_reader), so nothing is rebuilt as per-appearance dicts.
+    manifest: date -> {t_id: fingerprint} written with the update; callers may replace it.
+    """
+    def __init__(self, sigs, sig_names, sig_stats, cards, card_ids, table, matrix, t_format, t_banned_cards,
+                 match_table, manifest):
+        self.sigs = Interner(sigs)
+        self.sig_names = list(sig_names)
+        self.sig_stats = np.array(sig_stats, dtype=np.int64).reshape(-1, 4)
+        self.manifest = manifest
+        self._n_base_sigs = len(self.sigs)
+        self._dropped = set()
+
+        # cards: name/set/number/type string columns and ptr/count/id arrays of the base signatures
+        self._cards = cards
+        self.card_ids = Interner(card_ids)
+        self._new_cards = {k: [] for k in ("name", "set", "number", "type", "count", "id")}
+        self._new_card_lens = []
+
+        # Appearances, and the canonical player IDs shared with the pairings
+        self._table = table
+        self.player_keys = Interner(table.player_keys.values)
+        self.tournaments = Interner(_tolist(table.tournaments))
+        self.players = Interner(_tolist(table.players))
+        self._player_key = np.asarray(table.player_key).tolist()
+        self._new_rows = {k: [] for k in ("sig", "date", "tournament", "player", "wins", "losses", "ties")}
+
+        # Tournament rows of the daily deck matrix: (date, t_id, format, banned JSON, decks) for added ones
+        self._matrix = matrix
+        self._t_format = list(t_format)
+        self._t_banned_cards = list(t_banned_cards)
+        self._new_tournaments = []
+
+        # Pairings: (date ordinal, t_id, name, first row, end row) for added tournaments
+        self._matches = match_table
+        self.match_players = Interner(_tolist(match_table.players))
+        self.match_sigs = Interner(_tolist(match_table.sigs))
+        self._match_player_key = np.asarray(match_table.player_key).tolist()
+        self._new_matches = []
+        self._new_match_rows = {k: [] for k in ("round", "p1", "p2", "winner", "p1_sig", "p2_sig")}
+
+    @classmethod
+    def from_cache(cls, dates, signatures, manifest, matches=None):
+        """Start from the dict form of the cache (dates, signatures with appearances, manifest, matches)."""
+        sigs = list(signatures.keys())
+        player_keys = Interner()
+        table = AppearanceTable.from_signatures(signatures, player_keys)
+        match_table = MatchTable.from_matches(matches or {}, player_keys)
+        card_ids, card_matrix = signature_card_matrix(signatures)
+        all_cards = [c for s in sigs for c in signatures[s].get("cards", [])]
+        cards = {k: [c.get(k) for c in all_cards] for k in ("name", "set", "number", "type")}
+        cards["ptr"] = card_matrix.indptr
+        cards["count"] = np.array([c.get("count", 1) for c in all_cards], dtype=np.int64)
+        cards["id"] = card_matrix.indices
+        stats = []
+        for s in sigs:
+            st = signatures[s].get("stats", {})
+            stats.append((st.get("wins", 0), st.get("losses", 0), st.get("ties", 0), st.get("players", 0)))
+
+        matrix = DailyDeckMatrix.from_dates(dates, sigs)
+        t_format, t_banned_cards = [], []
+        for date_str in matrix.days:
+            day_entry = dates[date_str]
+            if "tournaments" in day_entry:
+                for t_data in day_entry["tournaments"].values():
+                    t_format.append(t_data.get("format"))
+                    banned = t_data.get("bannedCards")
+                    t_banned_cards.append(None if banned is None else json.dumps(banned))
+            elif "decks" in day_entry:
+                t_format.append(None)
+                t_banned_cards.append(None)
+        return cls(sigs, [signatures[s].get("name") for s in sigs], stats, cards, card_ids.values,
+                   table, matrix, t_format, t_banned_cards, match_table, manifest)
+
+    @classmethod
+    def from_reader(cls, reader):
+        """Start from a store generation; its columns are read as they are, not decoded into dicts."""
+        card_ids = reader.card_ids()
+        match_table = reader.match_table()
+        if card_ids is None or match_table is None or not reader._player_key_columns("app_player_key"):
+            # Generations written before these columns existed
+            cache = reader.to_cache()
+            return cls.from_cache(cache["dates"], cache["signatures"], cache["manifest"], cache["matches"])
+        cards = {k: reader.strings(f"card_{k}") for k in ("name", "set", "number", "type")}
+        cards["ptr"] = reader.column("card_ptr")
+        cards["count"] = reader.column("card_count")
+        cards["id"] = reader.column("card_id")
+        return cls(reader.sigs, reader.strings("sig_name").tolist(), reader.column("sig_stats"), cards, card_ids.values,
+                   reader.appearance_table(), reader.daily_matrix(),
+                   reader.strings("t_format").tolist(), reader.strings("t_banned_cards").tolist(),
+                   match_table, reader.manifest())
+
+    def drop_tournament(self, date_str, t_id):
+        """Drop a tournament's appearances, deck counts and pairings. t_id None drops an old-format day entry."""
+        self._dropped.add((date_str, t_id))
+
+    def add_tournament(self, date_str, t_id, parsed, card_types):
+        """
+        Add a tournament parsed by data._parse_tournament. Signatures seen for the first time
+        are appended with their cards, typed from card_types {(set, number): type}.
+        """
+        for sig, cards in parsed["cards"].items():
+            if sig in self.sigs:
+                continue
+            self.sigs.intern(sig)
+            self.sig_names.append(parsed["names"][sig])
+            for c in cards:
+                self._new_cards["name"].append(c.get("name"))
+                self._new_cards["set"].append(c.get("set"))
+                self._new_cards["number"].append(c.get("number"))
+                self._new_cards["type"].append(card_types.get((c["set"], c["number"]), "Unknown"))
+                self._new_cards["count"].append(c.get("count", 1))
+                self._new_cards["id"].append(self.card_ids.intern(card_id(c.get("set"), c.get("number"))))
+            self._new_card_lens.append(len(cards))
+
+        date = date_to_ordinal(date_str)
+        tournament = self.tournaments.intern(t_id)
+        rows = self._new_rows
+        for sig, player_id, record in parsed["players"]:
+            rows["sig"].append(self.sigs.index[sig])
+            rows["date"].append(date)
+            rows["tournament"].append(tournament)
+            rows["player"].append(self._intern_player(self.players, self._player_key, player_id))
+            rows["wins"].append(record.get("wins", 0) or 0)
+            rows["losses"].append(record.get("losses", 0) or 0)
+            rows["ties"].append(record.get("ties", 0) or 0)
+
+        banned = parsed["bannedCards"]
+        self._new_tournaments.append(
+            (date_str, t_id, parsed["format"], None if banned is None else json.dumps(banned), parsed["decks"])
+        )
+
+        m_rows = self._new_match_rows
+        start = len(m_rows["p1"])
+        for rnd, p1, p2, winner, p1_sig, p2_sig in parsed["matches"]:
+            m_rows["round"].append(-1 if rnd is None else rnd)
+            m_rows["p1"].append(self._intern_player(self.match_players, self._match_player_key, p1))
+            m_rows["p2"].append(-1 if p2 is None else self._intern_player(self.match_players, self._match_player_key, p2))
+            m_rows["winner"].append(winner)
+            m_rows["p1_sig"].append(-1 if p1_sig is None else self.match_sigs.intern(p1_sig))
+            m_rows["p2_sig"].append(-1 if p2_sig is None else self.match_sigs.intern(p2_sig))
+        self._new_matches.append((date, t_id, parsed["name"], start, len(m_rows["p1"])))
+
+    def _intern_player(self, players, keys, name):
+        p = players.get(name)
+        if p is None:
+            p = players.intern(name)
+            keys.append(self.player_keys.intern(player_key(name)))
+        return p
+
+    def _appearance_table(self):
+        """The updated AppearanceTable, and the mask of the base rows it kept."""
+        base = self._table
+        base_date = np.asarray(base.date)
+        keep = np.ones(len(base), dtype=bool)
+        if self._dropped:
+            whole_days = [date_to_ordinal(d) for d, t_id in self._dropped if t_id is None]
+            codes = [
+                (date_to_ordinal(d) << 32) | self.tournaments.index[t_id]
+                for d, t_id in self._dropped if t_id is not None and t_id in self.tournaments
+            ]
+            keys = (base_date.astype(np.int64) << 32) | np.asarray(base.tournament).astype(np.int64)
+            keep &= ~np.isin(keys, np.array(codes, dtype=np.int64))
+            keep &= ~np.isin(base_date, np.array(whole_days, dtype=np.int64))
+
+        cols = {}
+        for name, dtype in (("sig", np.int32), ("date", np.int32), ("tournament", np.int32), ("player", np.int32),
+                            ("wins", np.int16), ("losses", np.int16), ("ties", np.int16)):
+            cols[name] = np.concatenate([
+                np.asarray(getattr(base, name))[keep].astype(dtype), np.array(self._new_rows[name], dtype=dtype),
+            ])
+        # Stable sort: kept rows stay in their order, added rows follow them on the same day
+        order = np.lexsort((cols["date"], cols["sig"]))
+        table = AppearanceTable(
+            self.sigs.values, self.tournaments.values, self.players.values,
+            *(cols[name][order] for name in ("sig", "date", "tournament", "player", "wins", "losses", "ties")),
+            sig_index=self.sigs.index,
+            player_key=np.array(self._player_key, dtype=np.int32), player_keys=self.player_keys,
+        )
+        return table, keep
+
+    def _daily_matrix(self):
+        """The updated DailyDeckMatrix with its t_format and t_banned_cards columns. Tournaments are sorted by (date, t_id)."""
+        base = self._matrix
+        n_sigs = len(self.sigs)
+        base_days = list(base.days)
+        base_t_ids = _tolist(base.t_ids)
+        base_t_day = np.asarray(base.t_day).tolist()
+
+        # Base columns are the base signature table, then signatures only the matrix knows
+        extras = Interner()
+        col_map = np.arange(len(base.sigs), dtype=np.int64)
+        for j, sig in enumerate(base.sigs[self._n_base_sigs:], self._n_base_sigs):
+            i = self.sigs.get(sig)
+            col_map[j] = i if i is not None else n_sigs + extras.intern(sig)
+
+        entries = [
+            (base_days[day], t_id or "", False, r)
+            for r, (t_id, day) in enumerate(zip(base_t_ids, base_t_day))
+            if (base_days[day], t_id) not in self._dropped
+        ]
+        entries += [(t[0], t[1], True, k) for k, t in enumerate(self._new_tournaments)]
+        entries.sort(key=lambda e: (e[0], e[1]))
+
+        days = sorted({e[0] for e in entries})
+        day_index = {d: i for i, d in enumerate(days)}
+        t_ids, t_day, t_has_format, t_banned, t_format, t_banned_cards = [], [], [], [], [], []
+        kept_rows, kept_pos = [], []
+        rows, cols, vals = [], [], []
+        for pos, (date_str, _, added, k) in enumerate(entries):
+            t_day.append(day_index[date_str])
+            if added:
+                _, t_id, fmt, banned, decks = self._new_tournaments[k]
+                t_ids.append(t_id)
+                t_has_format.append(fmt is not None)
+                t_banned.append(banned is not None)
+                t_format.append(fmt)
+                t_banned_cards.append(banned)
+                for sig, count in decks.items():
+                    rows.append(pos)
+                    cols.append(self.sigs.index[sig])
+                    vals.append(count)
+            else:
+                t_ids.append(base_t_ids[k])
+                t_has_format.append(bool(base.t_has_format[k]))
+                t_banned.append(bool(base.t_banned[k]))
+                t_format.append(self._t_format[k])
+                t_banned_cards.append(self._t_banned_cards[k])
+                kept_rows.append(k)
+                kept_pos.append(pos)
+
+        kept = base.counts[np.array(kept_rows, dtype=np.int64)].tocoo()
+        counts = csr_matrix(
+            (
+                np.concatenate([kept.data.astype(np.int32), np.array(vals, dtype=np.int32)]),
+                (
+                    np.concatenate([np.array(kept_pos, dtype=np.int64)[kept.row], np.array(rows, dtype=np.int64)]),
+                    np.concatenate([col_map[kept.col], np.array(cols, dtype=np.int64)]),
+                ),
+            ),
+            shape=(len(entries), n_sigs + len(extras)),
+        )
+        counts.sum_duplicates()
+        matrix = DailyDeckMatrix(
+            days, t_ids,
+            np.array(t_day, dtype=np.int32),
+            np.array(t_has_format, dtype=bool),
+            np.array(t_banned, dtype=bool),
+            self.sigs.values + extras.values, counts,
+        )
+        return matrix, t_format, t_banned_cards
+
+    def _match_table(self):
+        """The updated MatchTable, with tournaments sorted by (date, t_id)."""
+        base = self._matches
+        base_t_date = np.asarray(base.t_date).tolist()
+        base_t_ptr = np.asarray(base.t_ptr).tolist()
+        dropped = {(date_to_ordinal(d), t_id) for d, t_id in self._dropped}
+        entries = [
+            (date, t_id, name, base_t_ptr[k], base_t_ptr[k + 1])
+            for k, (date, t_id, name) in enumerate(zip(base_t_date, base.t_ids, base.t_names))
+            if (date, t_id) not in dropped
+        ]
+        n_base_rows = len(base)
+        entries += [(date, t_id, name, n_base_rows + lo, n_base_rows + hi) for date, t_id, name, lo, hi in self._new_matches]
+        entries.sort(key=lambda e: (e[0], e[1]))
+
+        t_ptr = np.zeros(len(entries) + 1, dtype=np.int64)
+        np.cumsum([hi - lo for _, _, _, lo, hi in entries], out=t_ptr[1:])
+        index = np.concatenate([np.arange(lo, hi, dtype=np.int64) for _, _, _, lo, hi in entries] + [np.empty(0, dtype=np.int64)])
+        cols = {}
+        for name, dtype in (("round", np.int32), ("p1", np.int32), ("p2", np.int32), ("winner", np.int8),
+                            ("p1_sig", np.int32), ("p2_sig", np.int32)):
+            cols[name] = np.concatenate([
+                np.asarray(getattr(base, name)).astype(dtype), np.array(self._new_match_rows[name], dtype=dtype),
+            ])[index]
+        return MatchTable(
+            np.array([e[0] for e in entries], dtype=np.int32), [e[1] for e in entries], [e[2] for e in entries], t_ptr,
+            cols["round"], cols["p1"], cols["p2"], cols["winner"], cols["p1_sig"], cols["p2_sig"],
+            self.match_players.values, self.match_sigs.values,
+            player_key=np.array(self._match_player_key, dtype=np.int32), player_keys=self.player_keys,
+        )
+
+    def write(self, root, rederive_stats=False):
+        """
+        Write the updated cache as a new generation under root and make it current.
+        Signature stats are adjusted by the dropped and added appearances, or recomputed
+        from all appearances with rederive_stats.
+        """
+        os.makedirs(root, exist_ok=True)
+        gen_dir = tempfile.mkdtemp(prefix=f"v{STORE_VERSION}-", dir=root)
+        try:
+            sigs = self.sigs.values
+            n_sigs = len(sigs)
+            table, kept = self._appearance_table()
+
+            # Signature table
+            _save_strings(gen_dir, "sig", sigs)
+            _save(gen_dir, "sig_order", np.array(sorted(range(n_sigs), key=sigs.__getitem__), dtype=np.int64))
+            _save_strings(gen_dir, "sig_name", self.sig_names)
+            if rederive_stats:
+                stats = _record_totals(table.sig, table.wins, table.losses, table.ties, n_sigs)
+            else:
+                base = self._table
+                dropped = ~kept
+                stats = np.zeros((n_sigs, 4), dtype=np.int64)
+                stats[:len(self.sig_stats)] = self.sig_stats
+                stats -= _record_totals(*(np.asarray(getattr(base, k))[dropped] for k in ("sig", "wins", "losses", "ties")), n_sigs)
+                new = self._new_rows
+                stats += _record_totals(*(np.array(new[k], dtype=np.int64) for k in ("sig", "wins", "losses", "ties")), n_sigs)
+            _save(gen_dir, "sig_stats", stats)
+
+            # Cards: the base columns followed by those of the added signatures
+            cards, new_cards = self._cards, self._new_cards
+            base_ptr = np.asarray(cards["ptr"], dtype=np.int64)
+            card_ptr = np.concatenate([base_ptr, base_ptr[-1] + np.cumsum(np.array(self._new_card_lens, dtype=np.int64))])
+            card_count = np.concatenate([np.asarray(cards["count"], dtype=np.int64), np.array(new_cards["count"], dtype=np.int64)])
+            card_ids = np.concatenate([np.asarray(cards["id"], dtype=np.int32), np.array(new_cards["id"], dtype=np.int32)])
+            _save(gen_dir, "card_ptr", card_ptr)
+            for k in ("name", "set", "number", "type"):
+                _save_strings(gen_dir, f"card_{k}", new_cards[k], base=cards[k])
+            _save(gen_dir, "card_count", card_count)
+            _save(gen_dir, "card_id", card_ids)
+            _save_strings(gen_dir, "card_ids", self.card_ids.values)
+            card_matrix = csr_matrix((card_count, card_ids, card_ptr), shape=(n_sigs, len(self.card_ids)))
+            _save(gen_dir, "card_bits", card_bitsets(card_matrix))
+
+            # Appearances (player IDs are interned once for appearances and pairings)
+            for name in ("sig", "date", "tournament", "player", "wins", "losses", "ties", "sig_ptr"):
+                _save(gen_dir, f"app_{name}", getattr(table, name))
+            _save_strings(gen_dir, "app_tournaments", table.tournaments)
+            _save_strings(gen_dir, "app_players", table.players)
+            _save(gen_dir, "app_player_key", table.player_key)
+
+            # Tournament metadata and daily deck counts
+            matrix, t_format, t_banned_cards = self._daily_matrix()
+            _save_strings(gen_dir, "days", matrix.days)
+            _save_strings(gen_dir, "t_id", matrix.t_ids)
+            _save_strings(gen_dir, "t_format", t_format)
+            _save_strings(gen_dir, "t_banned_cards", t_banned_cards)
+            _save(gen_dir, "t_day", matrix.t_day)
+            _save(gen_dir, "t_has_format", matrix.t_has_format)
+            _save(gen_dir, "t_banned", matrix.t_banned)
+            _save(gen_dir, "t_indptr", matrix.counts.indptr)
+            _save(gen_dir, "t_indices", matrix.counts.indices)
+            _save(gen_dir, "t_data", matrix.counts.data)
+            _save_strings(gen_dir, "matrix_extra_sigs", matrix.sigs[n_sigs:])
+
+            # Pairings
+            match_table = self._match_table()
+            _save(gen_dir, "mt_date", match_table.t_date)
+            _save_strings(gen_dir, "mt_id", match_table.t_ids)
+            _save_strings(gen_dir, "mt_name", match_table.t_names)
+            _save(gen_dir, "mt_ptr", match_table.t_ptr)
+            for name in ("round", "p1", "p2", "winner", "p1_sig", "p2_sig"):
+                _save(gen_dir, f"m_{name}", getattr(match_table, name))
+            _save_strings(gen_dir, "m_players", match_table.players)
+            _save(gen_dir, "m_player_key", match_table.player_key)
+            _save_strings(gen_dir, "player_keys", self.player_keys.values)
+            _save_strings(gen_dir, "m_sigs", match_table.sigs)
+
+            with open(os.path.join(gen_dir, MANIFEST_FILE), "w") as f:
+                json.dump(self.manifest, f)
+            with open(os.path.join(gen_dir, META_FILE), "w") as f:
+                json.dump({
+                    "version": STORE_VERSION,
+                    "signatures": n_sigs,
+                    "appearances": len(table),
+                    "tournaments": len(matrix.t_ids),
+                    "days": len(matrix.days),
+                    "matches": len(match_table),
+                }, f)
+            previous = _swap_current(root, gen_dir)
+        except Exception:
+            shutil.rmtree(gen_dir, ignore_errors=True)
+            raise
+        _remove_old_generations(root, {os.path.basename(gen_dir), previous})
+        return gen_dir
+
+def write_store(root, dates, signatures, manifest, matches=None):
+    """
+    Write the cache (dates, signatures with appearances, manifest and the ingested
+    pairings in MatchTable.from_matches form) as a new generation under root and make it current.
+    """
+    return StoreUpdate.from_cache(dates, signatures, manifest, matches).write(root)
+
+def write_manifest(root, manifest):
+    """
+    Replace only the manifest of the current generation. The new generation hard-links
+    the current one's columns (or copies them where links are not supported).
+    """
+    current = os.path.join(root, _current_generation(root))
+    gen_dir = tempfile.mkdtemp(prefix=f"v{STORE_VERSION}-", dir=root)
+    try:
+        for name in os.listdir(current):
+            if name == MANIFEST_FILE:
+                continue
+            try:
+                os.link(os.path.join(current, name), os.path.join(gen_dir, name))
+            except OSError:
+                shutil.copy2(os.path.join(current, name), os.path.join(gen_dir, name))
+        with open(os.path.join(gen_dir, MANIFEST_FILE), "w") as f:
+            json.dump(manifest, f)
+        previous = _swap_current(root, gen_dir)
+    except Exception:
+        shutil.rmtree(gen_dir, ignore_errors=True)
+        raise
+    _remove_old_generations(root, {os.path.basename(gen_dir), previous})
+    return gen_dir
+
+def _swap_current(root, gen_dir):
+    """Point CURRENT at gen_dir atomically, so readers switch over at once. Returns the replaced generation name."""
+    previous = _current_generation(root)
+    fd, tmp_current = tempfile.mkstemp(dir=root, suffix=".tmp")
+    with os.fdopen(fd, "w") as f:
+        f.write(os.path.basename(gen_dir))
+    os.replace(tmp_current, os.path.join(root, CURRENT_FILE))
+    return previous
+
+def _remove_old_generations(root, keep):
+    # Keep the generation we replaced, and any other recent one: readers may still be mapping their columns
+    cutoff = time.time() - GENERATION_GRACE_SECONDS
+    for name in os.listdir(root):
+        path = os.path.join(root, name)
+        if name.startswith("v") and os.path.isdir(path) and name not in keep:
+            try:
+                if os.path.getmtime(path) > cutoff:
+                    continue
+            except OSError:
+                continue
+            shutil.rmtree(path, ignore_errors=True)
+
+def _load(path):
+    try:
+        return np.load(path, mmap_mode="r")
+    except ValueError:
+        # Empty arrays cannot be memory-mapped
+        return np.load(path)
+
+def _current_generation(root):
+    try:
+        with open(os.path.join(root, CURRENT_FILE), "r") as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+def store_key(root):
+    """
+    Identify the current store generation, or None if there is no store.
+    Generation names are unique, so every swap changes the key, however close together.
+    """
+    name = _current_generation(root)
+    if not name:
+        return None
+    return (os.path.abspath(root), name)
+
+def open_store(root):
+    """Open the current generation for reading. Returns a StoreReader, or None if missing or incompatible."""
+    name = _current_generation(root)
+    if not name:
+        return None
+    gen_dir = os.path.join(root, name)
+    try:
+        with open(os.path.join(gen_dir, META_FILE), "r") as f:
+            meta = json.load(f)
+    except OSError:
+        return None
+    if meta.get("version") != STORE_VERSION:
+        logger.warning(f"Ignoring stats store {gen_dir} with version {meta.get('version')} (expected {STORE_VERSION})")
+        return None
+    return StoreReader(gen_dir, meta)
+
+class SignatureIndex:
+    """
+    sig -> row lookups by binary search over the sig_order column.
+    A lookup decodes O(log n) signatures instead of building a dict of all of them.
+    """
+    def __init__(self, sigs, order):
+        self.sigs = sigs
+        self.order = order
+
+    def get(self, sig, default=None):
+        order = self.order
+        lo, hi = 0, len(order)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.sigs[int(order[mid])] < sig:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < len(order):
+            i = int(order[lo])
+            if self.sigs[i] == sig:
+                return i
+        return default
+
+    def __getitem__(self, sig):
+        i = self.get(sig)
+        if i is None:
+            raise KeyError(sig)
+        return i
+
+    def __contains__(self, sig):
+        return self.get(sig) is not None
+
+    def __len__(self):
+        return len(self.order)
+
+class StoreReader:
+    """
+    Lazy, memory-mapped view of one store generation.
+    Columns are mapped on first use, so a query only touches the files it needs.
+    """
+    def __init__(self, gen_dir, meta):
+        self.gen_dir = gen_dir
+        self.meta = meta
+        self._columns = {}
+        self._sigs = None
+        self._sig_index = None
+        self._player_keys = None
+
+    def column(self, name):
+        arr = self._columns.get(name)
+        if arr is None:
+            arr = self._columns[name] = _load(os.path.join(self.gen_dir, f"{name}.npy"))
+        return arr
+
+    def strings(self, name):
+        col = self._columns.get(name)
+        if col is None:
+            null_path = os.path.join(self.gen_dir, f"{name}.null.npy")
+            null = _load(null_path) if os.path.exists(null_path) else None
+            col = self._columns[name] = StringColumn(self.column(f"{name}.blob"), self.column(f"{name}.offsets"), null)
+        return col
+
+    @property
+    def sigs(self):
+        if self._sigs is None:
+            self._sigs = self.strings("sig").tolist()
+        return self._sigs
+
+    @property
+    def sig_index(self):
+        if self._sig_index is None:
+            if os.path.exists(os.path.join(self.gen_dir, "sig_order.npy")):
+                order = self.column("sig_order")
+            else:
+                # Generations written before the index existed
+                order = np.array(sorted(range(len(self.sigs)), key=self.sigs.__getitem__), dtype=np.int64)
+            self._sig_index = SignatureIndex(self.strings("sig"), order)
+        return self._sig_index
+
+    def signature_entry(self, i):
+        """Build the cache-style {"name", "cards", "stats"} dict of signature row i."""
+        lo, hi = (int(x) for x in self.column("card_ptr")[i:i + 2])
+        names = self.strings("card_name").tolist(lo, hi)
+        sets = self.strings("card_set").tolist(lo, hi)
+        numbers = self.strings("card_number").tolist(lo, hi)
+        types = self.strings("card_type").tolist(lo, hi)
+        counts = self.column("card_count")[lo:hi].tolist()
+        return self._entry(i, names, sets, numbers, types, counts)
+
+    def all_signature_entries(self):
+        """Build every signature entry in one pass over the columns."""
+        names = self.strings("card_name").tolist()
+        sets = self.strings("card_set").tolist()
+        numbers = self.strings("card_number").tolist()
+        types = self.strings("card_type").tolist()
+        counts = self.column("card_count").tolist()
+        card_ptr = self.column("card_ptr").tolist()
+        return {
+            sig: self._entry(i, *(col[card_ptr[i]:card_ptr[i + 1]] for col in (names, sets, numbers, types, counts)))
+            for i, sig in enumerate(self.sigs)
+        }
+
+    def _entry(self, i, names, sets, numbers, types, counts):
+        cards = []
+        for name, set_code, number, c_type, count in zip(names, sets, numbers, types, counts):
+            card = {"name": name, "set": set_code, "number": number, "count": count}
+            if c_type is not None:
+                card["type"] = c_type
+            cards.append(card)
+        w, l, t, p = (int(x) for x in self.column("sig_stats")[i])
+        return {
+            "name": self.strings("sig_name")[i],
+            "cards": cards,
+            "stats": {"wins": w, "losses": l, "ties": t, "players": p},
+        }
+
+    def card_ids(self):
+        """Interner of the card IDs used by card_matrix() columns."""
+        if not os.path.exists(os.path.join(self.gen_dir, "card_ids.offsets.npy")):
+            return None
+        return Interner(self.strings("card_ids").tolist())
+
+    def card_matrix(self, card_ids):
+        """Signature x card count CSR matrix, straight from the card_ptr / card_id / card_count columns."""
+        return csr_matrix(
+            (self.column("card_count"), self.column("card_id"), self.column("card_ptr")),
+            shape=(len(self.strings("sig")), len(card_ids)),
+        )
+
+    def card_bits(self):
+        """Memory-mapped card_bits postings, or None for generations written without them."""
+        if not os.path.exists(os.path.join(self.gen_dir, "card_bits.npy")):
+            return None
+        return self.column("card_bits")
+
+    def appearance_table(self):
+        col = self.column
+        # String tables stay on disk; records() decodes only the rows it returns
+        return AppearanceTable(
+            self.strings("sig"),
+            self.strings("app_tournaments"),
+            self.strings("app_players"),
+            col("app_sig"), col("app_date"), col("app_tournament"), col("app_player"),
+            col("app_wins"), col("app_losses"), col("app_ties"),
+            sig_ptr=col("app_sig_ptr"), sig_index=self.sig_index,
+            **self._player_key_columns("app_player_key"),
+        )
+
+    def daily_matrix(self):
+        sigs = self.sigs + self.strings("matrix_extra_sigs").tolist()
+        t_ids = self.strings("t_id")
+        counts = csr_matrix(
+            (self.column("t_data"), self.column("t_indices"), self.column("t_indptr")),
+            shape=(len(t_ids), len(sigs)),
+        )
+        return DailyDeckMatrix(
+            self.strings("days").tolist(), t_ids,
+            self.column("t_day"), self.column("t_has_format"), self.column("t_banned"),
+            sigs, counts,
+        )
+
+    def _player_key_columns(self, name):
+        """player_key/player_keys arguments of a table, or {} for generations written without them."""
+        if not os.path.exists(os.path.join(self.gen_dir, f"{name}.npy")):
+            return {}
+        if self._player_keys is None:
+            self._player_keys = Interner(self.strings("player_keys").tolist())
+        return {"player_key": self.column(name), "player_keys": self._player_keys}
+
+    def match_table(self):
+        """MatchTable of the ingested pairings, or None for generations written without it."""
+        if not os.path.exists(os.path.join(self.gen_dir, "mt_ptr.npy")):
+            return None
+        col = self.column
+        return MatchTable(
+            col("mt_date"), self.strings("mt_id").tolist(), self.strings("mt_name").tolist(), col("mt_ptr"),
+            col("m_round"), col("m_p1"), col("m_p2"), col("m_winner"), col("m_p1_sig"), col("m_p2_sig"),
+            self.strings("m_players"), self.strings("m_sigs"),
+            **self._player_key_columns("m_player_key"),
+        )
+
+    def dates(self, matrix=None):
+        """Rebuild the cache's 'dates' dict (date -> tournaments -> {format, bannedCards, decks})."""
+        matrix = matrix or self.daily_matrix()
+        t_ids = self.strings("t_id").tolist()
+        t_format = self.strings("t_format").tolist()
+        t_banned_cards = self.strings("t_banned_cards").tolist()
+        indptr = np.asarray(matrix.counts.indptr).tolist()
+        indices = np.asarray(matrix.counts.indices).tolist()
+        data = np.asarray(matrix.counts.data).tolist()
+        t_day = np.asarray(matrix.t_day).tolist()
+
+        dates = {d: {"tournaments": {}} for d in matrix.days}
+        for r, t_id in enumerate(t_ids):
+            decks = {matrix.sigs[indices[k]]: data[k] for k in range(indptr[r], indptr[r + 1])}
+            day_entry = dates[matrix.days[t_day[r]]]
+            if t_id is None:
+                # Old-format day entry
+                day_entry.pop("tournaments", None)
+                day_entry["decks"] = decks
+            else:
+                banned = t_banned_cards[r]
+                day_entry["tournaments"][t_id] = {
+                    "format": t_format[r],
+                    "bannedCards": None if banned is None else json.loads(banned),
+                    "decks": decks,
+                }
+        return dates
+
+    def tournament_index(self):
+        """date -> ingested t_ids (None for an old-format day entry), from the tournament columns alone."""
+        days = self.strings("days").tolist()
+        index = {d: [] for d in days}
+        for t_id, day in zip(self.strings("t_id").tolist(), self.column("t_day").tolist()):
+            index[days[day]].append(t_id)
+        return index
+
+    def match_index(self):
+        """date -> set of t_ids whose pairings were ingested ({} for generations written without pairings)."""
+        if not os.path.exists(os.path.join(self.gen_dir, "mt_ptr.npy")):
+            return {}
+        index = {}
+        for date, t_id in zip(self.column("mt_date").tolist(), self.strings("mt_id").tolist()):
+            index.setdefault(ordinal_to_date(date), set()).add(t_id)
+        return index
+
+    def manifest(self):
+        try:
+            with open(os.path.join(self.gen_dir, MANIFEST_FILE), "r") as f:
+                manifest = json.load(f)
+        except OSError:
+            return {}
+        # Fingerprints are tuples in memory
+        for tournaments in manifest.values():
+            for fp in tournaments.values():
+                for name, value in fp.items():
+                    if value is not None:
+                        fp[name] = tuple(value)
+        return manifest
+
+    def to_cache(self):
+        """Load everything back into the dict form accepted by write_store."""
+        signatures = self.all_signature_entries()
+        table = self.appearance_table()
+        sig_ptr = np.asarray(table.sig_ptr).tolist()
+        for i, sig in enumerate(self.sigs):
+            signatures[sig]["appearances"] = table.records(np.arange(sig_ptr[i], sig_ptr[i + 1]))
+        match_table = self.match_table()
+        return {
+            "dates": self.dates(),
+            "signatures": signatures,
+            "manifest": self.manifest(),
+            "matches": match_table.to_matches() if match_table is not None else {},
+        }
+
+class SignatureView(Mapping):
+    """
+    Read-only sig -> {"name", "cards", "stats"} mapping over a store.
+    Entries are built on first access and then reused; iterating over all of them
+    builds everything in one pass.
+    """
+    def __init__(self, reader):
+        self._reader = reader
+        self._entries = {}
+        self._complete = False
+
+    def __getitem__(self, sig):
+        entry = self._entries.get(sig)
+        if entry is None:
+            i = self._reader.sig_index[sig]
+            entry = self._entries[sig] = self._reader.signature_entry(i)
+        return entry
+
+    def __contains__(self, sig):
+        return sig in self._reader.sig_index
+
+    def __iter__(self):
+        return iter(self._reader.sigs)
+
+    def __len__(self):
+        return len(self._reader.strings("sig"))
+
+    def _load_all(self):
+        if not self._complete:
+            entries = self._reader.all_signature_entries()
+            entries.update(self._entries)
+            self._entries = entries
+            self._complete = True
+
+    def items(self):
+        self._load_all()
+        return self._entries.items()
+
+    def values(self):
+        self._load_all()
+        return self._entries.values()
@@ -14,11 +14,11 @@ from src.data import (
     get_daily_share_data, get_deck_details, get_all_card_names, 
     get_match_history, enrich_card_data, get_clustered_daily_share_data,
     get_cluster_details, get_cluster_mapping, get_card_info_by_name,
-    load_enriched_sets, get_daily_winrate_for_decks
+    load_enriched_sets, get_daily_winrate_for_decks, get_signature_cards, card_sort_key
 )
 from src.visualizations import create_echarts_stacked_area, display_chart, create_echarts_line_comparison
 from src.config import IMAGE_BASE_URL
-from src.utils import format_deck_name, calculate_confidence_interval
+from src.utils import format_deck_name, calculate_confidence_intervals
 
 def get_display_name(c):
     show_ja = st.session_state.get("show_japanese_toggle", False)
@@ -60,20 +60,8 @@ def _get_card_type_map():
 
 def _enrich_and_sort_cards(cards):
     """Sort cards by Pokemon > Item > Tool > Stadium > Supporter. Cards are already enriched in data.py."""
-    type_order = {
-        "Pokemon": 0,
-        "Goods": 1,
-        "Item": 2,
-        "Stadium": 3,
-        "Support": 4,
-        "Unknown": 5,
-    }
-
-    # Sort: type_order, then name
     # We use .get("type") directly as it's already enriched/normalized
-    cards.sort(
-        key=lambda x: (type_order.get(x.get("type", "Unknown"), 5), x.get("name", ""))
-    )
+    cards.sort(key=card_sort_key)
     return cards
 
 def sort_card_ids(card_ids):
@@ -499,7 +487,7 @@ def render_meta_trend_page():
     )
     
     # details_map for chart: label -> {name, stats, cards}
-    # cards are already enriched in data.py via get_period_statistics
+    # deck_info loads its enriched cards on first access, so only plotted series pay for it
     details_map = {label: info["deck_info"] for label, info in stats_map.items()}
 
     fig_options = create_echarts_stacked_area(
@@ -542,8 +530,16 @@ def render_meta_trend_page():
         global_latest_shares = global_df.iloc[-1].to_dict()
 
     rows_data = []
+
+    # Confidence intervals of every row in one call
+    all_wins = [info["stats"].get("wins", 0) for info in stats_map.values()]
+    all_matches = [
+        info["stats"].get("wins", 0) + info["stats"].get("losses", 0) + info["stats"].get("ties", 0)
+        for info in stats_map.values()
+    ]
+    lower_cis, upper_cis = calculate_confidence_intervals(all_wins, all_matches)
     
-    for label, info in stats_map.items():
+    for i, (label, info) in enumerate(stats_map.items()):
         share = latest_shares.get(label, 0.0)
         overall_share = global_latest_shares.get(label, 0.0)
         avg_share = info["avg_share"]
@@ -551,19 +547,13 @@ def render_meta_trend_page():
         deck_info = info["deck_info"]
         
         # Calculate WR
-        w, l, t = stats.get("wins", 0), stats.get("losses", 0), stats.get("ties", 0)
-        mtch = w + l + t
+        w, mtch = all_wins[i], all_matches[i]
         wr = (w / mtch * 100) if mtch > 0 else 0.0
-        lower_ci, upper_ci = calculate_confidence_interval(w, mtch)
+        lower_ci, upper_ci = float(lower_cis[i]), float(upper_cis[i])
         
         # Determine ID (sig or cluster_id)
-        sig = None
-        cid = None
-        if clustered and "Cluster" in label:
-            cid = label.split("Cluster ")[1].split(")")[0]
-        else:
-            match = re.search(r"\((\w+)\)$", label)
-            sig = match.group(1) if match else None
+        cid = info.get("cluster_id")
+        sig = None if cid else info.get("sig")
 
         rows_data.append({
             "sig": sig,
@@ -850,8 +840,12 @@ def render_meta_trend_page():
         tooltip_html = ""
         current_cards = []
         if row["deck_info"]:
-            raw_cards = row["deck_info"].get("cards", [])
-            current_cards = _enrich_and_sort_cards(raw_cards) # Ensure sorted
+            # Sorted card lists are cached per signature (clusters show their representative)
+            card_sig = row["sig"] or row["deck_info"].get("representative_sig")
+            if card_sig:
+                current_cards = get_signature_cards(card_sig, sort=True)
+            else:
+                current_cards = _enrich_and_sort_cards(row["deck_info"].get("cards", []))
             
             img_count, MAX = 0, 30
             for card in current_cards:
@@ -1000,7 +994,7 @@ def render_match_history_table(appearances):
 
     # Pre-fetch details for all opponents to build tooltips/checks
     opp_sigs = list(set([m["opponent_sig"] for m in matches if m.get("opponent_sig")]))
-    opp_details = get_deck_details_by_signature(opp_sigs)
+    opp_details = get_deck_details_by_signature(opp_sigs, include_appearances=False)
     # Cards are already enriched in data.py
 
     def format_player_link(row, role):
@@ -1172,12 +1166,14 @@ def _render_cluster_detail_view(cluster_id, selected_period):
     ref_bag = cards_to_bag(ref_cards)
 
     v_rows = []
-    for sig, info in variants.items():
+    v_wins = [info.get("stats", {}).get("wins", 0) for info in variants.values()]
+    v_totals = [sum(info.get("stats", {}).get(k, 0) for k in ("wins", "losses", "ties")) for info in variants.values()]
+    v_lowers, v_uppers = calculate_confidence_intervals(v_wins, v_totals)
+    for i, (sig, info) in enumerate(variants.items()):
         v_stats = info.get("stats", {})
-        vw, vl, vt = v_stats.get("wins", 0), v_stats.get("losses", 0), v_stats.get("ties", 0)
-        v_total = vw + vl + vt
+        vw, v_total = v_wins[i], v_totals[i]
         v_wr = (vw / v_total * 100) if v_total > 0 else 0
-        v_lower, v_upper = calculate_confidence_interval(vw, v_total)
+        v_lower, v_upper = float(v_lowers[i]), float(v_uppers[i])
         
         v_rows.append({
             "sig": sig,
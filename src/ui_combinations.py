@@ -5,7 +5,7 @@ import textwrap
 import html
 from collections import Counter
 from urllib.parse import urlencode
-from src.data import get_multi_group_trend_data, get_all_card_ids, get_group_details
+from src.data import get_combination_trend_data, get_all_card_ids, get_group_details
 from src.ui import (
     _get_set_periods, format_card_name, render_filtered_cards, sort_card_ids,
     render_card_grid, render_match_history_table, get_display_name,
@@ -13,7 +13,7 @@ from src.ui import (
 )
 from src.config import IMAGE_BASE_URL
 from src.visualizations import display_chart, create_echarts_line_comparison
-from src.utils import calculate_confidence_interval
+from src.utils import calculate_confidence_intervals
 
 def render_combinations_page():
     st.header("Card Combination Analysis")
@@ -189,6 +189,7 @@ def render_combinations_page():
                 "label": "Base Group",
                 "include": global_include,
                 "exclude": global_exclude,
+                "mask": 0,
                 "display_cards": []
             })
         else:
@@ -233,14 +234,19 @@ def render_combinations_page():
                     "include": final_include,
                     "exclude": final_exclude,
                     "sort_key": len(local_inc),
+                    "mask": sum(1 << i for i, x in enumerate(p) if x),
                     "display_cards": local_inc  # Store specific cards for display
                 })
             
             # Sort groups
             groups.sort(key=lambda x: x["sort_key"], reverse=True)
 
-        results = get_multi_group_trend_data(
-            groups, 
+        # All combinations are evaluated in one pass, keyed by each group's presence mask
+        results = get_combination_trend_data(
+            var_cards,
+            include=global_include,
+            exclude=global_exclude,
+            labels={g["mask"]: g["label"] for g in groups},
             window=window, 
             start_date=selected_period["start"], 
             end_date=selected_period["end"],
@@ -293,15 +299,21 @@ def render_combinations_page():
             col_inc = "含むカード" if show_ja else "Includes"
             col_exc = "除外カード" if show_ja else "Excludes"
 
+            # Period totals and confidence intervals of all groups at once
+            period_matches = df_match.sum()
+            period_wins = df_wins.sum()
+            lower_cis, upper_cis = calculate_confidence_intervals(period_wins.values, period_matches.values)
+            period_ci = dict(zip(period_matches.index, zip(lower_cis.tolist(), upper_cis.tolist())))
+
             for g in groups:
                 lbl = g["label"]
                 if lbl in df_share.columns:
                     avg_share = df_share[lbl].mean()
-                    total_matches = df_match[lbl].sum()
-                    total_wins = df_wins[lbl].sum()
+                    total_matches = period_matches[lbl]
+                    total_wins = period_wins[lbl]
                     
                     avg_wr = (total_wins / total_matches * 100) if total_matches > 0 else 0
-                    lower_ci, upper_ci = calculate_confidence_interval(total_wins, total_matches)
+                    lower_ci, upper_ci = period_ci[lbl]
                     
                     summary.append({
                         col_group: lbl,
@@ -487,12 +499,14 @@ def _render_group_variants_view(include_cards, exclude_cards, period):
     ref_bag = cards_to_bag(ref_cards)
     
     v_data = []
-    for sig, info in details["signatures"].items():
+    v_wins = [info.get("stats", {}).get("wins", 0) for info in details["signatures"].values()]
+    v_totals = [sum(info.get("stats", {}).get(k, 0) for k in ("wins", "losses", "ties")) for info in details["signatures"].values()]
+    v_lowers, v_uppers = calculate_confidence_intervals(v_wins, v_totals)
+    for i, (sig, info) in enumerate(details["signatures"].items()):
         v_stats = info.get("stats", {})
-        vw, vl, vt = v_stats.get("wins", 0), v_stats.get("losses", 0), v_stats.get("ties", 0)
-        vt_total = vw + vl + vt
+        vw, vt_total = v_wins[i], v_totals[i]
         v_wr = (vw / vt_total * 100) if vt_total > 0 else 0
-        v_lower, v_upper = calculate_confidence_interval(vw, vt_total)
+        v_lower, v_upper = float(v_lowers[i]), float(v_uppers[i])
         
         # Calculate Diffs
         curr_cards = info.get("cards", [])
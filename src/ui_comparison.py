@@ -11,7 +11,9 @@ from src.ui import (
     sort_card_ids, render_card_grid, get_display_name
 )
 from src.visualizations import create_echarts_line_comparison, display_chart
-from src.utils import calculate_confidence_interval
+from src.utils import (
+    calculate_confidence_interval, calculate_confidence_intervals, calculate_bayesian_win_probabilities
+)
 from src.config import IMAGE_BASE_URL
 
 def render_comparison_page():
@@ -96,7 +98,7 @@ def render_comparison_page():
                  resolved_sigs_for_details.append(ident)
                  ident_to_rep_sig[ident] = ident
                  
-        raw_details = get_deck_details_by_signature(resolved_sigs_for_details)
+        raw_details = get_deck_details_by_signature(resolved_sigs_for_details, include_appearances=False)
         deck_details = {ident: raw_details.get(ident_to_rep_sig.get(ident)) for ident in sigs}
 
     if not stats_dict:
@@ -482,7 +484,7 @@ def _render_matchup_matrix(sigs, period, deck_details, sig_to_color):
     with st.spinner("Calculating matchup statistics..."):
         from src.data import (
             get_clustered_daily_share_data, get_period_statistics, 
-            get_cluster_mapping, get_match_history
+            get_cluster_mapping, get_matchup_matrix
         )
         
         # 1. Get Top 8 Clusters (Opponents)
@@ -505,15 +507,14 @@ def _render_matchup_matrix(sigs, period, deck_details, sig_to_color):
         )[:8]
         
         opponents = []
-        sig_to_cluster_id = {}
         cluster_id_to_name = {}
         
         sig_to_cluster, id_to_cluster = get_cluster_mapping()
         
         for label, info in sorted_clusters:
-            # label is "Cluster {id} ({name})"
+            # Unclustered archetypes have no cluster_id
             try:
-                cid = label.split("Cluster ")[1].split(")")[0]
+                cid = info.get("cluster_id")
                 if cid in id_to_cluster:
                     rep_sig = id_to_cluster[cid]["representative_sig"]
                     name = id_to_cluster[cid].get("representative_name", "Unknown")
@@ -524,9 +525,6 @@ def _render_matchup_matrix(sigs, period, deck_details, sig_to_color):
                         "label": label
                     })
                     cluster_id_to_name[cid] = name
-                    # Map all signatures in this cluster to this cluster ID
-                    for s in id_to_cluster[cid].get("signatures", []):
-                        sig_to_cluster_id[s] = cid
             except: continue
 
         if not opponents:
@@ -535,68 +533,13 @@ def _render_matchup_matrix(sigs, period, deck_details, sig_to_color):
             
         # Fetch cards for opponents' representative decks for tooltips
         opp_rep_sigs = [opp["rep_sig"] for opp in opponents]
-        opp_rep_details = get_deck_details_by_signature(opp_rep_sigs)
+        opp_rep_details = get_deck_details_by_signature(opp_rep_sigs, include_appearances=False)
         for opp in opponents:
             opp_info = opp_rep_details.get(opp["rep_sig"]) or {}
             opp["cards"] = opp_info.get("cards", [])
 
-        # 2. Get Match History for selected decks
-        # We need appearances for each selected deck to get their matches
-        matrix_data = {} # (selected_sig, opponent_cluster_id) -> {w, l, t}
-        
-        from src.data import _get_all_signatures
-        all_sigs_data = _get_all_signatures()
-        
-        all_appearances_to_lookup = []
-        app_to_sig_map = {} # (t_id, player_id, date) -> list of comparison_sigs
-        
-        for sig in sigs:
-            # Resolve sig to target signatures (if it's a cluster)
-            target_sigs = []
-            if sig.startswith("Cluster "):
-                try:
-                    cid = sig.split("Cluster ")[1].split(")")[0]
-                    if cid in id_to_cluster:
-                        target_sigs = id_to_cluster[cid]["signatures"]
-                except: pass
-            elif sig in id_to_cluster:
-                target_sigs = id_to_cluster[sig]["signatures"]
-            else:
-                target_sigs = [sig]
-            
-            # Get appearances for these signatures in the period
-            for t_sig in target_sigs:
-                if t_sig in all_sigs_data:
-                    apps = all_sigs_data[t_sig].get("appearances", [])
-                    # Filter by period
-                    for a in apps:
-                        d = a["date"]
-                        if (not period["start"] or d >= period["start"]) and (not period["end"] or d <= period["end"]):
-                            app_key = (a["t_id"], a["player_id"], d)
-                            if app_key not in app_to_sig_map:
-                                app_to_sig_map[app_key] = []
-                                all_appearances_to_lookup.append(a)
-                            app_to_sig_map[app_key].append(sig)
-            
-        if all_appearances_to_lookup:
-            all_matches = get_match_history(all_appearances_to_lookup)
-            
-            for m in all_matches:
-                opp_sig = m.get("opponent_sig")
-                if opp_sig in sig_to_cluster_id:
-                    cid = sig_to_cluster_id[opp_sig]
-                    res = m.get("result")
-                    
-                    # Map this match back to all comparison sigs that share this appearance
-                    app_key = (m["t_id"], m["player"], m["date"])
-                    for comp_sig in app_to_sig_map.get(app_key, []):
-                        key = (comp_sig, cid)
-                        if key not in matrix_data:
-                            matrix_data[key] = {"w": 0, "l": 0, "t": 0}
-                        
-                        if res == "Win": matrix_data[key]["w"] += 1
-                        elif res == "Loss": matrix_data[key]["l"] += 1
-                        elif res == "Tie": matrix_data[key]["t"] += 1
+        # 2. Head-to-head W/L/T of every selected deck against every opponent cluster
+        matchups = get_matchup_matrix(sigs, [opp["id"] for opp in opponents], periods=[(period["start"], period["end"])])
 
     # 3. Render Matrix
     from src.data import load_translations
@@ -683,7 +626,7 @@ def _render_matchup_matrix(sigs, period, deck_details, sig_to_color):
         """).strip()
     table_html += "</tr></thead><tbody>"
 
-    for sig in sigs:
+    for i, sig in enumerate(sigs):
         row_name = get_display_name(sig)
         if show_ja: row_name = trans.get(row_name, row_name)
         color = sig_to_color.get(sig, "#ccc")
@@ -700,16 +643,24 @@ def _render_matchup_matrix(sigs, period, deck_details, sig_to_color):
                 </td>
         """).strip()
         
-        for opp in opponents:
+        # Score the whole row at once
+        row_stats = [
+            {"w": int(w), "l": int(l), "t": int(t)}
+            for w, l, t in zip(matchups["wins"][0, i], matchups["losses"][0, i], matchups["ties"][0, i])
+        ]
+        row_wins = [stats["w"] for stats in row_stats]
+        row_totals = [stats["w"] + stats["l"] + stats["t"] for stats in row_stats]
+        row_lower, _ = calculate_confidence_intervals(row_wins, row_totals)
+        row_prob = calculate_bayesian_win_probabilities(row_wins, row_totals)
+
+        for j, opp in enumerate(opponents):
             cid = opp["id"]
-            stats = matrix_data.get((sig, cid), {"w": 0, "l": 0, "t": 0})
+            stats = row_stats[j]
             w, l, t = stats["w"], stats["l"], stats["t"]
             total = w + l + t
             
             wr = (w / total * 100) if total > 0 else 0
-            from src.utils import calculate_confidence_interval, calculate_bayesian_win_probability
-            lower, _ = calculate_confidence_interval(w, total)
-            prob = calculate_bayesian_win_probability(w, total)
+            lower, prob = float(row_lower[j]), float(row_prob[j])
             
             # Heatmap Color
             bg_color = "rgba(40, 42, 54, 0.8)" # Default gray-ish
@@ -89,7 +89,7 @@ def render_simulator_page():
         
         for label, info in sorted_clusters:
             try:
-                cid = label.split("Cluster ")[1].split(")")[0]
+                cid = info.get("cluster_id")
                 if cid in id_to_cluster:
                     rep_sig = id_to_cluster[cid]["representative_sig"]
                     name = id_to_cluster[cid].get("representative_name", "Unknown")
@@ -106,7 +106,7 @@ def render_simulator_page():
         return
 
     # Process Deck Details for user decks
-    deck_details = get_deck_details_by_signature(sigs)
+    deck_details = get_deck_details_by_signature(sigs, include_appearances=False)
 
     st.subheader("Simulation Results")
     
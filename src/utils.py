@@ -1,6 +1,9 @@
 
 import math
 
+import numpy as np
+from scipy import special
+
 def format_deck_name(name):
     # Just capitalize first letter of words
     return name.title()
@@ -22,55 +25,65 @@ def calculate_confidence_interval(wins, total, z=1.96):
     """
     if total == 0:
         return 0.0, 0.0
-        
-    p = wins / total
+    lower, upper = calculate_confidence_intervals([wins], [total], z)
+    return float(lower[0]), float(upper[0])
+
+def calculate_confidence_intervals(wins, totals, z=1.96):
+    """
+    Wilson score intervals for arrays of wins and totals (elementwise calculate_confidence_interval).
     
-    denominator = 1 + z**2 / total
-    center_adjusted_probability = p + z**2 / (2 * total)
-    adjusted_standard_deviation = z * math.sqrt((p * (1 - p) + z**2 / (4 * total)) / total)
+    Returns:
+        tuple: (lower, upper) float arrays of percentages, 0.0 where the total is 0
+    """
+    wins = np.asarray(wins, dtype=np.float64)
+    n = np.asarray(totals, dtype=np.float64)
+    empty = n == 0
+    n = np.where(empty, 1.0, n)
+    p = wins / n
     
-    lower_bound = (center_adjusted_probability - adjusted_standard_deviation) / denominator
-    upper_bound = (center_adjusted_probability + adjusted_standard_deviation) / denominator
+    denominator = 1 + z**2 / n
+    center_adjusted_probability = p + z**2 / (2 * n)
+    adjusted_standard_deviation = z * np.sqrt((p * (1 - p) + z**2 / (4 * n)) / n)
     
     # Clamp to [0, 1] and convert to percentage
-    lower_bound = max(0.0, min(lower_bound, 1.0)) * 100
-    upper_bound = max(0.0, min(upper_bound, 1.0)) * 100
-    
-    return lower_bound, upper_bound
+    lower = np.clip((center_adjusted_probability - adjusted_standard_deviation) / denominator, 0.0, 1.0) * 100
+    upper = np.clip((center_adjusted_probability + adjusted_standard_deviation) / denominator, 0.0, 1.0) * 100
+    return np.where(empty, 0.0, lower), np.where(empty, 0.0, upper)
 
-def calculate_bayesian_win_probability(wins, total):
+def calculate_bayesian_win_probability(wins, total, exact=False):
     """
     Calculate the probability that the true win rate is > 50% using Bayesian estimation.
     Assumes a Beta(1,1) prior, so the posterior is Beta(wins+1, total-wins+1).
-    We use a normal approximation for $P(X > 0.5)$.
+    We use a normal approximation for $P(X > 0.5)$, or the exact Beta tail if exact=True.
     """
     if total == 0:
         return 50.0 # Neutral
+    return float(calculate_bayesian_win_probabilities([wins], [total], exact=exact)[0])
 
-    # For Beta(a, b):
-    # Mean = a / (a + b)
-    # Var = ab / ((a+b)^2 * (a+b+1))
+def calculate_bayesian_win_probabilities(wins, totals, exact=False):
+    """
+    Elementwise calculate_bayesian_win_probability for arrays of wins and totals.
+    exact=False: normal approximation of the Beta posterior.
+    exact=True: the Beta survival function at 0.5 (scipy).
+    Returns a float array of percentages, 50.0 (neutral) where the total is 0.
+    """
+    wins = np.asarray(wins, dtype=np.float64)
+    totals = np.asarray(totals, dtype=np.float64)
     a = wins + 1
-    b = (total - wins) + 1
-    
-    mean = a / (a + b)
-    var = (a * b) / ((a + b)**2 * (a + b + 1))
-    sd = math.sqrt(var)
-    
-    if sd == 0:
-        return 100.0 if mean > 0.5 else 0.0
-    
-    # Z-score for 0.5
-    z = (0.5 - mean) / sd
-    
-    # Normal CDF approximation using erf
-    # Phi(x) = 0.5 * (1 + erf(x / sqrt(2)))
-    def phi(x):
-        return 0.5 * (1 + math.erf(x / math.sqrt(2)))
-    
-    # Probability (X > 0.5) = 1 - Phi(z) = Phi(-z)
-    prob = phi(-z)
-    return prob * 100
+    b = (totals - wins) + 1
+
+    if exact:
+        prob = special.betainc(b, a, 0.5)  # P(X > 0.5) = I_0.5(b, a) for X ~ Beta(a, b)
+    else:
+        # For Beta(a, b):
+        # Mean = a / (a + b)
+        # Var = ab / ((a+b)^2 * (a+b+1))
+        mean = a / (a + b)
+        sd = np.sqrt((a * b) / ((a + b)**2 * (a + b + 1)))
+        # Z-score for 0.5; Probability (X > 0.5) = 1 - Phi(z) = Phi(-z)
+        z = (0.5 - mean) / sd
+        prob = 0.5 * (1 + special.erf(-z / math.sqrt(2)))
+    return np.where(totals == 0, 50.0, prob * 100)
 
 def is_local():
     """